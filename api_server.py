@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+API server
+Local HTTP/JSON API over the daemon's results cache
+
+Endpoints:
+    GET /profiles                  Poll status and cached job count per profile
+    GET /jobs?since=&profile=&limit=
+                                   Cached jobs added after `since` (Unix seconds or
+                                   ISO time), oldest first, with the `next_since`
+                                   value to pass on the next request
+
+Responses carry an ETag; requests with a matching If-None-Match get 304.
+"""
+
+import functools
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from results_cache import ResultsCache, parse_timestamp
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Serves /profiles and /jobs from the server's results cache"""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        cache = self.server.cache
+
+        if url.path == '/profiles':
+            build = self.profiles_response
+        elif url.path == '/jobs':
+            try:
+                since = parse_timestamp(params['since']) if params.get('since') else None
+                limit = int(params['limit']) if params.get('limit') else None
+            except ValueError as e:
+                self.send_json(400, {'error': str(e)})
+                return
+            build = functools.partial(self.jobs_response, params.get('profile'), since, limit)
+        else:
+            self.send_json(404, {'error': f"No such endpoint: {url.path}"})
+            return
+
+        body, etag = cache.render(self.path, build)
+        if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_body(200, body, etag)
+
+    def profiles_response(self) -> Dict:
+        return {'profiles': self.server.cache.summary()}
+
+    def jobs_response(self, profile: Optional[str], since: Optional[float], limit: Optional[int]) -> Dict:
+        jobs, next_since = self.server.cache.jobs(profile, since, limit)
+        return {'jobs': jobs, 'count': len(jobs), 'next_since': next_since}
+
+    def send_json(self, status: int, payload: Dict):
+        self.send_body(status, json.dumps(payload).encode('utf-8'))
+
+    def send_body(self, status: int, body: bytes, etag: Optional[str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"API {self.address_string()} {format % args}")
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Background HTTP server exposing a ResultsCache"""
+
+    daemon_threads = True
+
+    def __init__(self, cache: ResultsCache, host: str = '127.0.0.1', port: int = 8765):
+        super().__init__((host, port), ApiHandler)
+        self.cache = cache
+
+    def start(self) -> 'ApiServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Job filter benchmark
+Times compiled filter rules over a large batch of jobs as the number of rules grows
+
+Usage:
+    python benchmarks/bench_job_filters.py [--jobs 100000] [--rules 10,100,1000]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_filters import JobFilter  # noqa: E402
+from job_records import JobRecord  # noqa: E402
+
+from fixtures import TITLES  # noqa: E402
+
+
+def random_words(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(string.ascii_lowercase) for _ in range(8)) for _ in range(count)]
+
+
+def make_rules(count: int):
+    """`count` values or patterns for each kind of rule"""
+    words = random_words(count)
+    return [
+        {"name": "agencies", "field": "company", "exclude": [f"{word} ltd" for word in words]},
+        {"name": "recruiters", "field": "company", "exclude_patterns": words + ["recruit"]},
+        {"name": "seniority", "field": "title", "exclude_patterns": words + [r"\bdirector\b"]},
+        {"name": "locations", "field": "location", "exclude_patterns": words},
+        {"name": "engineering", "field": "title", "require_patterns": ["engineer", "developer"]},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled job filter rules")
+    parser.add_argument('--jobs', type=int, default=100000, help="Jobs in the batch")
+    parser.add_argument('--rules', default='10,100,1000', help="Values per rule to try, comma separated")
+    args = parser.parse_args()
+
+    jobs = [
+        JobRecord(str(4000000000 + i), f"{TITLES[i % len(TITLES)]} {i % 97}", f"Company {i % 2000}",
+                  f"City {i % 300}, Ireland", "2026-10-01", f"https://www.linkedin.com/jobs/view/{i}", 0)
+        for i in range(args.jobs)
+    ]
+
+    print(f"Filtering {args.jobs} jobs")
+    print(f"{'values/rule':>12} {'compile s':>10} {'apply s':>8} {'us/job':>7} {'kept':>8}")
+    for count in (int(value) for value in args.rules.split(',')):
+        started = time.perf_counter()
+        job_filter = JobFilter(make_rules(count))
+        compiled = time.perf_counter() - started
+        started = time.perf_counter()
+        kept, _ = job_filter.apply(jobs)
+        elapsed = time.perf_counter() - started
+        print(f"{count:>12} {compiled:>10.3f} {elapsed:>8.3f} {elapsed / args.jobs * 1e6:>7.1f} {len(kept):>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Job record benchmark
+Compares the memory and build time of job dicts and slotted JobRecords
+
+Usage:
+    python benchmarks/bench_job_records.py [--count 1000000] [--companies 2000] [--locations 300]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_records import JobRecord  # noqa: E402
+
+from fixtures import TITLES  # noqa: E402
+
+
+def job_fields(count: int, companies: int, locations: int):
+    """Yield card fields as a parser would: a fresh string object for every value"""
+    for i in range(count):
+        yield (
+            str(4000000000 + i),
+            f"{TITLES[i % len(TITLES)]} {i % 97}",
+            f"Company {i % companies}".encode().decode(),
+            f"City {i % locations}, Ireland".encode().decode(),
+            f"2026-10-{1 + i % 28:02d}".encode().decode(),
+            f"https://www.linkedin.com/jobs/view/{4000000000 + i}",
+        )
+
+
+def legacy_job(job_id, title, company, location, posted_time, url):
+    """The job dict every parser returned before JobRecord"""
+    return {
+        'id': job_id,
+        'title': title,
+        'company': company,
+        'location': location,
+        'posted_time': posted_time,
+        'url': url,
+        'found_at': datetime.now().isoformat()
+    }
+
+
+# Parsers stamp every job on a page with the same found_at
+FOUND_AT = int(time.time())
+
+
+def record_job(job_id, title, company, location, posted_time, url):
+    return JobRecord(job_id, title, company, location, posted_time, url, FOUND_AT)
+
+
+def measure(build, args) -> int:
+    """Return the bytes allocated to hold `count` jobs built by `build`"""
+    tracemalloc.start()
+    jobs = [build(*fields) for fields in job_fields(args.count, args.companies, args.locations)]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del jobs
+    return allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job dicts against JobRecords")
+    parser.add_argument('--count', type=int, default=1000000, help="Jobs held in memory")
+    parser.add_argument('--companies', type=int, default=2000, help="Distinct company names")
+    parser.add_argument('--locations', type=int, default=300, help="Distinct locations")
+    args = parser.parse_args()
+
+    # Records must read exactly like the dicts they replace
+    fields = next(job_fields(1, args.companies, args.locations))
+    expected = {k: v for k, v in legacy_job(*fields).items() if k != 'found_at'}
+    record = record_job(*fields)
+    if {k: v for k, v in record.to_dict().items() if k != 'found_at'} != expected:
+        print("❌ JobRecord.to_dict() differs from the job dict")
+        return 1
+
+    print(f"Holding {args.count} jobs ({args.companies} companies, {args.locations} locations)")
+    print(f"{'type':<10} {'MiB':>8} {'bytes/job':>10}")
+    results = {}
+    for name, build in (('dict', legacy_job), ('JobRecord', record_job)):
+        results[name] = measure(build, args)
+        print(f"{name:<10} {results[name] / 2 ** 20:>8.1f} {results[name] / args.count:>10.0f}")
+    print(f"\nJobRecord saves {1 - results['JobRecord'] / results['dict']:.0%} of the memory per job")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Parse pool benchmark
+Reports pages/sec for inline parsing and for process pools of increasing size
+
+Pages are parsed one at a time from several threads, as concurrent
+searches do in the tracker.
+
+Usage:
+    python benchmarks/bench_parse_pool.py [--pages 200] [--cards 25] [--searches 4] [--max-workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_parsers import DEFAULT_BACKEND  # noqa: E402
+from parse_pool import ParsePool  # noqa: E402
+
+from fixtures import make_search_page  # noqa: E402
+
+
+def comparable(results):
+    """Drop the per-call found_at timestamp so pool outputs can be compared"""
+    return [([{k: v for k, v in job.items() if k != 'found_at'} for job in jobs], errors)
+            for jobs, errors in results]
+
+
+def bench_pool(pool, pages, backend, searches):
+    """Return (results, seconds) for parsing every page once from `searches` threads"""
+    with ThreadPoolExecutor(max_workers=searches) as executor:
+        if pool.parallel:
+            # Start the workers before timing, as a long-running tracker would have
+            list(executor.map(lambda page: pool.parse(page, backend), pages[:pool.workers * 2]))
+        started = time.perf_counter()
+        results = list(executor.map(lambda page: pool.parse(page, backend), pages))
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial and process-pool parsing")
+    parser.add_argument('--pages', type=int, default=200, help="Number of generated pages")
+    parser.add_argument('--cards', type=int, default=25, help="Cards per page")
+    parser.add_argument('--searches', type=int, default=4, help="Concurrent searches parsing pages")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--backend', default=DEFAULT_BACKEND)
+    args = parser.parse_args()
+
+    pages = [make_search_page(args.cards, start=i * args.cards).encode('utf-8') for i in range(args.pages)]
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers and args.max_workers > 1:
+        worker_counts.append(args.max_workers)
+
+    print(f"Parsing {args.pages} pages of {args.cards} cards with '{args.backend}', "
+          f"{args.searches} concurrent searches, {os.cpu_count()} CPU(s)")
+    print(f"{'workers':<8} {'seconds':>9} {'pages/sec':>11} {'speedup':>8}")
+
+    expected, serial_seconds = bench_pool(ParsePool(backend=args.backend), pages, args.backend, args.searches)
+    expected = comparable(expected)
+    print(f"{'inline':<8} {serial_seconds:>9.3f} {args.pages / serial_seconds:>11.0f} {1:>7.2f}x")
+
+    for workers in worker_counts:
+        pool = ParsePool(workers=workers, backend=args.backend)
+        try:
+            results, seconds = bench_pool(pool, pages, args.backend, args.searches)
+        finally:
+            pool.close()
+        if comparable(results) != expected:
+            print(f"❌ {workers} worker(s) produced different jobs than inline parsing")
+            return 1
+        print(f"{workers:<8} {seconds:>9.3f} {args.pages / seconds:>11.0f} {serial_seconds / seconds:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark
+Reports job cards/sec for each parser backend on saved search result pages
+
+Usage:
+    python benchmarks/bench_parsers.py [--pages DIR] [--repeat N] [--synthetic CARDS]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_parsers import PARSERS  # noqa: E402
+
+from fixtures import make_search_page  # noqa: E402
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+
+def comparable(jobs):
+    """Drop the per-call found_at timestamp so backends can be compared"""
+    return [{k: v for k, v in job.items() if k != 'found_at'} for job in jobs]
+
+
+def load_pages(pages_dir, synthetic):
+    """Load saved pages, plus a synthetic page when requested"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+    if synthetic:
+        pages.append((f"synthetic-{synthetic}", make_search_page(synthetic).encode('utf-8')))
+    return pages
+
+
+def bench_backend(parser, pages, repeat):
+    """Return (cards parsed, seconds) for repeated parses of every page"""
+    cards = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _, content in pages:
+            cards += len(parser(content))
+    return cards, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job card parser backends")
+    parser.add_argument('--pages', default=PAGES_DIR, help="Directory of saved search result pages")
+    parser.add_argument('--repeat', type=int, default=20, help="Parses per page and backend")
+    parser.add_argument('--synthetic', type=int, default=0, help="Also parse a generated page with this many cards")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.synthetic)
+    if not pages:
+        print(f"No pages found in {args.pages}")
+        return 1
+
+    # Every backend must produce the same job dicts as the original parser
+    for name, content in pages:
+        expected = comparable(PARSERS['soup'](content))
+        for backend, parse in PARSERS.items():
+            if comparable(parse(content)) != expected:
+                print(f"❌ Backend '{backend}' differs from 'soup' on {name}")
+                return 1
+
+    print(f"Parsing {len(pages)} page(s) x {args.repeat} repeats")
+    print(f"{'backend':<10} {'cards':>8} {'seconds':>9} {'cards/sec':>11}")
+    for backend, parse in PARSERS.items():
+        cards, seconds = bench_backend(parse, pages, args.repeat)
+        print(f"{backend:<10} {cards:>8} {seconds:>9.3f} {cards / seconds:>11.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Pipeline benchmark
+Times each stage of a tracker run offline, against a local fixture server and SMTP sink
+
+Stages: fetch, parse, filter_by_time, filter_new, render, send and persist.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--cards 20,1000,100000] [--seen 0,1000000]
+                                        [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from email_delivery import SMTPDelivery  # noqa: E402
+from digest_renderer import iter_digests  # noqa: E402
+from linkedin_job_tracker import LinkedInJobTracker  # noqa: E402
+from seen_jobs_store import SqliteSeenJobStore  # noqa: E402
+
+from fixture_server import FixtureServer  # noqa: E402
+from fixtures import make_search_page  # noqa: E402
+from smtp_sink import SMTPSink  # noqa: E402
+
+RECORDED_PAGE = os.path.join(REPO_DIR, 'benchmarks', 'pages', 'search_ireland_android_cloud.html')
+
+
+def make_config(search_url: str, smtp_port: int, parser: str) -> dict:
+    """Tracker config pointing at the local fixture server and SMTP sink"""
+    return {
+        "search_criteria": {"keywords": ["android", "cloud"], "location": "Ireland"},
+        "email": {
+            "smtp_server": "127.0.0.1",
+            "smtp_port": smtp_port,
+            "use_tls": False,
+            "sender_email": "tracker@localhost",
+            "sender_password": "",
+            "recipient_email": "team@localhost"
+        },
+        "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+        "scraping": {"base_url": search_url, "max_pages": 1, "http_cache": False, "parser": parser},
+        "rate_limit": {"requests_per_minute": 1000000, "burst": 1000},
+        "storage": {"seen_jobs_db": "seen_jobs.db", "seen_jobs_ttl_days": None}
+    }
+
+
+def build_seen_db(path: str, size: int):
+    """Create a seen jobs database with `size` hashes that never match a fixture job"""
+    store = SqliteSeenJobStore(path, batch_size=50000)
+    store.update(hashlib.md5(f"bench-{i}".encode()).hexdigest() for i in range(size))
+    store.close()
+
+
+def timed(results: list, case: dict, stage: str, items: int, func, *args):
+    """Run func, record its duration under stage and return its result"""
+    started = time.perf_counter()
+    value = func(*args)
+    seconds = time.perf_counter() - started
+    results.append(dict(case, stage=stage, items=items if items is not None else len(value),
+                        seconds=round(seconds, 6)))
+    return value
+
+
+def run_case(case: dict, page: bytes, seen_template: str, parser: str, max_send: int) -> list:
+    """Run every stage once for one page size and seen-set size"""
+    results = []
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        shutil.copy(seen_template, 'seen_jobs.db')
+
+        with FixtureServer(lambda start: page if start == 0 else b'') as server, SMTPSink() as sink:
+            with open('config.json', 'w') as f:
+                json.dump(make_config(server.search_url, sink.port, parser), f)
+            tracker = LinkedInJobTracker('config.json')
+            criteria = tracker.get_profiles()[0]
+
+            content = timed(results, case, 'fetch', 1, tracker.fetch_page, criteria)
+            jobs = timed(results, case, 'parse', None, tracker.parse_job_cards, content)
+            window = timed(results, case, 'filter_by_time', len(jobs),
+                           tracker.filter_jobs_by_time, jobs, datetime(2000, 1, 1))
+            new_jobs = timed(results, case, 'filter_new', len(window), tracker.filter_new_jobs, window)
+
+            max_jobs = tracker.config['monitoring']['max_jobs_per_notification']
+            recipients = tracker.get_recipients()
+            messages = timed(results, case, 'render', None, lambda: [
+                tracker.build_email_message(digest, recipients)
+                for digest in iter_digests(new_jobs, max_jobs)
+            ])
+
+            def send():
+                with SMTPDelivery(tracker.config['email']) as delivery:
+                    for msg in messages[:max_send]:
+                        delivery.send(msg, recipients)
+                return messages[:max_send]
+
+            timed(results, case, 'send', None, send)
+            timed(results, case, 'persist', len(new_jobs), tracker.save_seen_jobs)
+            tracker.seen_jobs.close()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare(baseline_file: str, results: list):
+    """Print the ratio of each stage's time to the same stage in a baseline file"""
+    with open(baseline_file, 'r') as f:
+        baseline = {
+            (r['cards'], r['seen'], r['stage']): r['seconds'] for r in json.load(f)['results']
+        }
+    print(f"\nCompared with {baseline_file} (ratio < 1 is faster):")
+    for result in results:
+        key = (result['cards'], result['seen'], result['stage'])
+        if baseline.get(key):
+            ratio = result['seconds'] / baseline[key]
+            print(f"{result['cards']:>8} {result['seen']:>9} {result['stage']:<15} {ratio:>6.2f}x")
+
+
+def parse_sizes(value: str) -> list:
+    return [int(size) for size in value.split(',') if size.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each stage of a tracker run offline")
+    parser.add_argument('--cards', type=parse_sizes, default=parse_sizes('20,1000,10000,100000'),
+                        help="Comma-separated synthetic page sizes; 0 replays the recorded page")
+    parser.add_argument('--seen', type=parse_sizes, default=parse_sizes('0,100000,1000000'),
+                        help="Comma-separated sizes of the pre-populated seen jobs store")
+    parser.add_argument('--parser', default='lxml', help="Parser backend to benchmark")
+    parser.add_argument('--max-send', type=int, default=100, help="Maximum emails sent per case")
+    parser.add_argument('--output', default='bench_results.json', help="Where to write the JSON results")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = []
+    templates = tempfile.mkdtemp(prefix='bench-seen-')
+    try:
+        for seen in args.seen:
+            template = os.path.join(templates, f"seen-{seen}.db")
+            build_seen_db(template, seen)
+
+            for cards in args.cards:
+                if cards:
+                    page = make_search_page(cards).encode('utf-8')
+                else:
+                    with open(RECORDED_PAGE, 'rb') as f:
+                        page = f.read()
+                case = {'cards': cards, 'seen': seen}
+                case_results = run_case(case, page, template, args.parser, args.max_send)
+                results.extend(case_results)
+
+                total = sum(r['seconds'] for r in case_results)
+                stages = ', '.join(f"{r['stage']} {r['seconds'] * 1000:.1f}ms" for r in case_results)
+                print(f"cards={cards:<7} seen={seen:<8} total {total:.3f}s: {stages}")
+    finally:
+        shutil.rmtree(templates, ignore_errors=True)
+
+    output = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'parser': args.parser
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(args.compare, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
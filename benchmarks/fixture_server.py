@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Fixture server
+Local HTTP server that replays search result pages for offline benchmarks
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the page returned by the server's page source for each 'start' offset"""
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        start = int(query.get('start', ['0'])[0])
+        body = self.server.page_source(start) or b''
+        self.server.record(len(body))
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Serve pages from a callable mapping a result offset to page bytes
+
+    Use as a context manager; `search_url` is suitable for scraping.base_url.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, page_source: Callable[[int], Optional[bytes]], host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), FixtureHandler)
+        self.page_source = page_source
+        self.requests = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    @property
+    def search_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/jobs/search/"
+
+    def record(self, size: int):
+        with self.lock:
+            self.requests += 1
+            self.bytes += size
+
+    def __enter__(self) -> 'FixtureServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark fixtures
+Generates LinkedIn-style search result pages for offline benchmarks
+"""
+
+import random
+from datetime import datetime, timedelta
+from html import escape
+from typing import Optional
+
+TITLES = [
+    "Android Developer", "Senior Android Engineer", "Cloud Engineer",
+    "Cloud Solutions Architect", "Site Reliability Engineer", "DevOps Engineer",
+    "Software Engineer - Mobile", "Platform Engineer (AWS)", "Kotlin Developer",
+    "Backend Engineer, Cloud Infrastructure", "Staff Software Engineer & Tech Lead",
+]
+COMPANIES = [
+    "Acme", "Globex", "Initech", "Umbrella Corporation", "Stark Industries",
+    "Wayne Enterprises", "Hooli", "Pied Piper", "Cyberdyne Systems", "Soylent & Co",
+]
+LOCATIONS = [
+    "Dublin, County Dublin, Ireland", "Cork, County Cork, Ireland",
+    "Galway, County Galway, Ireland", "Limerick, County Limerick, Ireland", "Ireland",
+]
+
+PAGE_HEADER = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Jobs in Ireland | LinkedIn</title>
+  <script type="application/ld+json">{"@context": "http://schema.org"}</script>
+  <style>.base-card { position: relative; }</style>
+</head>
+<body>
+  <main class="main">
+    <section class="two-pane-serp-page__results-list">
+      <ul class="jobs-search__results-list">
+"""
+
+PAGE_FOOTER = """      </ul>
+    </section>
+  </main>
+</body>
+</html>
+"""
+
+CARD_TEMPLATE = """        <li>
+          <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}" data-impression-id="jobs-search-result-{index}" data-reference-id="{reference}" data-tracking-id="{reference}">
+            <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" href="https://ie.linkedin.com/jobs/view/{slug}-{job_id}?refId={reference}&amp;trackingId={reference}" data-tracking-control-name="public_jobs_jserp-result_search-card" data-tracking-will-navigate>
+              <span class="sr-only">
+                  {title}
+              </span>
+            </a>
+            <div class="search-entity-media">
+              <img class="artdeco-entity-image artdeco-entity-image--square-4" data-delayed-url="https://media.licdn.com/dms/image/logo-{job_id}" alt="{company}">
+            </div>
+            <div class="base-search-card__info">
+              <h3 class="base-search-card__title">
+                    {title}
+              </h3>
+              <h4 class="base-search-card__subtitle">
+                  <a class="hidden-nested-link" data-tracking-control-name="public_jobs_jserp-result_job-search-card-subtitle" data-tracking-will-navigate href="https://ie.linkedin.com/company/{company_slug}">
+                  {company}
+                  </a>
+              </h4>
+              <div class="base-search-card__metadata">
+                  <span class="job-search-card__location">
+              {location}
+                  </span>
+                  <div class="job-posting-benefits text-sm">
+                    <span class="job-posting-benefits__text"><!-- -->Actively Hiring<!-- --></span>
+                  </div>
+                  <time class="job-search-card__listdate--new" datetime="{posted_time}">
+                    {posted_label}
+                  </time>
+              </div>
+            </div>
+          </div>
+        </li>
+"""
+
+
+def slugify(value: str) -> str:
+    """Lowercase a value and join its words with dashes"""
+    return '-'.join(''.join(c if c.isalnum() else ' ' for c in value.lower()).split())
+
+
+def make_card(index: int, rng: random.Random, posted: datetime) -> str:
+    """Render one job card"""
+    title = rng.choice(TITLES)
+    company = rng.choice(COMPANIES)
+    job_id = 3700000000 + index
+    return CARD_TEMPLATE.format(
+        job_id=job_id,
+        index=index,
+        reference=f"{rng.getrandbits(64):016x}",
+        slug=slugify(f"{title} at {company}"),
+        title=escape(title),
+        company=escape(company),
+        company_slug=slugify(company),
+        location=escape(rng.choice(LOCATIONS)),
+        posted_time=posted.date().isoformat(),
+        posted_label=f"{index % 59 + 1} minutes ago",
+    )
+
+
+def make_search_page(num_cards: int = 25, start: int = 0, seed: int = 0,
+                     newest: Optional[datetime] = None,
+                     minutes_between_posts: float = 7.0) -> str:
+    """Render a search result page with num_cards cards, newest first
+
+    Card ids and posting times continue from `start`, so consecutive calls
+    with start=0, 25, 50, ... produce consecutive result pages.
+    """
+    rng = random.Random(seed * 1000003 + start)
+    newest = newest or datetime(2024, 1, 15, 12, 0)
+    parts = [PAGE_HEADER]
+    for index in range(start, start + num_cards):
+        posted = newest - timedelta(minutes=index * minutes_between_posts)
+        parts.append(make_card(index, rng, posted))
+    parts.append(PAGE_FOOTER)
+    return ''.join(parts)
+
+
+if __name__ == "__main__":
+    import sys
+    print(make_search_page(int(sys.argv[1]) if len(sys.argv) > 1 else 25))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+SMTP sink
+Minimal local SMTP server that accepts and discards messages, for offline benchmarks and tests
+"""
+
+import socketserver
+import threading
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode('ascii'))
+
+    def handle(self):
+        self.server.record_connection()
+        self.reply("220 localhost SMTP sink ready")
+        received = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip().upper()
+
+            if command.startswith('EHLO'):
+                self.wfile.write(b"250-localhost\r\n250 SIZE 104857600\r\n")
+            elif command.startswith('HELO'):
+                self.reply("250 localhost")
+            elif command.startswith('RCPT') and command.partition('<')[2].rstrip('>').lower() in self.server.refuse:
+                self.reply("550 No such user here")
+            elif command.startswith(('MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self.reply("250 OK")
+            elif command == 'DATA':
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                for data_line in self.rfile:
+                    if data_line == b".\r\n":
+                        break
+                    size += len(data_line)
+                self.server.record(size)
+                self.reply("250 OK: queued")
+                received += 1
+                if self.server.drop_after and received >= self.server.drop_after:
+                    # Hang up without QUIT, as servers with idle or per-connection limits do
+                    return
+            elif command == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Local SMTP server counting the connections, messages and bytes it receives
+
+    Recipients in `refuse` are rejected, and with `drop_after` set the
+    server hangs up after that many messages on a connection.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), SMTPSinkHandler)
+        self.connections = 0
+        self.messages = 0
+        self.bytes = 0
+        self.refuse = set()
+        self.drop_after = None
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def record_connection(self):
+        with self.lock:
+            self.connections += 1
+
+    def record(self, size: int):
+        with self.lock:
+            self.messages += 1
+            self.bytes += size
+
+    def __enter__(self) -> 'SMTPSink':
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Startup profile
+Breaks down the import time of the tracker and checks it against a budget
+
+Runs `python -X importtime` in a fresh interpreter, prints the slowest
+imports and fails if the total exceeds the budget or if a module that should
+only load on demand (the HTML parsers, SMTP, MIME, the metrics server) was
+imported at startup.
+
+Usage:
+    python benchmarks/startup_profile.py [--budget-ms 250] [--top 15] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subsystems that a run without new jobs should never pay for
+LAZY_MODULES = ('bs4', 'lxml', 'smtplib', 'email.mime', 'http.server', 'job_enrichment', 'metrics_server',
+                'api_server', 'results_cache')
+
+
+def import_profile(module: str) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """Import module in a fresh interpreter
+
+    Returns (name, self_us, cumulative_us) for every import, in load order,
+    and the names of every module loaded by the end.
+    """
+    code = f"import sys, json, {module}; print(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=REPO_DIR,
+                          capture_output=True, text=True, check=True)
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports, json.loads(proc.stdout)
+
+
+def total_ms(imports: List[Tuple[str, int, int]]) -> float:
+    """Total import time: every module's own time, counted once"""
+    return sum(self_us for _, self_us, _ in imports) / 1000
+
+
+def lazy_violations(modules: List[str]) -> List[str]:
+    return sorted(name for name in modules
+                  if any(name == lazy or name.startswith(lazy + '.') for lazy in LAZY_MODULES))
+
+
+def summarize(module: str, runs: int) -> Dict:
+    """Profile several fresh imports and keep the fastest, which has the least noise"""
+    best = None
+    for _ in range(runs):
+        imports, modules = import_profile(module)
+        if best is None or total_ms(imports) < total_ms(best[0]):
+            best = (imports, modules)
+    imports, modules = best
+    return {
+        'module': module,
+        'total_ms': round(total_ms(imports), 1),
+        'modules': len(modules),
+        'imports': imports,
+        'lazy_violations': lazy_violations(modules),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile and budget the tracker's import time")
+    parser.add_argument('--module', default='linkedin_job_tracker', help="Module to import")
+    parser.add_argument('--budget-ms', type=float, default=250,
+                        help="Fail if importing takes longer than this")
+    parser.add_argument('--top', type=int, default=15, help="How many of the slowest imports to list")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters to try")
+    args = parser.parse_args()
+
+    profile = summarize(args.module, args.runs)
+
+    print(f"Importing {profile['module']}: {profile['total_ms']:.1f}ms, {profile['modules']} modules loaded")
+    print(f"\n{'cumulative':>11} {'self':>9}  module")
+    slowest = sorted(profile['imports'], key=lambda item: item[2], reverse=True)[:args.top]
+    for name, self_us, cumulative_us in slowest:
+        print(f"{cumulative_us / 1000:>9.1f}ms {self_us / 1000:>7.1f}ms  {name}")
+
+    failed = False
+    if profile['lazy_violations']:
+        print(f"\n❌ Loaded at startup but should load on demand: {', '.join(profile['lazy_violations'])}")
+        failed = True
+    if profile['total_ms'] > args.budget_ms:
+        print(f"\n❌ Import time {profile['total_ms']:.1f}ms is over the {args.budget_ms:g}ms budget")
+        failed = True
+    if not failed:
+        print(f"\n✅ Within the {args.budget_ms:g}ms budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Digest renderer
+Renders new jobs into HTML and plain-text email digests of bounded size
+"""
+
+from html import escape
+from typing import Dict, Iterator, List, Optional
+
+HTML_HEADER = """
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                .job-card {
+                    border: 1px solid #ddd;
+                    padding: 15px;
+                    margin: 10px 0;
+                    border-radius: 5px;
+                    background-color: #f9f9f9;
+                }
+                .job-title { color: #0073b1; font-size: 18px; font-weight: bold; }
+                .company { color: #666; font-size: 14px; }
+                .location { color: #666; font-size: 12px; }
+                .apply-btn {
+                    background-color: #0073b1;
+                    color: white;
+                    padding: 8px 16px;
+                    text-decoration: none;
+                    border-radius: 3px;
+                    display: inline-block;
+                    margin-top: 10px;
+                }
+            </style>
+        </head>
+        <body>
+            <h2>🚀 New Job Opportunities Found!</h2>
+"""
+
+HTML_JOB_CARD = """
+            <div class="job-card">
+                <div class="job-title">{title}</div>
+                <div class="company">{company}</div>
+                <div class="location">📍 {location}</div>
+                <div class="location">⏰ Posted: {posted_time}</div>{details}
+                <a href="{url}" class="apply-btn" target="_blank">View on LinkedIn</a>
+            </div>
+"""
+
+HTML_FOOTER = """
+        <p><small>This notification was sent by your LinkedIn Job Tracker.</small></p>
+        </body>
+        </html>
+"""
+
+TEXT_FOOTER = "This notification was sent by your LinkedIn Job Tracker.\n"
+
+
+class Digest:
+    """One email worth of jobs"""
+
+    def __init__(self, subject: str, html: str, text: str, jobs: List[Dict]):
+        self.subject = subject
+        self.html = html
+        self.text = text
+        self.jobs = jobs
+
+
+def details_line(job: Dict) -> str:
+    """Seniority and applicant count of an enriched job, if known"""
+    parts = []
+    if job.get('seniority'):
+        parts.append(f"🎓 {job['seniority']}")
+    if job.get('applicants_text'):
+        parts.append(f"👥 {job['applicants_text']}")
+    return ' · '.join(parts)
+
+
+def details_html(job: Dict) -> str:
+    """Extra HTML line for an enriched job, or nothing"""
+    details = details_line(job)
+    if not details:
+        return ''
+    return f'\n                <div class="location">{escape(details)}</div>'
+
+
+def intro_line(total: int, part: int, parts: int, first: int, last: int) -> str:
+    """Sentence introducing the jobs of one digest"""
+    line = f"We found {total} new job listings matching your criteria"
+    if parts > 1:
+        line += f" (showing {first}-{last}, part {part} of {parts})"
+    return line + ":"
+
+
+def render_html(jobs: List[Dict], intro: str) -> str:
+    """Render the HTML body in one pass with every job field escaped"""
+    parts = [HTML_HEADER, f"            <p>{escape(intro)}</p>\n"]
+    parts.extend(
+        HTML_JOB_CARD.format(
+            title=escape(str(job['title'])),
+            company=escape(str(job['company'])),
+            location=escape(str(job['location'])),
+            posted_time=escape(str(job['posted_time'])),
+            url=escape(str(job['url']), quote=True),
+            details=details_html(job),
+        )
+        for job in jobs
+    )
+    parts.append(HTML_FOOTER)
+    return ''.join(parts)
+
+
+def render_text(jobs: List[Dict], intro: str) -> str:
+    """Render the plain-text alternative body"""
+    parts = [intro, "\n\n"]
+    for job in jobs:
+        parts.append(f"{job['title']}\n{job['company']}\n{job['location']}\n"
+                     f"Posted: {job['posted_time']}\n")
+        details = details_line(job)
+        if details:
+            parts.append(f"{details}\n")
+        parts.append(f"{job['url']}\n\n")
+    parts.append(TEXT_FOOTER)
+    return ''.join(parts)
+
+
+def iter_digests(jobs: List[Dict], max_jobs: Optional[int] = None,
+                 subject_suffix: str = '') -> Iterator[Digest]:
+    """Split jobs into digests of at most max_jobs jobs, rendered lazily one at a time"""
+    total = len(jobs)
+    if not total:
+        return
+    size = max_jobs if max_jobs and max_jobs > 0 else total
+    parts = (total + size - 1) // size
+
+    for index, first in enumerate(range(0, total, size), 1):
+        chunk = jobs[first:first + size]
+        subject = f"New LinkedIn Job Alerts - {total} new positions found"
+        if parts > 1:
+            subject += f" [{index}/{parts}]"
+        subject += subject_suffix
+
+        intro = intro_line(total, index, parts, first + 1, first + len(chunk))
+        yield Digest(subject, render_html(chunk, intro), render_text(chunk, intro), chunk)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Email delivery
+Sends notification emails over a single reusable SMTP connection
+"""
+
+import logging
+import time
+from email.message import Message
+from typing import Dict, List, Optional, Union
+
+
+def normalize_recipients(value: Union[str, List[str], None]) -> List[str]:
+    """Turn a recipient_email setting (string, comma-separated string or list) into a list"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [address.strip() for address in value if address.strip()]
+
+
+class DeliveryResult:
+    """Outcome of sending one message"""
+
+    def __init__(self, subject: str, recipients: List[str], latency: float,
+                 refused: Optional[Dict] = None, error: Optional[str] = None):
+        self.subject = subject
+        self.recipients = recipients
+        self.latency = latency
+        self.refused = refused or {}
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.refused
+
+    @property
+    def accepted(self) -> bool:
+        """Whether the server took the message for at least one recipient"""
+        return self.error is None and len(self.refused) < len(self.recipients)
+
+
+class SMTPDelivery:
+    """Keeps one authenticated SMTP connection open for a whole cycle
+
+    Use as a context manager. The connection is opened on the first send and
+    re-established once if the server drops it. Every send is recorded in
+    `results` with its latency and any refused recipients or error.
+    """
+
+    def __init__(self, email_config: Dict, timeout: float = 30):
+        self.config = email_config
+        self.timeout = timeout
+        self.server = None
+        self.results: List[DeliveryResult] = []
+
+    def __enter__(self) -> 'SMTPDelivery':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def connect(self):
+        """Open, secure and authenticate the SMTP connection"""
+        # Imported on first use so runs without new jobs never load smtplib
+        import smtplib
+
+        started = time.perf_counter()
+        server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'], timeout=self.timeout)
+        try:
+            if self.config.get('use_tls', True):
+                server.starttls()
+            if self.config.get('sender_password'):
+                server.login(self.config['sender_email'], self.config['sender_password'])
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+        logging.info(f"Connected to {self.config['smtp_server']} in {time.perf_counter() - started:.2f}s")
+
+    def close(self):
+        """Close the connection if it is open"""
+        if self.server is None:
+            return
+        import smtplib
+
+        try:
+            self.server.quit()
+        except smtplib.SMTPException:
+            self.server.close()
+        except OSError:
+            pass
+        self.server = None
+
+    def send(self, msg: Message, recipients: Optional[List[str]] = None) -> DeliveryResult:
+        """Send a message to its recipients, reconnecting once if the connection dropped"""
+        if recipients is None:
+            recipients = normalize_recipients(msg['To'])
+        import smtplib
+
+        started = time.perf_counter()
+
+        try:
+            for attempt in range(2):
+                if self.server is None:
+                    self.connect()
+                try:
+                    refused = self.server.send_message(msg, to_addrs=recipients)
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    self.server = None
+                    if attempt:
+                        raise
+                    logging.warning("SMTP connection dropped, reconnecting")
+            result = DeliveryResult(msg['Subject'], recipients, time.perf_counter() - started, refused)
+        except Exception as e:
+            result = DeliveryResult(msg['Subject'], recipients, time.perf_counter() - started, error=str(e))
+
+        self.results.append(result)
+        if result.error:
+            logging.error(f"Failed to send email: {result.error}")
+        elif result.refused:
+            logging.warning(f"Email refused for {', '.join(result.refused)}")
+        else:
+            logging.info(f"Email notification sent successfully to {', '.join(recipients)} "
+                         f"in {result.latency:.2f}s")
+        return result
+
+    def summary(self) -> str:
+        """Describe the deliveries made so far"""
+        sent = sum(1 for result in self.results if result.ok)
+        failed = len(self.results) - sent
+        total = sum(result.latency for result in self.results)
+        slowest = max((result.latency for result in self.results), default=0.0)
+        return f"{sent} sent, {failed} failed, {total:.2f}s total, {slowest:.2f}s slowest"
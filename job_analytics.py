@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Job analytics
+Trend reports over a columnar job history file (see job_history.py)
+
+Aggregates work a row group at a time and a column at a time: per-row
+arithmetic and comparisons run through map/zip/compress and counting
+through Counter, so the rows are never turned back into dicts. Memory is
+bounded by the row group size plus the number of distinct groups counted.
+
+Usage:
+    python job_analytics.py weekly job_history.jcol [--top 10] [--since 365d]
+    python job_analytics.py companies job_history.jcol [--by location]
+    python job_analytics.py reposts job_history.jcol [--top 10]
+"""
+
+import argparse
+import sys
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import compress, repeat
+from operator import add, eq, floordiv, ge, itemgetter, ne, sub
+from typing import Dict, List, Optional, Tuple
+
+from job_archive import parse_since
+from job_history import iter_row_groups
+
+WEEK_SECONDS = 7 * 86400
+# The Unix epoch was a Thursday; shift so that weeks start on Monday
+WEEK_OFFSET = 3 * 86400
+
+
+def _since_mask(first_seen: array, since: Optional[datetime]):
+    if since is None:
+        return None
+    return list(map(ge, first_seen, repeat(int(since.timestamp()))))
+
+
+def _select(values, mask):
+    return values if mask is None else compress(values, mask)
+
+
+def week_start(week: int) -> str:
+    return datetime.fromtimestamp(week * WEEK_SECONDS - WEEK_OFFSET).date().isoformat()
+
+
+def count_by(path: str, column: str = 'company', since: Optional[datetime] = None) -> Counter:
+    """Number of jobs first seen per value of a dictionary-encoded column"""
+    totals = Counter()
+    for group in iter_row_groups(path, [column, 'first_seen']):
+        encoded = group[column]
+        counts = Counter(_select(encoded.codes, _since_mask(group['first_seen'], since)))
+        for code, count in counts.items():
+            totals[encoded.values[code]] += count
+    return totals
+
+
+def postings_per_week(path: str, column: str = 'company',
+                      since: Optional[datetime] = None) -> Counter:
+    """Number of jobs first seen per (value, week start date)"""
+    totals = Counter()
+    for group in iter_row_groups(path, [column, 'first_seen']):
+        encoded, first_seen = group[column], group['first_seen']
+        mask = _since_mask(first_seen, since)
+        shifted = map(add, first_seen, repeat(WEEK_OFFSET))
+        weeks = map(floordiv, shifted, repeat(WEEK_SECONDS))
+        counts = Counter(_select(zip(encoded.codes, weeks), mask))
+        for (code, week), count in counts.items():
+            totals[(encoded.values[code], week_start(week))] += count
+    return totals
+
+
+def repost_gaps(path: str, min_gap_seconds: int = 86400) -> Dict[Tuple[str, str], array]:
+    """Seconds between successive postings of the same title by the same company
+
+    Copies posted within min_gap_seconds of each other (the same role in
+    several cities, say) are not counted as reposts. The history must be in
+    first_seen order, as job_history.py exports it.
+    """
+    ids: Dict[Tuple[str, str], int] = {}
+    keys: List[Tuple[str, str]] = []
+    last_seen: Dict[int, int] = {}
+    gaps: Dict[int, array] = {}
+
+    for group in iter_row_groups(path, ['company', 'title', 'first_seen']):
+        if not group['rows']:
+            continue
+        company, title = group['company'], group['title']
+        # Translate this row group's dictionary codes to ids shared by all row groups
+        pair_ids = {}
+        for pair in set(zip(company.codes, title.codes)):
+            key = (company.values[pair[0]], title.values[pair[1]])
+            if key not in ids:
+                ids[key] = len(keys)
+                keys.append(key)
+            pair_ids[pair] = ids[key]
+
+        rows = sorted(zip(map(pair_ids.__getitem__, zip(company.codes, title.codes)), group['first_seen']))
+        group_ids = list(map(itemgetter(0), rows))
+        times = list(map(itemgetter(1), rows))
+
+        # Gaps inside this row group, between neighbours with the same id
+        same = list(map(eq, group_ids[1:], group_ids[:-1]))
+        within = compress(zip(group_ids[1:], map(sub, times[1:], times[:-1])), same)
+        # Gaps from the previous row group, at the first row of each id
+        starts = [0] + list(compress(range(1, len(rows)), map(ne, group_ids[1:], group_ids[:-1])))
+        across = [(group_ids[i], times[i] - last_seen[group_ids[i]]) for i in starts if group_ids[i] in last_seen]
+
+        for pair_id, gap in across + list(within):
+            if gap >= min_gap_seconds:
+                gaps.setdefault(pair_id, array('q')).append(gap)
+        ends = starts[1:] + [len(rows)]
+        last_seen.update((group_ids[end - 1], times[end - 1]) for end in ends)
+
+    return {keys[pair_id]: values for pair_id, values in gaps.items()}
+
+
+def summarize_gaps(gaps: Dict[Tuple[str, str], array]) -> Dict:
+    """Overall and per-company repost counts and median days between reposts"""
+    all_gaps = sorted(gap for values in gaps.values() for gap in values)
+    per_company: Dict[str, List[int]] = {}
+    for (company, _), values in gaps.items():
+        per_company.setdefault(company, []).extend(values)
+
+    def median_days(values) -> float:
+        values = sorted(values)
+        return round(values[len(values) // 2] / 86400, 1) if values else 0.0
+
+    return {
+        'reposts': len(all_gaps),
+        'median_days': median_days(all_gaps),
+        'companies': {
+            company: {'reposts': len(values), 'median_days': median_days(values)}
+            for company, values in per_company.items()
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Trend reports over the job history")
+    parser.add_argument('report', choices=['weekly', 'companies', 'reposts'])
+    parser.add_argument('path', help="History file written by job_history.py")
+    parser.add_argument('--by', default='company', choices=['company', 'location', 'title', 'profile'],
+                        help="Column to group by")
+    parser.add_argument('--since', type=parse_since,
+                        help="Only jobs first seen on or after this (ISO date or e.g. 365d, 12w)")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    if args.report == 'companies':
+        for value, count in count_by(args.path, args.by, args.since).most_common(args.top):
+            print(f"{count:>7}  {value}")
+    elif args.report == 'weekly':
+        totals = postings_per_week(args.path, args.by, args.since)
+        top = {value for value, _ in count_by(args.path, args.by, args.since).most_common(args.top)}
+        for (value, week), count in sorted(totals.items(), key=lambda item: (item[0][1], -item[1])):
+            if value in top:
+                print(f"{week}  {count:>5}  {value}")
+    else:
+        summary = summarize_gaps(repost_gaps(args.path))
+        print(f"{summary['reposts']} reposts, median {summary['median_days']} days apart")
+        ranked = sorted(summary['companies'].items(), key=lambda item: -item[1]['reposts'])
+        for company, stats in ranked[:args.top]:
+            print(f"{stats['reposts']:>7}  {stats['median_days']:>6} days  {company}")
+
+    print(f"\n({time.perf_counter() - started:.2f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Job archive
+Keeps every scraped job in SQLite with a full-text index over title, company and location
+
+Usage:
+    python job_archive.py search "android engineer" [--location dublin] [--since 30d] [--limit 20]
+    python job_archive.py stats
+"""
+
+import argparse
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# bm25 weights of the title, company and location columns
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    "id INTEGER PRIMARY KEY, job_id TEXT NOT NULL UNIQUE, title TEXT, company TEXT, location TEXT, "
+    "posted_time TEXT, url TEXT, profile TEXT, first_seen INTEGER NOT NULL, last_seen INTEGER NOT NULL, "
+    "times_seen INTEGER NOT NULL DEFAULT 1)",
+    "CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs (first_seen)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    "title, company, location, content='jobs', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    # Keep the index in step with the jobs table; re-sightings only touch last_seen
+    "CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO jobs_fts (rowid, title, company, location) VALUES (new.id, new.title, new.company, new.location); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN "
+    "INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location) "
+    "VALUES ('delete', old.id, old.title, old.company, old.location); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF title, company, location ON jobs "
+    "WHEN old.title IS NOT new.title OR old.company IS NOT new.company OR old.location IS NOT new.location BEGIN "
+    "INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location) "
+    "VALUES ('delete', old.id, old.title, old.company, old.location); "
+    "INSERT INTO jobs_fts (rowid, title, company, location) VALUES (new.id, new.title, new.company, new.location); "
+    "END",
+]
+
+UPSERT = (
+    "INSERT INTO jobs (job_id, title, company, location, posted_time, url, profile, first_seen, last_seen) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (job_id) DO UPDATE SET title = excluded.title, company = excluded.company, "
+    "location = excluded.location, posted_time = excluded.posted_time, url = excluded.url, "
+    "last_seen = excluded.last_seen, times_seen = times_seen + 1"
+)
+
+WORD_RE = re.compile(r'\w+\*?')
+
+
+def fts_query(text: str, column: Optional[str] = None) -> str:
+    """Turn free text into an FTS5 query matching every word, optionally in one column
+
+    Words are quoted so that characters such as '-' or '+' are not read as
+    query syntax; a trailing '*' keeps prefix matching ("andr*").
+    """
+    terms = []
+    for word in WORD_RE.findall(text):
+        term = '"' + word.rstrip('*') + '"' + ('*' if word.endswith('*') else '')
+        terms.append(f"{column} : {term}" if column else term)
+    return ' '.join(terms)
+
+
+class JobArchive:
+    """Every job ever scraped, searchable by title, company and location
+
+    Jobs are buffered with add() and written in one transaction by flush(),
+    once per run. Jobs seen again keep their first_seen time and get their
+    last_seen time and sighting count updated.
+    """
+
+    def __init__(self, path: str = 'job_archive.db'):
+        self.path = path
+        self.pending: Dict[str, tuple] = {}
+        self.lock = threading.RLock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+            self.conn.execute("INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('rank', ?)",
+                              ("bm25(%g, %g, %g)" % RANK_WEIGHTS,))
+
+    def add(self, jobs: List[Dict], profile: Optional[str] = None, seen_at: Optional[float] = None):
+        """Buffer a batch of parsed jobs for the next flush"""
+        seen_at = int(seen_at if seen_at is not None else time.time())
+        with self.lock:
+            for job in jobs:
+                if not job.get('id'):
+                    continue
+                self.pending[job['id']] = (
+                    job['id'], job.get('title'), job.get('company'), job.get('location'),
+                    job.get('posted_time'), job.get('url'), profile, seen_at, seen_at
+                )
+
+    def flush(self) -> int:
+        """Write buffered jobs in one transaction, returning how many"""
+        with self.lock:
+            if not self.pending:
+                return 0
+            count = len(self.pending)
+            with self.conn:
+                self.conn.executemany(UPSERT, self.pending.values())
+            self.pending.clear()
+        return count
+
+    def search(self, query: str = '', location: Optional[str] = None, company: Optional[str] = None,
+               since: Optional[datetime] = None, until: Optional[datetime] = None,
+               limit: int = 20, raw: bool = False) -> List[Dict]:
+        """Return archived jobs matching a full-text query, best matches first
+
+        Without a query, the most recently first seen jobs are returned.
+        `location` and `company` narrow the results to those columns, and
+        `since`/`until` bound when a job was first seen. `raw` passes the query
+        to FTS5 unchanged, for its AND/OR/NEAR and column filter syntax.
+        """
+        conditions, params = [], []
+        match = query if raw else fts_query(query)
+        for column, value in (('location', location), ('company', company)):
+            if value:
+                match = f"{match} {fts_query(value, column)}".strip()
+        if since is not None:
+            conditions.append("j.first_seen >= ?")
+            params.append(int(since.timestamp()))
+        if until is not None:
+            conditions.append("j.first_seen < ?")
+            params.append(int(until.timestamp()))
+
+        if match and not conditions:
+            # Let FTS5 pick the best matches before joining
+            sql = ("SELECT j.*, f.rank AS score FROM (SELECT rowid, rank FROM jobs_fts "
+                   "WHERE jobs_fts MATCH ? ORDER BY rank LIMIT ?) f JOIN jobs j ON j.id = f.rowid WHERE 1")
+            params = [match, limit]
+            order = "score"
+        elif match:
+            sql = ("SELECT j.*, jobs_fts.rank AS score FROM jobs_fts "
+                   "JOIN jobs j ON j.id = jobs_fts.rowid WHERE jobs_fts MATCH ?")
+            params = [match] + params
+            order = "score"
+        else:
+            sql = "SELECT j.*, NULL AS score FROM jobs j WHERE 1"
+            order = "j.first_seen DESC"
+        for condition in conditions:
+            sql += f" AND {condition}"
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            self.flush()
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self.row_to_job(row) for row in rows]
+
+    @staticmethod
+    def row_to_job(row: sqlite3.Row) -> Dict:
+        job = {
+            'id': row['job_id'],
+            'title': row['title'],
+            'company': row['company'],
+            'location': row['location'],
+            'posted_time': row['posted_time'],
+            'url': row['url'],
+            'profile': row['profile'],
+            'first_seen': datetime.fromtimestamp(row['first_seen']).isoformat(),
+            'last_seen': datetime.fromtimestamp(row['last_seen']).isoformat(),
+            'times_seen': row['times_seen'],
+        }
+        if row['score'] is not None:
+            job['score'] = round(-row['score'], 3)
+        return job
+
+    def stats(self) -> Dict:
+        with self.lock:
+            self.flush()
+            row = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT company), MIN(first_seen), MAX(last_seen) FROM jobs"
+            ).fetchone()
+        count, companies, oldest, newest = tuple(row)
+        return {
+            'jobs': count,
+            'companies': companies,
+            'first_seen': datetime.fromtimestamp(oldest).isoformat() if oldest else None,
+            'last_seen': datetime.fromtimestamp(newest).isoformat() if newest else None,
+        }
+
+    def optimize(self):
+        """Merge the full-text index segments, worth doing after large imports"""
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.conn.close()
+
+
+def parse_since(value: str) -> datetime:
+    """Parse an ISO date or a relative age such as '30d' or '12h'"""
+    match = re.fullmatch(r'(\d+)([dhw])', value.strip())
+    if match:
+        unit = {'h': 'hours', 'd': 'days', 'w': 'weeks'}[match.group(2)]
+        return datetime.now() - timedelta(**{unit: int(match.group(1))})
+    return datetime.fromisoformat(value)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Search the archive of every scraped job")
+    parser.add_argument('--db', default='job_archive.db', help="Archive database")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    search = commands.add_parser('search', help="Full-text search over title, company and location")
+    search.add_argument('query', nargs='?', default='', help="Words to match, e.g. 'android engineer'")
+    search.add_argument('--location', help="Only jobs whose location matches these words")
+    search.add_argument('--company', help="Only jobs whose company matches these words")
+    search.add_argument('--since', type=parse_since, help="First seen on or after (ISO date or e.g. 30d)")
+    search.add_argument('--until', type=parse_since, help="First seen before (ISO date or e.g. 7d)")
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--raw', action='store_true', help="Pass the query to FTS5 unchanged")
+    search.add_argument('--json', action='store_true', help="Print results as JSON")
+
+    commands.add_parser('stats', help="Summarize the archive")
+    commands.add_parser('optimize', help="Merge full-text index segments")
+    args = parser.parse_args(argv)
+
+    archive = JobArchive(args.db)
+    try:
+        if args.command == 'stats':
+            print(json.dumps(archive.stats(), indent=2))
+        elif args.command == 'optimize':
+            archive.optimize()
+        else:
+            started = time.perf_counter()
+            jobs = archive.search(args.query, location=args.location, company=args.company,
+                                  since=args.since, until=args.until, limit=args.limit, raw=args.raw)
+            elapsed = (time.perf_counter() - started) * 1000
+            if args.json:
+                print(json.dumps(jobs, indent=2))
+            else:
+                for job in jobs:
+                    print(f"{job['first_seen'][:10]}  {job['title']} - {job['company']} ({job['location']})")
+                    print(f"            {job['url']}")
+                print(f"\n{len(jobs)} jobs in {elapsed:.1f}ms")
+    except sqlite3.OperationalError as e:
+        logging.error(f"Archive query failed: {e}")
+        return 1
+    finally:
+        archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Job enrichment
+Fetches job detail pages for new jobs and adds description, seniority and applicant counts
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+DETAIL_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+
+# Job criteria headings on the detail page and the job keys they fill
+CRITERIA_KEYS = {
+    'seniority level': 'seniority',
+    'employment type': 'employment_type',
+    'job function': 'job_function',
+    'industries': 'industries',
+}
+
+APPLICANTS_PATTERN = re.compile(r'(\d[\d,]*)')
+
+
+def _collapse(text: str) -> str:
+    """Collapse runs of whitespace into single spaces"""
+    return ' '.join(text.split())
+
+
+def parse_job_details(content: bytes) -> Dict:
+    """Extract description, job criteria and applicant count from a detail page"""
+    import lxml.html
+
+    text = content.decode('utf-8') if isinstance(content, bytes) else content
+    if not text.strip():
+        return {}
+    root = lxml.html.document_fromstring(text)
+    details = {}
+
+    description = root.find_class('show-more-less-html__markup')
+    if description:
+        details['description'] = _collapse(description[0].text_content())
+
+    for item in root.find_class('description__job-criteria-item'):
+        heading = item.find_class('description__job-criteria-subheader')
+        value = item.find_class('description__job-criteria-text')
+        if heading and value:
+            key = CRITERIA_KEYS.get(_collapse(heading[0].text_content()).lower())
+            if key:
+                details[key] = _collapse(value[0].text_content())
+
+    applicants = root.find_class('num-applicants__caption')
+    if applicants:
+        caption = _collapse(applicants[0].text_content())
+        details['applicants_text'] = caption
+        match = APPLICANTS_PATTERN.search(caption)
+        if match:
+            details['applicants'] = int(match.group(1).replace(',', ''))
+
+    return details
+
+
+class JobDetailCache:
+    """SQLite cache of parsed job details keyed by job id"""
+
+    def __init__(self, path: str = 'job_details.db'):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_details ("
+                "job_id TEXT PRIMARY KEY, details TEXT NOT NULL, fetched_at INTEGER NOT NULL)"
+            )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT details FROM job_details WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, job_id: str, details: Dict):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO job_details (job_id, details, fetched_at) VALUES (?, ?, ?)",
+                (job_id, json.dumps(details), int(time.time()))
+            )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class JobEnricher:
+    """Adds detail page fields to jobs using a bounded worker pool
+
+    Cached jobs are enriched without a request. The rest are fetched
+    concurrently, each with its own request timeout. A job whose detail page
+    has not arrived by the batch deadline is passed on unchanged.
+    """
+
+    def __init__(self, scheduler, cache: JobDetailCache, max_workers: int = 4,
+                 timeout_seconds: float = 15, batch_timeout_seconds: float = 60):
+        self.scheduler = scheduler
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout_seconds
+        self.batch_timeout = batch_timeout_seconds
+
+    def fetch_details(self, job_id: str) -> Dict:
+        """Fetch, parse and cache the detail page of one job"""
+        response = self.scheduler.get(DETAIL_URL.format(job_id=job_id), timeout=self.timeout)
+        response.raise_for_status()
+        details = parse_job_details(response.content)
+        self.cache.put(job_id, details)
+        return details
+
+    def enrich(self, jobs: List[Dict]) -> List[Dict]:
+        """Return the jobs with detail fields merged in where available"""
+        details = {}
+        missing = []
+        for job in jobs:
+            if not job.get('id'):
+                continue
+            cached = self.cache.get(job['id'])
+            if cached is None:
+                missing.append(job['id'])
+            else:
+                details[job['id']] = cached
+
+        if missing:
+            executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing)))
+            futures = {executor.submit(self.fetch_details, job_id): job_id for job_id in missing}
+            done, pending = wait(futures, timeout=self.batch_timeout)
+            # Don't wait for stragglers; pages already in flight still land in the cache
+            executor.shutdown(wait=False, cancel_futures=True)
+
+            for future in done:
+                job_id = futures[future]
+                try:
+                    details[job_id] = future.result()
+                except Exception as e:
+                    logging.warning(f"Could not fetch details for job {job_id}: {e}")
+            if pending:
+                logging.warning(f"Timed out fetching details for {len(pending)} jobs")
+
+        fetched = sum(1 for job_id in missing if job_id in details)
+        logging.info(f"Enriched {len(details)} of {len(jobs)} jobs "
+                     f"({fetched} fetched, {len(details) - fetched} cached)")
+        return [dict(job, **details.get(job.get('id'), {})) for job in jobs]
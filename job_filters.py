@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Job filters
+Declarative include/exclude rules from config.json, compiled once and applied to batches of jobs
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Rule kinds: exact values or regular expressions searched anywhere in the field, ignoring case
+KINDS = ('exclude', 'exclude_patterns', 'require', 'require_patterns')
+
+_SPECIAL = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+
+def trie_pattern(words: List[str]) -> str:
+    """A regex matching any of the words, with shared prefixes factored out
+
+    Python's re tries the branches of an alternation one after another, so
+    `a|b|c|...` gets slower with every word added. As a trie each position
+    only follows the branches for the characters actually there. Matching
+    stops at the shortest word, since searches only need to know that one
+    of the words is present.
+    """
+    root: Dict = {}
+    for word in words:
+        node = root
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        if '' in node:
+            return ''
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return build(root)
+
+
+def is_literal(pattern: str) -> bool:
+    return _SPECIAL.search(pattern) is None
+
+
+class Patterns:
+    """Any of several patterns as one case-insensitive regex"""
+
+    def __init__(self, name: str, patterns: List[str]):
+        literals = [pattern for pattern in patterns if pattern and is_literal(pattern)]
+        others = [pattern for pattern in patterns if pattern and not is_literal(pattern)]
+        for pattern in others:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Filter rule '{name}' has an invalid pattern {pattern!r}: {e}")
+        alternatives = [f"(?:{pattern})" for pattern in others]
+        if literals:
+            alternatives.insert(0, trie_pattern(literals))
+        self.regex = re.compile('|'.join(alternatives) or r'(?!)', re.IGNORECASE)
+        self.literals = [literal.lower() for literal in literals]
+
+    def search(self, value: str):
+        return self.regex.search(value)
+
+
+class JobFilter:
+    """Filter rules compiled into one lookup per field
+
+    Each rule looks like {"name": "...", "field": "company", "exclude": [...]}
+    with one of the KINDS as its list key. All exclude values of a field go
+    into a single dict and all exclude patterns of a field into a single
+    regex, so checking a job costs one lookup and one regex search per field
+    however many exclude rules there are. Require rules are checked one by
+    one. A dropped job is counted under the first rule found to drop it.
+    """
+
+    def __init__(self, rules: Optional[List[Dict]] = None):
+        self.rules = list(rules or [])
+        self.excluded_values: Dict[str, Dict[str, str]] = {}
+        self.excluded_patterns: Dict[str, Patterns] = {}
+        # Which rule an excluded literal or pattern came from, per field
+        self.pattern_rules: Dict[str, List[Tuple[str, Patterns]]] = {}
+        self.literal_rules: Dict[str, Dict[str, str]] = {}
+        self.required: List[Tuple[str, str, Optional[frozenset], Optional[Patterns]]] = []
+
+        patterns: Dict[str, List[str]] = {}
+        for index, rule in enumerate(self.rules, 1):
+            kinds = [kind for kind in KINDS if kind in rule]
+            field = rule.get('field')
+            name = rule.get('name') or f"{kinds[0] if kinds else 'rule'} {field} #{index}"
+            if len(kinds) != 1 or not field:
+                raise ValueError(f"Filter rule '{name}' needs a field and one of {', '.join(KINDS)}")
+            kind, values = kinds[0], rule[kinds[0]]
+            if isinstance(values, str):
+                values = [values]
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"Filter rule '{name}' needs a string or a list of strings for {kind}")
+
+            if kind == 'exclude':
+                lookup = self.excluded_values.setdefault(field, {})
+                for value in values:
+                    lookup.setdefault(value.strip().lower(), name)
+            elif kind == 'exclude_patterns':
+                compiled = Patterns(name, values)
+                patterns.setdefault(field, []).extend(values)
+                self.pattern_rules.setdefault(field, []).append((name, compiled))
+                literals = self.literal_rules.setdefault(field, {})
+                for literal in compiled.literals:
+                    literals.setdefault(literal, name)
+            elif kind == 'require':
+                self.required.append((name, field, frozenset(value.strip().lower() for value in values), None))
+            else:
+                self.required.append((name, field, None, Patterns(name, values)))
+
+        for field, values in patterns.items():
+            self.excluded_patterns[field] = Patterns(field, values)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def excluded_by(self, field: str, value: str, match) -> str:
+        """The rule behind a match of a field's combined exclude patterns"""
+        rule = self.literal_rules.get(field, {}).get(match.group().lower())
+        if rule is not None:
+            return rule
+        for name, compiled in self.pattern_rules[field]:
+            if compiled.search(value) is not None:
+                return name
+        return self.pattern_rules[field][0][0]
+
+    def dropped_by(self, job: Dict) -> Optional[str]:
+        """Name of the rule that drops a job, or None to keep it"""
+        for field, lookup in self.excluded_values.items():
+            rule = lookup.get((job.get(field) or '').strip().lower())
+            if rule is not None:
+                return rule
+        for field, compiled in self.excluded_patterns.items():
+            value = job.get(field) or ''
+            match = compiled.search(value)
+            if match is not None:
+                return self.excluded_by(field, value, match)
+        for name, field, values, compiled in self.required:
+            value = job.get(field) or ''
+            if values is not None and value.strip().lower() not in values:
+                return name
+            if compiled is not None and compiled.search(value) is None:
+                return name
+        return None
+
+    def apply(self, jobs: List[Dict]) -> Tuple[List[Dict], Counter]:
+        """Return the jobs kept and the number dropped by each rule"""
+        if not self.rules:
+            return jobs, Counter()
+        kept = []
+        dropped = Counter()
+        for job in jobs:
+            rule = self.dropped_by(job)
+            if rule is None:
+                kept.append(job)
+            else:
+                dropped[rule] += 1
+        return kept, dropped
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Job history export
+Streams job records into a compact columnar file for trend analysis
+
+The file is a sequence of row groups. Each row group starts with a JSON
+header giving its row count and the compressed size of every column,
+followed by one zlib-compressed block per column:
+
+- int columns are arrays of 64-bit integers
+- dict columns (title, company, location, profile) store each distinct
+  value once, followed by an array of 32-bit codes into that dictionary
+- str columns are NUL-separated UTF-8 text
+
+Readers decompress only the columns they ask for, one row group at a time.
+
+Usage:
+    python job_history.py export [--archive job_archive.db] [--output job_history.jcol] [--since 365d]
+    python job_history.py info job_history.jcol
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from job_archive import parse_since
+from time_normalizer import posted_window
+
+MAGIC = b'JCOL1\n'
+HEADER = struct.Struct('<I')
+
+# Column name -> encoding, in file order
+SCHEMA = {
+    'job_id': 'str',
+    'title': 'dict',
+    'company': 'dict',
+    'location': 'dict',
+    'profile': 'dict',
+    'posted': 'int',
+    'first_seen': 'int',
+    'last_seen': 'int',
+    'times_seen': 'int',
+}
+
+DEFAULT_ROW_GROUP_SIZE = 65536
+
+
+class DictColumn:
+    """Dictionary-encoded column: distinct values plus one code per row"""
+
+    def __init__(self, values: List[str], codes: array):
+        self.values = values
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self) -> List[str]:
+        return list(map(self.values.__getitem__, self.codes))
+
+
+def _int_bytes(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _int_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def encode_column(encoding: str, values: list) -> bytes:
+    if encoding == 'int':
+        return zlib.compress(_int_bytes(array('q', values)))
+    if encoding == 'str':
+        return zlib.compress('\0'.join(values).encode('utf-8'))
+
+    dictionary: Dict[str, int] = {}
+    codes = array('I', (dictionary.setdefault(value, len(dictionary)) for value in values))
+    words = json.dumps(list(dictionary), ensure_ascii=False).encode('utf-8')
+    return zlib.compress(HEADER.pack(len(words)) + words + _int_bytes(codes))
+
+
+def decode_column(encoding: str, blob: bytes, rows: int):
+    data = zlib.decompress(blob)
+    if encoding == 'int':
+        return _int_array('q', data)
+    if encoding == 'str':
+        return data.decode('utf-8').split('\0') if rows else []
+
+    size, = HEADER.unpack_from(data)
+    values = json.loads(data[HEADER.size:HEADER.size + size].decode('utf-8'))
+    return DictColumn(values, _int_array('I', data[HEADER.size + size:]))
+
+
+def _timestamp(value) -> int:
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value).timestamp())
+    return int(value or 0)
+
+
+def make_row(job_id, title, company, location, profile, posted_time, first_seen: int,
+             last_seen: int, times_seen: int) -> tuple:
+    """A row in SCHEMA order; relative posted times are resolved against first_seen"""
+    window = posted_window(posted_time, datetime.fromtimestamp(first_seen)) if first_seen else None
+    return (str(job_id or ''), title or '', company or '', location or '', profile or '',
+            int(window[0].timestamp()) if window else 0, first_seen, last_seen, times_seen)
+
+
+def job_to_row(job: Dict) -> tuple:
+    """Flatten a job dict, as scraped or as returned by JobArchive.search, into a row"""
+    first_seen = _timestamp(job.get('first_seen') or job.get('found_at'))
+    return make_row(job.get('id'), job.get('title'), job.get('company'), job.get('location'),
+                    job.get('profile'), job.get('posted_time'), first_seen,
+                    _timestamp(job.get('last_seen')) or first_seen, job.get('times_seen', 1))
+
+
+class ColumnarWriter:
+    """Writes row groups of job records; use as a context manager"""
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE, append: bool = False):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows: List[tuple] = []
+        self.count = 0
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, 'ab' if exists else 'wb')
+        if not exists:
+            self.file.write(MAGIC)
+
+    def write(self, jobs: Iterable[Dict]):
+        """Add job dicts, writing a row group every row_group_size rows"""
+        self.write_rows(map(job_to_row, jobs))
+
+    def write_rows(self, rows: Iterable[tuple]):
+        for row in rows:
+            self.rows.append(row)
+            if len(self.rows) >= self.row_group_size:
+                self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        columns = list(zip(*self.rows))
+        blobs = [encode_column(encoding, values) for encoding, values in zip(SCHEMA.values(), columns)]
+        header = json.dumps({
+            'rows': len(self.rows),
+            'columns': [[name, len(blob)] for name, blob in zip(SCHEMA, blobs)],
+        }).encode('utf-8')
+        self.file.write(HEADER.pack(len(header)) + header)
+        for blob in blobs:
+            self.file.write(blob)
+        self.count += len(self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_row_groups(path: str, columns: Optional[List[str]] = None) -> Iterator[Dict]:
+    """Yield each row group as {column name: column}, decoding only the given columns"""
+    wanted = set(SCHEMA if columns is None else columns)
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a job history file")
+        while True:
+            prefix = f.read(HEADER.size)
+            if not prefix:
+                return
+            size, = HEADER.unpack(prefix)
+            header = json.loads(f.read(size).decode('utf-8'))
+            group = {'rows': header['rows']}
+            for name, length in header['columns']:
+                if name in wanted:
+                    group[name] = decode_column(SCHEMA[name], f.read(length), header['rows'])
+                else:
+                    f.seek(length, os.SEEK_CUR)
+            yield group
+
+
+def export_archive(archive_path: str, output: str, since: Optional[datetime] = None,
+                   row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Stream the job archive, oldest first, into a columnar history file"""
+    conn = sqlite3.connect(archive_path)
+    try:
+        cursor = conn.execute(
+            "SELECT job_id, title, company, location, profile, posted_time, first_seen, last_seen, times_seen "
+            "FROM jobs WHERE first_seen >= ? ORDER BY first_seen",
+            (int(since.timestamp()) if since else 0,)
+        )
+        with ColumnarWriter(output, row_group_size) as writer:
+            while True:
+                batch = cursor.fetchmany(10000)
+                if not batch:
+                    break
+                writer.write_rows(make_row(*row) for row in batch)
+        return writer.count
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export job history to a columnar file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Export the job archive")
+    export.add_argument('--archive', default='job_archive.db', help="Job archive database")
+    export.add_argument('--output', default='job_history.jcol', help="History file to write")
+    export.add_argument('--since', type=parse_since,
+                        help="Only jobs first seen on or after this (ISO date or e.g. 365d, 12w)")
+    export.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE)
+
+    info = commands.add_parser('info', help="Describe a history file")
+    info.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        count = export_archive(args.archive, args.output, args.since, args.row_group_size)
+        print(f"Exported {count} jobs to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB)")
+    else:
+        rows = groups = 0
+        for group in iter_row_groups(args.path, columns=[]):
+            rows += group['rows']
+            groups += 1
+        print(f"{args.path}: {rows} jobs in {groups} row groups, {os.path.getsize(args.path) / 1024:.0f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
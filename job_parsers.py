@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Job card parsers
+Pluggable backends that turn a LinkedIn search result page into job records
+"""
+
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from job_records import JobRecord
+
+# Tags whose text BeautifulSoup's get_text() leaves out
+SKIPPED_TEXT_TAGS = {'script', 'style', 'template'}
+
+DEFAULT_BACKEND = 'lxml'
+FALLBACK_BACKEND = 'soup'
+
+
+def make_job(job_id: str, title: str, company: str, location: str,
+             posted_time: str, url: str, found_at: Optional[int] = None) -> JobRecord:
+    """Create a job object in the shape used throughout the tracker"""
+    return JobRecord(job_id, title, company, location, posted_time, url, found_at)
+
+
+def _is_base_card_class(value: str) -> bool:
+    """Match the raw class attribute, which SoupStrainer sees before it is split"""
+    return bool(value) and 'base-card' in value.split()
+
+
+def parse_cards_soup(content: bytes, strainer: bool = False,
+                     errors: Optional[List[str]] = None, found_at: Optional[int] = None) -> List[Dict]:
+    """Parse job cards with BeautifulSoup (the original parser)"""
+    # Imported here so runs using lxml never load bs4
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    if strainer:
+        soup = BeautifulSoup(content, 'html.parser',
+                             parse_only=SoupStrainer('div', class_=_is_base_card_class))
+    else:
+        soup = BeautifulSoup(content, 'html.parser')
+    jobs = []
+    # One timestamp per page, shared by all of its jobs
+    if found_at is None:
+        found_at = int(time.time())
+
+    # Find job cards
+    job_cards = soup.find_all('div', class_='base-card')
+
+    for card in job_cards:
+        try:
+            # Extract job information
+            job_id = card.get('data-entity-urn', '').split(':')[-1]
+
+            # Job title
+            title_elem = card.find('h3', class_='base-search-card__title')
+            title = title_elem.get_text(strip=True) if title_elem else "N/A"
+
+            # Company name
+            company_elem = card.find('h4', class_='base-search-card__subtitle')
+            company = company_elem.get_text(strip=True) if company_elem else "N/A"
+
+            # Location
+            location_elem = card.find('span', class_='job-search-card__location')
+            location = location_elem.get_text(strip=True) if location_elem else "N/A"
+
+            # Posted time
+            time_elem = card.find('time')
+            # The datetime attribute, or the "2 days ago" text if it is missing
+            posted_time = (time_elem.get('datetime') or time_elem.get_text(strip=True)) if time_elem else "N/A"
+
+            # Job URL
+            link_elem = card.find('a', class_='base-card__full-link')
+            job_url = link_elem.get('href') if link_elem else ""
+
+            jobs.append(make_job(job_id, title, company, location, posted_time, job_url, found_at))
+
+        except Exception as e:
+            logging.error(f"Error parsing job card: {e}")
+            if errors is not None:
+                errors.append(str(e))
+            continue
+
+    return jobs
+
+
+def parse_cards_strainer(content: bytes, errors: Optional[List[str]] = None,
+                         found_at: Optional[int] = None) -> List[Dict]:
+    """Parse job cards with BeautifulSoup, building only div.base-card subtrees"""
+    return parse_cards_soup(content, strainer=True, errors=errors, found_at=found_at)
+
+
+def _class_xpath(tag: str, class_name: str, descendant: bool = True) -> str:
+    """XPath matching a tag that carries class_name among its classes"""
+    axis = './/' if descendant else '//'
+    return (f"{axis}{tag}[contains(concat(' ', normalize-space(@class), ' '), "
+            f"' {class_name} ')]")
+
+
+_xpaths = {}
+
+
+def _compiled_xpaths() -> Dict:
+    """Compile the card XPath expressions once per process"""
+    if not _xpaths:
+        from lxml import etree
+        _xpaths.update({
+            'card': etree.XPath(_class_xpath('div', 'base-card', descendant=False)),
+            'title': etree.XPath(f"({_class_xpath('h3', 'base-search-card__title')})[1]"),
+            'company': etree.XPath(f"({_class_xpath('h4', 'base-search-card__subtitle')})[1]"),
+            'location': etree.XPath(f"({_class_xpath('span', 'job-search-card__location')})[1]"),
+            'time': etree.XPath("(.//time)[1]"),
+            'link': etree.XPath(f"({_class_xpath('a', 'base-card__full-link')})[1]"),
+        })
+    return _xpaths
+
+
+def _element_text(element) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True) for lxml elements"""
+    parts = []
+    for node in element.iter():
+        # Comments and processing instructions have a non-string tag
+        if isinstance(node.tag, str) and node.tag not in SKIPPED_TEXT_TAGS and node.text:
+            parts.append(node.text)
+        if node is not element and node.tail:
+            parts.append(node.tail)
+    return ''.join(part.strip() for part in parts)
+
+
+def parse_cards_lxml(content: bytes, errors: Optional[List[str]] = None,
+                     found_at: Optional[int] = None) -> List[Dict]:
+    """Parse job cards with lxml and precompiled XPath expressions"""
+    import lxml.html
+
+    # Decode explicitly: libxml2 assumes latin-1 for undeclared byte input
+    text = content.decode('utf-8') if isinstance(content, bytes) else content
+    if not text.strip():
+        return []
+
+    xpaths = _compiled_xpaths()
+    root = lxml.html.document_fromstring(text)
+    jobs = []
+    # One timestamp per page, shared by all of its jobs
+    if found_at is None:
+        found_at = int(time.time())
+
+    for card in xpaths['card'](root):
+        try:
+            job_id = (card.get('data-entity-urn') or '').split(':')[-1]
+
+            title_elem = xpaths['title'](card)
+            title = _element_text(title_elem[0]) if title_elem else "N/A"
+
+            company_elem = xpaths['company'](card)
+            company = _element_text(company_elem[0]) if company_elem else "N/A"
+
+            location_elem = xpaths['location'](card)
+            location = _element_text(location_elem[0]) if location_elem else "N/A"
+
+            time_elem = xpaths['time'](card)
+            posted_time = (time_elem[0].get('datetime') or _element_text(time_elem[0])) if time_elem else "N/A"
+
+            link_elem = xpaths['link'](card)
+            job_url = link_elem[0].get('href') if link_elem else ""
+
+            jobs.append(make_job(job_id, title, company, location, posted_time, job_url, found_at))
+
+        except Exception as e:
+            logging.error(f"Error parsing job card: {e}")
+            if errors is not None:
+                errors.append(str(e))
+            continue
+
+    return jobs
+
+
+PARSERS: Dict[str, Callable[..., List[Dict]]] = {
+    'lxml': parse_cards_lxml,
+    'strainer': parse_cards_strainer,
+    'soup': parse_cards_soup,
+}
+
+
+def parse_job_cards(content: bytes, backend: str = DEFAULT_BACKEND,
+                    errors: Optional[List[str]] = None, found_at: Optional[int] = None) -> List[Dict]:
+    """Parse job cards with the given backend, falling back to BeautifulSoup
+
+    Every backend returns the same job dicts. If the requested backend is
+    unknown, not installed, or fails on a page, the page is re-parsed with
+    the original BeautifulSoup parser. Cards that cannot be parsed are
+    skipped and, if `errors` is given, their errors are appended to it.
+    Jobs are stamped with found_at (Unix seconds), or the current time.
+    """
+    parser = PARSERS.get(backend)
+    if parser is None:
+        logging.warning(f"Unknown parser backend '{backend}', using '{FALLBACK_BACKEND}'")
+        parser = PARSERS[FALLBACK_BACKEND]
+
+    if parser is PARSERS[FALLBACK_BACKEND]:
+        return parser(content, errors=errors, found_at=found_at)
+
+    try:
+        return parser(content, errors=errors, found_at=found_at)
+    except Exception as e:
+        logging.warning(f"Parser backend '{backend}' failed ({e}), using '{FALLBACK_BACKEND}'")
+        return PARSERS[FALLBACK_BACKEND](content, errors=errors, found_at=found_at)
+
+
+# Fields of a compact job record, in make_job argument order
+RECORD_FIELDS = ('id', 'title', 'company', 'location', 'posted_time', 'url')
+
+
+def parse_page_records(content: bytes, backend: str = DEFAULT_BACKEND) -> Tuple[List[tuple], List[str]]:
+    """Parse a page into compact (id, title, company, location, posted_time, url) tuples
+
+    Returns the records and the errors of cards that could not be parsed.
+    Tuples are much cheaper than dicts to send back from a worker process;
+    make_job(*record) turns one back into a job.
+    """
+    errors: List[str] = []
+    jobs = parse_job_cards(content, backend, errors)
+    return [tuple(job[field] for field in RECORD_FIELDS) for job in jobs], errors
+
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Job records
+Compact, read-only job objects for large in-memory batches
+"""
+
+import sys
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+FIELDS = ('id', 'title', 'company', 'location', 'posted_time', 'url', 'found_at')
+_FIELD_SET = frozenset(FIELDS)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class JobRecord(Mapping):
+    """A scraped job that reads like the job dict it replaces
+
+    Fields live in slots instead of a per-job dict. Company, location and
+    posted time strings are interned, so the many jobs sharing a value share
+    one string, and found_at is kept as Unix seconds. `job['found_at']` and
+    to_dict() still give the ISO string. Code that needs to add fields should
+    copy the record into a dict first, e.g. dict(job, score=1).
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, job_id: str, title: str, company: str, location: str,
+                 posted_time: str, url: str, found_at: Optional[int] = None):
+        self.id = job_id
+        self.title = title
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.posted_time = _intern(posted_time)
+        self.url = url
+        self.found_at = int(time.time()) if found_at is None else found_at
+
+    def __getitem__(self, key: str):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        if key == 'found_at':
+            return datetime.fromtimestamp(self.found_at).isoformat()
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __repr__(self) -> str:
+        return f"JobRecord({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return JobRecord, (self.id, self.title, self.company, self.location,
+                           self.posted_time, self.url, self.found_at)
+
+    def to_dict(self) -> Dict:
+        """The job as a plain dict, in the shape make_job used to return"""
+        return dict(self)
+
+    @classmethod
+    def from_dict(cls, job: Dict) -> 'JobRecord':
+        found_at = job.get('found_at')
+        if isinstance(found_at, str):
+            found_at = int(datetime.fromisoformat(found_at).timestamp())
+        return cls(job.get('id'), job.get('title'), job.get('company'), job.get('location'),
+                   job.get('posted_time'), job.get('url'), found_at)
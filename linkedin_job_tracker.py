@@ -6,35 +6,83 @@ Automated job search monitor that sends email notifications for new listings
 
 import os
 import json
-import time
-import smtplib
+import signal
 import requests
 from datetime import datetime, timedelta
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from bs4 import BeautifulSoup
 import logging
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import TYPE_CHECKING, Callable, Iterator, List, Dict, Optional, Tuple
 import hashlib
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('job_tracker.log'),
-        logging.StreamHandler()
-    ]
-)
+from digest_renderer import Digest, iter_digests
+from job_archive import JobArchive
+from job_filters import JobFilter
+from email_delivery import DeliveryResult, SMTPDelivery, normalize_recipients
+from job_parsers import DEFAULT_BACKEND
+from metrics import MetricsRegistry, timed_stage
+from near_duplicates import open_near_duplicate_index
+from parse_pool import ParsePool
+from pipeline import Stage
+from poll_scheduler import PollScheduler
+from query_planner import QueryPlanner
+from request_scheduler import RequestScheduler
+from response_cache import ResponseCache
+from seen_jobs_store import SeenJobStore, open_seen_job_store
+from time_normalizer import posted_after, posted_window, posted_windows
+from tracker_logging import start_logging
+
+if TYPE_CHECKING:
+    from email.mime.multipart import MIMEMultipart
+    from metrics_server import MetricsServer
+
+SEARCH_BASE_URL = "https://www.linkedin.com/jobs/search/"
+
+def setup_logging(config_file: str = 'config.json'):
+    """Log to job_tracker.log and the console from a background thread
+    
+    Reads the optional 'logging' section of the config, see tracker_logging.py.
+    The log file is only opened when the first record is written.
+    """
+    try:
+        with open(config_file, 'r') as f:
+            settings = json.load(f).get('logging', {})
+    except (OSError, ValueError):
+        settings = {}
+    return start_logging(settings)
 
 class LinkedInJobTracker:
-    def __init__(self, config_file: str = 'config.json'):
-        """Initialize the job tracker with configuration"""
+    def __init__(self, config_file: str = 'config.json', clock: Callable[[], datetime] = datetime.now):
+        """Initialize the job tracker with configuration
+        
+        `clock` gives the current time; replay.py passes the time of the
+        snapshot being replayed.
+        """
+        self.clock = clock
+        self.config_file = config_file
         self.config = self.load_config(config_file)
+        self.config_mtime = self.get_config_mtime()
+        self.stop_event = threading.Event()
+        self.metrics = MetricsRegistry()
+        # Latest jobs per profile, kept only in daemon mode (see run_daemon)
+        self.results_cache = None
         self.seen_jobs_file = 'seen_jobs.json'
         self.seen_jobs = self.load_seen_jobs()
+        self.near_duplicates = open_near_duplicate_index(self.config.get('deduplication', {}),
+                                                         self.config.get('storage', {}))
         self.last_run_file = 'last_run.json'
+        self.last_run_times = {}
         self.last_run_time = self.load_last_run_time()
+        self.add_last_run_times()
+        
+        # Guards seen_jobs when several profiles are filtered concurrently
+        self.lock = threading.Lock()
+        # Seen keys (see seen_key) of new jobs whose notification has not been
+        # delivered yet, and the keys of reposts held back with each of them
+        # by profile name and job ID
+        self.in_flight = set()
+        self.held_reposts: Dict[Tuple[str, str], List[str]] = {}
         
         # Headers to mimic a real browser
         self.headers = {
@@ -46,6 +94,132 @@ class LinkedInJobTracker:
             'Upgrade-Insecure-Requests': '1',
         }
         
+        # One keep-alive connection pool shared by every profile
+        self.max_workers = self.config.get('scraping', {}).get('max_concurrent_searches', 4)
+        self.session = self.create_session()
+        self.scheduler = RequestScheduler.from_config(self.session, self.config.get('rate_limit', {}))
+        self.metrics.add_collector(self.collect_request_metrics)
+        
+        # Optional detail page enrichment of new jobs
+        enrichment = self.config.get('enrichment', {})
+        self.enricher = None
+        if enrichment.get('enabled'):
+            from job_enrichment import JobDetailCache, JobEnricher
+            self.enricher = JobEnricher(
+                self.scheduler,
+                JobDetailCache(enrichment.get('cache_file', 'job_details.db')),
+                max_workers=enrichment.get('max_workers', 4),
+                timeout_seconds=enrichment.get('timeout_seconds', 15),
+                batch_timeout_seconds=enrichment.get('batch_timeout_seconds', 60)
+            )
+        
+        # Splits multi-keyword searches and shares sub-query results between profiles
+        scraping = self.config.get('scraping', {})
+        self.planner = QueryPlanner(
+            self.search_subquery,
+            max_workers=scraping.get('max_concurrent_subqueries', 4),
+            split_keywords=scraping.get('split_keywords', False),
+            metrics=self.metrics
+        )
+        
+        # Config filter rules, compiled once per profile, see job_filters.py
+        self.job_filters = self.compile_filters(self.config)
+        
+        # Optional worker processes for parsing, see parse_pool.py
+        self.parse_pool = ParsePool.from_config(self.config.get('parsing', {}),
+                                                scraping.get('parser', DEFAULT_BACKEND))
+        
+        # Every scraped job, searchable with job_archive.py
+        archive = self.config.get('archive', {})
+        self.archive = None
+        if archive.get('enabled', True):
+            self.archive = JobArchive(archive.get('db_file', 'job_archive.db'))
+        
+        # Validators of previously fetched search pages
+        self.response_cache = None
+        if scraping.get('http_cache', True):
+            self.response_cache = ResponseCache(scraping.get('http_cache_file', 'http_cache.json'))
+        
+        # Notifications are sent and state is saved in the background, so a
+        # slow mail server or disk does not hold up the next poll
+        queue_size = self.config.get('pipeline', {}).get('queue_size', 16)
+        self.delivery = None
+        self.pending_run_times: Dict[str, datetime] = {}
+        self.notify_stage = Stage('notify', self.deliver, queue_size, on_idle=self.close_delivery,
+                                  metrics=self.metrics)
+        self.persist_stage = Stage('persist', self.commit_delivery, queue_size, on_idle=self.save_state,
+                                   metrics=self.metrics)
+        
+    def create_session(self) -> requests.Session:
+        """Create an HTTP session with a pool sized for concurrent searches"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.max_workers))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def collect_request_metrics(self, metrics: MetricsRegistry):
+        """Copy the request scheduler's counters into the metrics registry"""
+        for outcome in ('requests', 'retried', 'throttled', 'failed'):
+            metrics.set_counter('tracker_http_requests_total', self.scheduler.stats[outcome],
+                                outcome=outcome)
+    
+    def get_profiles(self, config: Optional[Dict] = None) -> List[Dict]:
+        """Return the configured search profiles
+        
+        Each profile is a search_criteria block with a unique 'name'. Configs
+        without a 'profiles' list run a single profile built from
+        'search_criteria'.
+        """
+        if config is None:
+            config = self.config
+        profiles = config.get('profiles')
+        if not profiles:
+            return [dict(config['search_criteria'], name='default')]
+        
+        named = []
+        for index, profile in enumerate(profiles, 1):
+            named.append(dict(profile, name=profile.get('name') or f"profile-{index}"))
+        return named
+    
+    def compile_filters(self, config: Dict) -> Dict[str, JobFilter]:
+        """Compile the 'filters' rules, plus each profile's own, per profile name"""
+        rules = config.get('filters', [])
+        return {
+            profile['name']: JobFilter(rules + profile.get('filters', []))
+            for profile in self.get_profiles(config)
+        }
+        
+    def get_config_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.config_file)
+        except OSError:
+            return None
+    
+    def reload_config_if_changed(self) -> bool:
+        """Reload config.json if it changed on disk
+        
+        Profiles, search criteria and monitoring settings take effect on the
+        next poll; connection, storage and rate limit settings need a restart.
+        """
+        mtime = self.get_config_mtime()
+        if mtime is None or mtime == self.config_mtime:
+            return False
+        try:
+            config = self.load_config(self.config_file)
+            job_filters = self.compile_filters(config)
+        except (OSError, ValueError) as e:
+            logging.error(f"Ignoring invalid config file {self.config_file}: {e}")
+            return False
+        finally:
+            self.config_mtime = mtime
+        self.config = config
+        self.job_filters = job_filters
+        self.add_last_run_times()
+        logging.info(f"Reloaded configuration from {self.config_file}")
+        return True
+    
     def load_config(self, config_file: str) -> Dict:
         """Load configuration from JSON file"""
         if os.path.exists(config_file):
@@ -77,36 +251,71 @@ class LinkedInJobTracker:
             logging.info(f"Created default config file: {config_file}")
             return default_config
     
-    def load_seen_jobs(self) -> set:
-        """Load previously seen job IDs"""
-        if os.path.exists(self.seen_jobs_file):
-            with open(self.seen_jobs_file, 'r') as f:
-                return set(json.load(f))
-        return set()
+    def load_seen_jobs(self) -> SeenJobStore:
+        """Open the store of previously seen job IDs"""
+        return open_seen_job_store(self.config.get('storage', {}), self.seen_jobs_file)
     
+    @timed_stage('save_seen_jobs')
     def save_seen_jobs(self):
-        """Save seen job IDs to file"""
-        with open(self.seen_jobs_file, 'w') as f:
-            json.dump(list(self.seen_jobs), f)
+        """Write pending seen job IDs to the store"""
+        self.seen_jobs.flush()
+        if self.near_duplicates is not None:
+            self.near_duplicates.flush()
+    
+    @timed_stage('save_archive')
+    def save_archive(self):
+        """Write this run's scraped jobs to the archive in one batch"""
+        if self.archive is not None:
+            count = self.archive.flush()
+            if count:
+                logging.info(f"Archived {count} jobs")
     
     def load_last_run_time(self):
         if os.path.exists(self.last_run_file):
             with open(self.last_run_file, 'r') as f:
-                return datetime.fromisoformat(json.load(f)['last_run'])
+                data = json.load(f)
+            self.last_run_times = {
+                name: datetime.fromisoformat(value)
+                for name, value in data.get('profiles', {}).items()
+            }
+            return datetime.fromisoformat(data['last_run'])
         else:
             # Default: 30 minutes ago
-            return datetime.now() - timedelta(minutes=30)
+            return self.clock() - timedelta(minutes=30)
 
-    def save_last_run_time(self):
+    def add_last_run_times(self):
+        """Give every configured profile without a last run time the one loaded at startup
+        
+        Each profile then moves forward only with its own polls, so one whose
+        first poll fails still covers its window on the next.
+        """
+        for profile in self.get_profiles():
+            self.last_run_times.setdefault(profile['name'], self.last_run_time)
+
+    def get_last_run_time(self, profile_name: str) -> datetime:
+        """Return the last run time of a profile, falling back to the one loaded at startup"""
+        return self.last_run_times.get(profile_name, self.last_run_time)
+
+    @timed_stage('save_last_run_time')
+    def save_last_run_time(self, profile_names: Optional[List[str]] = None, now: Optional[datetime] = None):
+        now = now or self.clock()
+        for name in profile_names or []:
+            self.last_run_times[name] = now
+        # Copied first, as a config reload may add profiles meanwhile
+        run_times = dict(self.last_run_times)
         with open(self.last_run_file, 'w') as f:
-            json.dump({'last_run': datetime.now().isoformat()}, f)
+            json.dump({
+                'last_run': now.isoformat(),
+                'profiles': {name: value.isoformat() for name, value in run_times.items()}
+            }, f)
     
-    def build_search_url(self) -> str:
+    def build_search_url(self, criteria: Optional[Dict] = None, start: int = 0) -> str:
         """Build LinkedIn job search URL based on criteria"""
-        criteria = self.config['search_criteria']
+        if criteria is None:
+            criteria = self.config['search_criteria']
         
         # Base LinkedIn jobs URL
-        base_url = "https://www.linkedin.com/jobs/search/?"
+        base_url = self.config.get('scraping', {}).get('base_url', SEARCH_BASE_URL) + "?"
         
         # Build query parameters
         params = []
@@ -156,232 +365,532 @@ class LinkedInJobTracker:
         # Sort by date posted
         params.append("sortBy=DD")  # Date posted
         
+        # Result page offset
+        if start:
+            params.append(f"start={start}")
+        
         return base_url + "&".join(params)
     
-    def scrape_linkedin_jobs(self) -> List[Dict]:
-        """Scrape job listings from LinkedIn"""
-        try:
-            url = self.build_search_url()
-            logging.info(f"Searching jobs at: {url}")
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            jobs = []
-            
-            # Find job cards
-            job_cards = soup.find_all('div', class_='base-card')
-            
-            for card in job_cards[:20]:  # Limit to first 20 jobs
-                try:
-                    # Extract job information
-                    job_id = card.get('data-entity-urn', '').split(':')[-1]
-                    
-                    # Job title
-                    title_elem = card.find('h3', class_='base-search-card__title')
-                    title = title_elem.get_text(strip=True) if title_elem else "N/A"
-                    
-                    # Company name
-                    company_elem = card.find('h4', class_='base-search-card__subtitle')
-                    company = company_elem.get_text(strip=True) if company_elem else "N/A"
-                    
-                    # Location
-                    location_elem = card.find('span', class_='job-search-card__location')
-                    location = location_elem.get_text(strip=True) if location_elem else "N/A"
-                    
-                    # Posted time
-                    time_elem = card.find('time')
-                    posted_time = time_elem.get('datetime') if time_elem else "N/A"
-                    
-                    # Job URL
-                    link_elem = card.find('a', class_='base-card__full-link')
-                    job_url = link_elem.get('href') if link_elem else ""
-                    
-                    # Create job object
-                    job = {
-                        'id': job_id,
-                        'title': title,
-                        'company': company,
-                        'location': location,
-                        'posted_time': posted_time,
-                        'url': job_url,
-                        'found_at': datetime.now().isoformat()
-                    }
-                    
-                    jobs.append(job)
-                    
-                except Exception as e:
-                    logging.error(f"Error parsing job card: {e}")
-                    continue
+    @timed_stage('parse')
+    def parse_job_cards(self, content: bytes) -> List[Dict]:
+        """Parse job cards from a search result page"""
+        backend = self.config.get('scraping', {}).get('parser', DEFAULT_BACKEND)
+        jobs, errors = self.parse_pool.parse(content, backend, int(self.clock().timestamp()))
+        self.metrics.inc('tracker_cards_total', len(jobs))
+        self.metrics.inc('tracker_unparseable_cards_total', len(errors))
+        return jobs
+    
+    def fetch_page(self, criteria: Optional[Dict] = None, start: int = 0,
+                   profile_names: Optional[List[str]] = None) -> Optional[bytes]:
+        """Fetch a page of search results for the given profiles (by default the one named in criteria)
+        
+        Returns None when the first page is unchanged since these profiles
+        last fetched it, which means nothing new has been posted.
+        """
+        url = self.build_search_url(criteria, start)
+        logging.info(f"Searching jobs at: {url}")
+        
+        profile_names = profile_names or [(criteria or {}).get('name', 'default')]
+        use_cache = self.response_cache is not None and start == 0
+        headers = self.response_cache.conditional_headers(url, profile_names) if use_cache else {}
+        response = self.scheduler.get(url, headers=headers, timeout=30)
+        response.raise_for_status()
+        self.metrics.inc('tracker_fetched_bytes_total', len(response.content))
+        
+        if use_cache and self.response_cache.is_unchanged(url, response, profile_names):
+            logging.info("Search results unchanged since the last run")
+            return None
+        return response.content
+    
+    def fetch_job_page(self, criteria: Optional[Dict] = None, start: int = 0,
+                       profile_names: Optional[List[str]] = None) -> Optional[List[Dict]]:
+        """Fetch and parse a single page of search results"""
+        content = self.fetch_page(criteria, start, profile_names)
+        if content is None:
+            return None
+        
+        jobs = self.parse_job_cards(content)
+        logging.info(f"Found {len(jobs)} jobs")
+        return jobs
+    
+    def is_stale(self, job: Dict, last_run_time: Optional[datetime], profile_names: List[str]) -> bool:
+        """Check whether a job is already seen by every given profile or posted before last_run_time
+        
+        A job only counts as old if even the latest time it may have been
+        posted (the end of the day, for date-only values) is before
+        last_run_time. Unparseable times never stop paging.
+        """
+        with self.lock:
+            if all(self.is_seen(job, name) for name in profile_names):
+                return True
+        return not posted_after(posted_window(job.get('posted_time'), self.clock()), last_run_time)
+    
+    def iter_jobs(self, criteria: Optional[Dict] = None, last_run_time: Optional[datetime] = None,
+                  profile_names: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Yield parsed jobs page by page, newest first
+        
+        Pages are walked with the 'start' offset and fetched lazily. Paging
+        stops at the first card that is stale (see is_stale) for all of
+        profile_names (by default the profile named in criteria), at an
+        empty page, at a page with nothing but repeats, or after
+        scraping.max_pages. Nothing is parsed when the first page is
+        unchanged since the last run. A page that cannot be fetched raises,
+        so the search fails instead of looking like it found nothing.
+        """
+        scraping = self.config.get('scraping', {})
+        max_pages = scraping.get('max_pages', 10)
+        page_size = scraping.get('page_size', 25)
+        
+        profile_names = profile_names or [(criteria or {}).get('name', 'default')]
+        yielded_ids = set()
+        for page in range(max_pages):
+            jobs = self.fetch_job_page(criteria, page * page_size, profile_names)
+            if jobs is None:
+                return
             
-            logging.info(f"Found {len(jobs)} jobs")
-            return jobs
+            fresh = [job for job in jobs if job['id'] not in yielded_ids]
+            if not fresh:
+                return
             
-        except Exception as e:
-            logging.error(f"Error scraping LinkedIn: {e}")
-            return []
+            for job in fresh:
+                if self.is_stale(job, last_run_time, profile_names):
+                    return
+                yielded_ids.add(job['id'])
+                yield job
+    
+    def search_subquery(self, criteria: Dict, last_run_time: Optional[datetime] = None,
+                        profile_names: Optional[List[str]] = None) -> List[Dict]:
+        """Fetch every job of one planned sub-query that is new to any of the profiles sharing it"""
+        return list(self.iter_jobs(criteria, last_run_time, profile_names))
+    
+    @timed_stage('scrape')
+    def scrape_linkedin_jobs(self, criteria: Optional[Dict] = None,
+                             last_run_time: Optional[datetime] = None) -> List[Dict]:
+        """Scrape job listings from LinkedIn
+        
+        With scraping.split_keywords (or a profile's split_keywords), each
+        keyword is searched separately and the results are merged newest
+        first, without duplicates.
+        """
+        if criteria is None:
+            criteria = self.config['search_criteria']
+        return self.planner.run(criteria, last_run_time, self.clock())
+    
+    def job_hash(self, job: Dict) -> str:
+        """Return the hash identifying a job by its ID, title and company"""
+        return hashlib.md5(f"{job['id']}_{job['title']}_{job['company']}".encode()).hexdigest()
     
-    def filter_new_jobs(self, jobs: List[Dict]) -> List[Dict]:
-        """Filter out jobs that have already been seen"""
+    def seen_key(self, job: Dict, profile_name: str) -> str:
+        """Return the key a profile's seen or in-flight job is stored under
+        
+        Each profile keeps its own seen jobs, so profiles that find the same
+        job, such as one search sent to two recipients, each notify it.
+        """
+        return f"{profile_name}:{self.job_hash(job)}"
+    
+    def is_seen(self, job: Dict, profile_name: str) -> bool:
+        """Check whether a profile notified a job or is notifying it; call with self.lock held
+        
+        Plain hashes stored before seen jobs were kept per profile count as
+        seen by every profile.
+        """
+        job_hash = self.job_hash(job)
+        key = f"{profile_name}:{job_hash}"
+        return key in self.in_flight or key in self.seen_jobs or job_hash in self.seen_jobs
+    
+    @timed_stage('filter_new')
+    def filter_new_jobs(self, jobs: List[Dict], mark_seen: bool = True,
+                        profile_name: str = 'default') -> List[Dict]:
+        """Filter out jobs a profile has already seen, or reposts of them
+        
+        A job with a new ID still counts as seen if the near-duplicate index
+        finds an earlier job of the profile with a similar enough title,
+        company and location. With mark_seen=False, new jobs (and reposts of
+        them) are only held in flight until commit_delivery() marks them seen
+        or releases them.
+        """
         new_jobs = []
+        near_duplicates = 0
+        scope = f"{profile_name}:"
         
-        for job in jobs:
-            job_hash = hashlib.md5(f"{job['id']}_{job['title']}_{job['company']}".encode()).hexdigest()
+        try:
+            for job in jobs:
+                key = self.seen_key(job, profile_name)
+            
+                with self.lock:
+                    if self.is_seen(job, profile_name):
+                        continue
+                    match = None
+                    if self.near_duplicates is not None:
+                        match = self.near_duplicates.check_and_add(key, job, scope)
+                    if mark_seen:
+                        self.seen_jobs.add(key)
+                    elif match is None:
+                        self.in_flight.add(key)
+                        self.held_reposts[(profile_name, job['id'])] = []
+                    elif (profile_name, match[0]) in self.held_reposts:
+                        # A repost of a job still in flight shares its fate
+                        self.in_flight.add(key)
+                        self.held_reposts[(profile_name, match[0])].append(key)
+                    else:
+                        self.seen_jobs.add(key)
             
-            if job_hash not in self.seen_jobs:
-                new_jobs.append(job)
-                self.seen_jobs.add(job_hash)
+                if match is not None:
+                    near_duplicates += 1
+                    logging.info(f"Skipping {job['title']} at {job['company']}: "
+                                 f"repost of job {match[0]} ({match[1]:.0%} similar)")
+                else:
+                    new_jobs.append(job)
+        
+        except Exception:
+            if not mark_seen:
+                # Jobs held so far would otherwise stay in flight for good
+                self.release_jobs(new_jobs, profile_name)
+            raise
         
         logging.info(f"Found {len(new_jobs)} new jobs")
+        self.metrics.inc('tracker_new_jobs_total', len(new_jobs))
+        self.metrics.inc('tracker_near_duplicate_jobs_total', near_duplicates)
+        self.metrics.inc('tracker_duplicate_jobs_total', len(jobs) - len(new_jobs) - near_duplicates)
         return new_jobs
     
-    def filter_jobs_by_time(self, jobs):
-        new_jobs = []
-        now = datetime.now()
-        for job in jobs:
-            # Parse job['posted_time'] to datetime
-            # LinkedIn may use ISO format or relative time (e.g., '5 minutes ago')
-            # You may need to parse accordingly
-            try:
-                posted_time = datetime.fromisoformat(job['posted_time'])
-            except Exception:
-                # Fallback: skip if can't parse
-                continue
-            if self.last_run_time < posted_time <= now:
-                new_jobs.append(job)
-        return new_jobs
-    
-    def send_email_notification(self, jobs: List[Dict]):
-        """Send email notification with new job listings"""
-        if not jobs:
-            return
-        
-        email_config = self.config['email']
-        
-        # Create email content
-        subject = f"New LinkedIn Job Alerts - {len(jobs)} new positions found"
-        
-        # Build HTML email body
-        html_body = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .job-card {{ 
-                    border: 1px solid #ddd; 
-                    padding: 15px; 
-                    margin: 10px 0; 
-                    border-radius: 5px;
-                    background-color: #f9f9f9;
-                }}
-                .job-title {{ color: #0073b1; font-size: 18px; font-weight: bold; }}
-                .company {{ color: #666; font-size: 14px; }}
-                .location {{ color: #666; font-size: 12px; }}
-                .apply-btn {{ 
-                    background-color: #0073b1; 
-                    color: white; 
-                    padding: 8px 16px; 
-                    text-decoration: none; 
-                    border-radius: 3px;
-                    display: inline-block;
-                    margin-top: 10px;
-                }}
-            </style>
-        </head>
-        <body>
-            <h2>🚀 New Job Opportunities Found!</h2>
-            <p>We found {len(jobs)} new job listings matching your criteria:</p>
+    @timed_stage('filter_by_time')
+    def filter_jobs_by_time(self, jobs, last_run_time: Optional[datetime] = None):
+        """Keep jobs that may have been posted between last_run_time and now
+        
+        Posted times may be ISO timestamps, dates or relative phrases such as
+        "5 minutes ago". Jobs whose time cannot be parsed are kept.
         """
+        if last_run_time is None:
+            last_run_time = self.last_run_time
+        now = self.clock()
+        windows = posted_windows((job.get('posted_time') for job in jobs), now)
+        return [
+            job for job, window in zip(jobs, windows)
+            if posted_after(window, last_run_time) and (window is None or window[0] <= now)
+        ]
+    
+    @timed_stage('filter_rules')
+    def apply_filters(self, jobs: List[Dict], profile: Dict) -> List[Dict]:
+        """Drop jobs matching the profile's filter rules, counting drops per rule"""
+        name = profile['name']
+        job_filter = self.job_filters.get(name)
+        if job_filter is None:
+            job_filter = self.job_filters[name] = JobFilter(
+                self.config.get('filters', []) + profile.get('filters', [])
+            )
+        kept, dropped = job_filter.apply(jobs)
+        if dropped:
+            counts = ', '.join(f"{rule} {count}" for rule, count in dropped.most_common())
+            logging.info(f"[{name}] Filters dropped {len(jobs) - len(kept)} jobs: {counts}")
+            for rule, count in dropped.items():
+                self.metrics.inc('tracker_filtered_jobs_total', count, profile=name, rule=rule)
+        return kept
+    
+    def get_recipients(self, profile: Optional[Dict] = None) -> List[str]:
+        """Return the notification recipients of a profile, defaulting to the email section"""
+        if profile and profile.get('recipient_email'):
+            return normalize_recipients(profile['recipient_email'])
+        return normalize_recipients(self.config['email']['recipient_email'])
+    
+    @timed_stage('notify')
+    def send_email_notification(self, jobs: List[Dict], profile: Optional[Dict] = None,
+                                delivery: Optional[SMTPDelivery] = None) -> List[Tuple[Digest, DeliveryResult]]:
+        """Send email notification with new job listings
         
-        for job in jobs:
-            html_body += f"""
-            <div class="job-card">
-                <div class="job-title">{job['title']}</div>
-                <div class="company">{job['company']}</div>
-                <div class="location">📍 {job['location']}</div>
-                <div class="location">⏰ Posted: {job['posted_time']}</div>
-                <a href="{job['url']}" class="apply-btn" target="_blank">View on LinkedIn</a>
-            </div>
-            """
-        
-        html_body += """
-        <p><small>This notification was sent by your LinkedIn Job Tracker.</small></p>
-        </body>
-        </html>
+        Pass an open SMTPDelivery to reuse its connection; otherwise a
+        connection is opened just for this notification.
         """
+        if not jobs:
+            return []
+        
+        if delivery is None:
+            with SMTPDelivery(self.config['email']) as own_delivery:
+                return self.send_digests(jobs, profile, own_delivery)
+        return self.send_digests(jobs, profile, delivery)
+    
+    def send_digests(self, jobs: List[Dict], profile: Optional[Dict],
+                     delivery: SMTPDelivery) -> List[Tuple[Digest, DeliveryResult]]:
+        """Render jobs into digests and send them over an open delivery"""
+        recipients = self.get_recipients(profile)
+        
+        # Split into digests of at most max_jobs_per_notification jobs
+        max_jobs = self.config.get('monitoring', {}).get('max_jobs_per_notification')
+        suffix = f" ({profile['name']})" if profile and profile['name'] != 'default' else ''
+        
+        return [
+            (digest, delivery.send(self.build_email_message(digest, recipients), recipients))
+            for digest in iter_digests(jobs, max_jobs, suffix)
+        ]
+    
+    def build_email_message(self, digest: Digest, recipients: List[str]) -> 'MIMEMultipart':
+        """Create a multipart message with plain-text and HTML versions of a digest"""
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
         
-        # Create message
         msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = email_config['sender_email']
-        msg['To'] = email_config['recipient_email']
+        msg['Subject'] = digest.subject
+        msg['From'] = self.config['email']['sender_email']
+        msg['To'] = ', '.join(recipients)
         
-        # Attach HTML content
-        html_part = MIMEText(html_body, 'html')
-        msg.attach(html_part)
+        # Clients show the last alternative they support, so HTML goes last
+        msg.attach(MIMEText(digest.text, 'plain', 'utf-8'))
+        msg.attach(MIMEText(digest.html, 'html', 'utf-8'))
+        return msg
+    
+    def deliver(self, notification: Tuple[Dict, List[Dict], datetime]):
+        """Notify stage: email a profile's new jobs and pass the outcome on to be saved
         
-        try:
-            # Send email
-            with smtplib.SMTP(email_config['smtp_server'], email_config['smtp_port']) as server:
-                server.starttls()
-                server.login(email_config['sender_email'], email_config['sender_password'])
-                server.send_message(msg)
-            
-            logging.info(f"Email notification sent successfully to {email_config['recipient_email']}")
-            
-        except Exception as e:
-            logging.error(f"Failed to send email: {e}")
+        Consecutive notifications share one SMTP connection, which is closed
+        once the queue is empty (see close_delivery).
+        """
+        profile, jobs, polled_at = notification
+        delivered, failed = [], []
+        if jobs:
+            if self.delivery is None:
+                self.delivery = self.create_delivery()
+            try:
+                for digest, result in self.send_email_notification(jobs, profile, self.delivery):
+                    (delivered if result.accepted else failed).extend(digest.jobs)
+            except Exception as e:
+                logging.error(f"[{profile['name']}] Failed to notify: {e}")
+            # Jobs the digests never reached were not delivered either
+            handled = {self.job_hash(job) for job in delivered + failed}
+            failed.extend(job for job in jobs if self.job_hash(job) not in handled)
+        self.persist_stage.put((profile['name'], delivered, failed, polled_at))
+    
+    def create_delivery(self) -> SMTPDelivery:
+        """Open the delivery the notify stage sends through"""
+        return SMTPDelivery(self.config['email'])
+    
+    def close_delivery(self):
+        if self.delivery is not None:
+            self.delivery.close()
+            logging.info(f"Email delivery: {self.delivery.summary()}")
+            self.delivery = None
+    
+    def commit_delivery(self, outcome: Tuple[str, List[Dict], List[Dict], datetime]):
+        """Persist stage: mark delivered jobs seen and release the rest for the next poll
+        
+        A profile's last run time only moves forward once all of its jobs
+        were delivered, so undelivered jobs are found and sent again.
+        """
+        name, delivered, failed, polled_at = outcome
+        with self.lock:
+            for job in delivered:
+                keys = [self.seen_key(job, name)] + self.held_reposts.pop((name, job['id']), [])
+                self.in_flight.difference_update(keys)
+                self.seen_jobs.update(keys)
+            if not failed:
+                self.pending_run_times[name] = polled_at
+        
+        if failed:
+            logging.warning(f"[{name}] {len(failed)} jobs were not delivered and will be retried next poll")
+            self.release_jobs(failed, name)
+    
+    def release_jobs(self, jobs: List[Dict], profile_name: str = 'default'):
+        """Take a profile's jobs (and reposts held with them) out of flight so its next poll finds them again"""
+        with self.lock:
+            keys = []
+            for job in jobs:
+                keys += [self.seen_key(job, profile_name)] + self.held_reposts.pop((profile_name, job['id']), [])
+            self.in_flight.difference_update(keys)
+        if self.near_duplicates is not None:
+            self.near_duplicates.discard(keys)
+        if self.response_cache is not None:
+            # An unchanged first page would otherwise skip them
+            self.response_cache.clear()
     
-    def run_once(self):
-        """Run one iteration of job checking"""
-        logging.info("Starting job search...")
-        jobs = self.scrape_linkedin_jobs()
+    def save_state(self):
+        """Write seen jobs, the archive, page validators and last run times in one go"""
+        self.save_seen_jobs()
+        self.save_archive()
+        if self.response_cache is not None:
+            self.response_cache.save()
+        with self.lock:
+            run_times, self.pending_run_times = self.pending_run_times, {}
+        for polled_at in sorted(set(run_times.values())):
+            self.save_last_run_time([name for name, value in run_times.items() if value == polled_at], polled_at)
+    
+    def wait_for_delivery(self):
+        """Wait until queued notifications are sent and their results saved"""
+        self.notify_stage.join()
+        self.persist_stage.join()
+    
+    def run_profile(self, profile: Dict) -> List[Dict]:
+        """Search and filter for a single profile, returning its new jobs"""
+        name = profile['name']
+        logging.info(f"[{name}] Starting job search...")
+        last_run_time = self.get_last_run_time(name)
+        jobs = self.scrape_linkedin_jobs(profile, last_run_time)
         if not jobs:
-            logging.warning("No jobs found or error occurred")
-            self.save_last_run_time()
-            return
+            logging.info(f"[{name}] No jobs newer than the last run")
+            return []
+        if self.archive is not None:
+            self.archive.add(jobs, name)
 
         # Filter by time window
-        jobs_in_window = self.filter_jobs_by_time(jobs)
+        jobs_in_window = self.filter_jobs_by_time(jobs, last_run_time)
+        # Drop jobs the config's filter rules exclude
+        jobs_in_window = self.apply_filters(jobs_in_window, profile)
         # Filter new jobs (not seen before)
-        new_jobs = self.filter_new_jobs(jobs_in_window)
+        new_jobs = self.filter_new_jobs(jobs_in_window, mark_seen=False, profile_name=name)
 
-        if new_jobs:
-            self.send_email_notification(new_jobs)
-            self.save_seen_jobs()
-        else:
-            logging.info("No new jobs found in this time window")
-        self.save_last_run_time()
+        if not new_jobs:
+            logging.info(f"[{name}] No new jobs found in this time window")
+        elif self.enricher is not None:
+            try:
+                new_jobs = self.enricher.enrich(new_jobs)
+            except Exception:
+                # Nothing will notify these jobs, so the next poll has to find them again
+                self.release_jobs(new_jobs, name)
+                raise
+        return new_jobs
+
+    def run_once(self, profiles: Optional[List[Dict]] = None, wait: bool = True) -> Dict[str, List[Dict]]:
+        """Run one iteration of job checking across all (or the given) profiles
+        
+        Returns the new jobs found for each profile name. Their notifications
+        are queued for the notify stage; with wait=False this returns without
+        waiting for them to be sent and saved. A profile whose search fails
+        is logged and left out of the result, and keeps its last run time,
+        so the next poll covers its window again.
+        """
+        if profiles is None:
+            profiles = self.get_profiles()
+        self.planner.start_cycle(profiles)
+        polled_at = self.clock()
+        workers = max(1, min(self.max_workers, len(profiles)))
+
+        results: Dict[str, List[Dict]] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(profile, executor.submit(self.run_profile, profile)) for profile in profiles]
+            for profile, future in futures:
+                try:
+                    results[profile['name']] = future.result()
+                except Exception as e:
+                    logging.error(f"[{profile['name']}] Search failed: {e}")
+
+        for profile in profiles:
+            if profile['name'] in results:
+                self.notify_stage.put((profile, results[profile['name']], polled_at))
+        if self.results_cache is not None:
+            for name, new_jobs in results.items():
+                self.results_cache.update(name, new_jobs)
+        
+        logging.info(f"Requests so far: {self.scheduler.summary()}")
+        if wait:
+            self.wait_for_delivery()
+        return results
+    
+    def start_metrics_server(self) -> Optional['MetricsServer']:
+        """Expose metrics for Prometheus if metrics.port is configured"""
+        metrics_config = self.config.get('metrics', {})
+        if not metrics_config.get('port'):
+            return None
+        from metrics_server import MetricsServer
+        server = MetricsServer(self.metrics, metrics_config.get('host', '127.0.0.1'), metrics_config['port'])
+        logging.info(f"Serving metrics at http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+        return server.start()
+    
+    def write_metrics(self):
+        """Write metrics to metrics.json_file, if configured"""
+        path = self.config.get('metrics', {}).get('json_file', 'metrics.json')
+        if path:
+            self.metrics.write_json(path)
+    
+    def stop(self, *args):
+        """Ask run_continuous to stop; safe to call from signal handlers and other threads"""
+        logging.info("Stopping job tracker...")
+        self.stop_event.set()
     
     def run_continuous(self):
-        """Run the job tracker continuously"""
-        interval = self.config['monitoring']['check_interval_minutes']
+        """Run the job tracker continuously
         
-        logging.info(f"Starting continuous monitoring (checking every {interval} minutes)")
-        
-        while True:
+        Profiles are polled when they fall due according to a PollScheduler.
+        Between polls the loop waits on stop_event in short slices, so a stop
+        request or a changed config.json takes effect within a second.
+        """
+        logging.info("Starting continuous monitoring")
+        self.start_metrics_server()
+        for signum in (signal.SIGINT, signal.SIGTERM):
             try:
-                self.run_once()
-                logging.info(f"Waiting {interval} minutes until next check...")
-                time.sleep(interval * 60)
-                
-            except KeyboardInterrupt:
-                logging.info("Stopping job tracker...")
+                signal.signal(signum, self.stop)
+            except ValueError:
+                # Signal handlers can only be installed from the main thread
                 break
+        
+        poll_scheduler = PollScheduler(self.config['monitoring'])
+        poll_scheduler.set_profiles([profile['name'] for profile in self.get_profiles()])
+        
+        while not self.stop_event.is_set():
+            if self.reload_config_if_changed():
+                poll_scheduler.configure(self.config['monitoring'])
+                poll_scheduler.set_profiles([profile['name'] for profile in self.get_profiles()])
+            
+            delay = poll_scheduler.seconds_until_due()
+            if delay is None or delay > 0:
+                self.stop_event.wait(min(delay if delay is not None else 1.0, 1.0))
+                continue
+            
+            due = set(poll_scheduler.pop_due())
+            profiles = [profile for profile in self.get_profiles() if profile['name'] in due]
+            try:
+                results = self.run_once(profiles, wait=False)
             except Exception as e:
                 logging.error(f"Error in continuous run: {e}")
-                time.sleep(60)  # Wait 1 minute before retrying
+                for name in due:
+                    poll_scheduler.record_failure(name)  # Retry in 1 minute
+                continue
+            
+            for name in due.difference(results):
+                poll_scheduler.record_failure(name)
+            for name, new_jobs in results.items():
+                interval = poll_scheduler.record_poll(name, len(new_jobs))
+                logging.info(f"[{name}] ~{poll_scheduler.rate(name):.1f} new jobs/hour, "
+                             f"next check in {interval / 60:.0f} minutes")
+        
+        self.close()
+    
+    def close(self):
+        """Finish queued notifications and saves, then stop background workers"""
+        self.notify_stage.close()
+        self.persist_stage.close()
+        self.parse_pool.close()
+    
+    def run_daemon(self):
+        """Run continuously and serve the latest jobs per profile over a local HTTP API
+        
+        Readers poll GET /jobs?since=... for the jobs found since their last
+        request, so any number of them share this process's scrapes.
+        """
+        from api_server import ApiServer
+        from results_cache import ResultsCache
+        
+        api_config = self.config.get('api', {})
+        self.results_cache = ResultsCache(api_config.get('max_jobs_per_profile', 500))
+        server = ApiServer(self.results_cache, api_config.get('host', '127.0.0.1'), api_config.get('port', 8765))
+        logging.info(f"Serving jobs at http://{server.server_address[0]}:{server.server_address[1]}/jobs")
+        server.start()
+        try:
+            self.run_continuous()
+        finally:
+            server.stop()
 
 def main():
     """Main function"""
+    setup_logging()
     tracker = LinkedInJobTracker()
     
-    # Check if running in continuous mode
+    # Check if running in continuous or daemon mode
     if len(os.sys.argv) > 1 and os.sys.argv[1] == '--continuous':
         tracker.run_continuous()
+    elif len(os.sys.argv) > 1 and os.sys.argv[1] == '--daemon':
+        tracker.run_daemon()
     else:
         tracker.run_once()
+        tracker.close()
+        tracker.write_metrics()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Tracker metrics
+Latency histograms and counters with Prometheus text and JSON export
+"""
+
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+# Upper bounds in seconds, from cache hits to slow SMTP handshakes
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HELP = {
+    'tracker_stage_seconds': "Time spent in each stage of a run",
+    'tracker_cards_total': "Job cards parsed from search result pages",
+    'tracker_unparseable_cards_total': "Job cards that could not be parsed",
+    'tracker_new_jobs_total': "Jobs not seen before",
+    'tracker_duplicate_jobs_total': "Jobs dropped because they were already seen",
+    'tracker_near_duplicate_jobs_total': "Jobs dropped as reposts of a similar job already seen",
+    'tracker_fetched_bytes_total': "Bytes of search result pages fetched",
+    'tracker_http_requests_total': "Outbound HTTP requests by outcome",
+    'tracker_subqueries_total': "Search sub-queries fetched or served from this cycle's results",
+    'tracker_filtered_jobs_total': "Jobs dropped by each config filter rule",
+    'tracker_pipeline_items_total': "Items handled by the notify and persist stages by outcome",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> Dict:
+        return {
+            'buckets': dict(zip((str(bound) for bound in self.buckets), self.counts)),
+            'count': self.count,
+            'sum': round(self.sum, 6),
+        }
+
+
+def _labels(labels: Dict) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value as the exposition format requires"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class MetricsRegistry:
+    """Thread-safe collection of counters and histograms"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.collectors: List[Callable[['MetricsRegistry'], None]] = []
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add to a counter"""
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            key = _labels(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set_counter(self, name: str, value: float, **labels):
+        """Set a counter that is tracked elsewhere (see add_collector)"""
+        with self.lock:
+            self.counters.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value in a histogram"""
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            key = _labels(labels)
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Record the duration of a block in tracker_stage_seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('tracker_stage_seconds', time.perf_counter() - started, stage=stage)
+
+    def add_collector(self, collector: Callable[['MetricsRegistry'], None]):
+        """Register a callback that refreshes metrics right before each export"""
+        self.collectors.append(collector)
+
+    def collect(self):
+        for collector in self.collectors:
+            collector(self)
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        self.collect()
+        lines = []
+        with self.lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        bucket_labels = _format_labels(key, 'le="%g"' % bound)
+                        lines.append(f"{name}_bucket{bucket_labels} {count}")
+                    inf_labels = _format_labels(key, 'le="+Inf"')
+                    lines.append(f"{name}_bucket{inf_labels} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self) -> Dict:
+        """Return every metric as plain data"""
+        self.collect()
+        with self.lock:
+            return {
+                'counters': {
+                    name: [dict(labels=dict(key), value=value) for key, value in series.items()]
+                    for name, series in self.counters.items()
+                },
+                'histograms': {
+                    name: [dict(labels=dict(key), **histogram.to_dict()) for key, histogram in series.items()]
+                    for name, series in self.histograms.items()
+                },
+            }
+
+    def write_json(self, path: str):
+        """Write every metric to a JSON file"""
+        with open(path, 'w') as f:
+            json.dump(dict(self.to_dict(), written_at=time.time()), f, indent=2)
+
+
+def timed_stage(stage: str):
+    """Method decorator timing calls into self.metrics under the given stage"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timer(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
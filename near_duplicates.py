@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection
+MinHash signatures and an LSH index that spot reposts of jobs already seen
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# How many times each field's features are repeated, so that the title and
+# company count for more than the location when comparing two jobs
+FIELD_WEIGHTS = {'title': 2, 'company': 2, 'location': 1}
+
+# Gender markers and filler words that vary between copies of the same job
+STOPWORDS = {'a', 'an', 'and', 'at', 'd', 'f', 'for', 'in', 'm', 'of', 'or', 'the', 'to', 'w', 'with', 'x'}
+
+TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+
+
+def tokens(text: Optional[str]) -> List[str]:
+    """Lowercase words of a field, without punctuation and filler words"""
+    if not text or text == 'N/A':
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def job_features(job: Dict, fields=tuple(FIELD_WEIGHTS)) -> List[str]:
+    """The set of weighted features MinHash compares two jobs by
+
+    Titles contribute words and word pairs, other fields one feature each.
+    """
+    features = set()
+    for field in fields:
+        words = tokens(job.get(field))
+        if not words:
+            continue
+        if field == 'title':
+            values = words + [' '.join(pair) for pair in zip(words, words[1:])]
+        else:
+            values = [' '.join(words)]
+        for copy in range(FIELD_WEIGHTS.get(field, 1)):
+            features.update(f"{field}:{copy}:{value}" for value in values)
+    return sorted(features)
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def optimal_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) minimizing false positives and negatives around threshold"""
+    def probability(similarity, bands, rows):
+        return 1 - (1 - similarity ** rows) ** bands
+
+    def integrate(func, low, high, steps=100):
+        width = (high - low) / steps
+        return sum(func(low + (i + 0.5) * width) for i in range(steps)) * width
+
+    best, best_error = (num_perm, 1), float('inf')
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        false_positives = integrate(lambda s: probability(s, bands, rows), 0.0, threshold)
+        false_negatives = integrate(lambda s: 1 - probability(s, bands, rows), threshold, 1.0)
+        error = false_positives + false_negatives
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """Computes MinHash signatures
+
+    Each feature is expanded by SHAKE-128 into num_perm independent 32-bit
+    hashes, and a signature keeps the minimum of each across all features.
+    """
+
+    def __init__(self, num_perm: int = 128):
+        self.num_perm = num_perm
+
+    def signature(self, features: List[str]) -> array:
+        hashes = [array('I', hashlib.shake_128(feature.encode('utf-8')).digest(4 * self.num_perm))
+                  for feature in features]
+        return array('I', map(min, zip(*hashes)))
+
+
+def similarity(first: array, second: array) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+class NearDuplicateIndex:
+    """LSH index of MinHash signatures kept in SQLite
+
+    Each signature is split into bands, and every band is stored under a
+    hash key. Jobs sharing at least one band key are candidates, and a
+    candidate is a near-duplicate if its estimated similarity reaches the
+    threshold. Lookups are a single indexed query however large the history
+    grows. New entries are buffered and written by flush(), like the seen
+    jobs store they usually share a database with.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.8, num_perm: int = 128,
+                 fields=tuple(FIELD_WEIGHTS), ttl_days: Optional[float] = None):
+        self.path = path
+        self.threshold = threshold
+        self.fields = tuple(fields)
+        self.ttl_seconds = ttl_days * 86400 if ttl_days else None
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = optimal_bands(num_perm, threshold)
+        self.pending: Dict[str, Tuple[str, array, List[int]]] = {}
+        self.pending_buckets: Dict[int, List[str]] = {}
+        self.lock = threading.RLock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_signatures ("
+                "job_hash TEXT PRIMARY KEY, job_id TEXT, signature BLOB NOT NULL, "
+                "first_seen INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS job_signatures_first_seen ON job_signatures (first_seen)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS lsh_buckets ("
+                "band_key INTEGER NOT NULL, job_hash TEXT NOT NULL, "
+                "PRIMARY KEY (band_key, job_hash)) WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS lsh_params (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+        self.check_params(num_perm)
+
+    def check_params(self, num_perm: int):
+        """Rebuild the buckets if the threshold changed, or start over if num_perm did"""
+        params = dict(self.conn.execute("SELECT name, value FROM lsh_params"))
+        current = {'num_perm': str(num_perm), 'bands': f"{self.bands}x{self.rows}"}
+        if params == current:
+            return
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM lsh_buckets")
+            if params.get('num_perm', current['num_perm']) != current['num_perm']:
+                self.conn.execute("DELETE FROM job_signatures")
+            rows = self.conn.execute("SELECT job_hash, signature FROM job_signatures").fetchall()
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO lsh_buckets (band_key, job_hash) VALUES (?, ?)",
+                ((key, job_hash) for job_hash, blob in rows for key in self.band_keys(array('I', blob)))
+            )
+            self.conn.executemany("INSERT OR REPLACE INTO lsh_params (name, value) VALUES (?, ?)",
+                                  current.items())
+        if rows:
+            logging.info(f"Rebuilt near-duplicate index buckets for {len(rows)} jobs")
+
+    def band_keys(self, signature: array) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            # SQLite integers are signed 64-bit
+            keys.append(_hash64(band.to_bytes(2, 'little') + chunk) - (1 << 63))
+        return keys
+
+    def find(self, signature: array, keys: List[int], scope: str = '') -> Optional[Tuple[str, float]]:
+        """Return (job_id, similarity) of the closest indexed job above the threshold
+
+        Only jobs whose hash starts with scope are compared.
+        """
+        candidates = {}
+        for key in keys:
+            for job_hash in self.pending_buckets.get(key, ()):
+                candidates[job_hash] = self.pending[job_hash][:2]
+        placeholders = ','.join('?' * len(keys))
+        rows = self.conn.execute(
+            "SELECT s.job_hash, s.job_id, s.signature FROM job_signatures s "
+            f"WHERE s.job_hash IN (SELECT job_hash FROM lsh_buckets WHERE band_key IN ({placeholders}))",
+            keys
+        ).fetchall()
+        for job_hash, job_id, blob in rows:
+            candidates[job_hash] = (job_id, array('I', blob))
+
+        best = None
+        for job_hash, (job_id, candidate) in candidates.items():
+            if not job_hash.startswith(scope):
+                continue
+            score = similarity(signature, candidate)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (job_id, score)
+        return best
+
+    def check_and_add(self, job_hash: str, job: Dict, scope: str = '') -> Optional[Tuple[str, float]]:
+        """Index a job, returning (job_id, similarity) of an earlier near-duplicate if any
+
+        With a scope, only earlier jobs whose hash starts with it count, so
+        callers can keep separate histories in one index by prefixing hashes.
+        """
+        features = job_features(job, self.fields)
+        if not features:
+            return None
+        signature = self.hasher.signature(features)
+        keys = self.band_keys(signature)
+        with self.lock:
+            match = self.find(signature, keys, scope)
+            self.pending[job_hash] = (job.get('id', ''), signature, keys)
+            for key in keys:
+                self.pending_buckets.setdefault(key, []).append(job_hash)
+        return match
+
+    def flush(self):
+        with self.lock:
+            if not self.pending:
+                return
+            now = int(time.time())
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO job_signatures (job_hash, job_id, signature, first_seen) "
+                    "VALUES (?, ?, ?, ?)",
+                    ((job_hash, job_id, signature.tobytes(), now)
+                     for job_hash, (job_id, signature, _) in self.pending.items())
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO lsh_buckets (band_key, job_hash) VALUES (?, ?)",
+                    ((key, job_hash) for job_hash, (_, _, keys) in self.pending.items() for key in keys)
+                )
+            self.pending.clear()
+            self.pending_buckets.clear()
+
+    def discard(self, job_hashes: List[str]):
+        """Forget jobs, such as jobs whose notification could not be delivered"""
+        with self.lock:
+            flushed = []
+            for job_hash in set(job_hashes):
+                entry = self.pending.pop(job_hash, None)
+                if entry is None:
+                    flushed.append(job_hash)
+                    continue
+                for key in entry[2]:
+                    self.pending_buckets[key].remove(job_hash)
+            if not flushed:
+                return
+            placeholders = ','.join('?' * len(flushed))
+            rows = self.conn.execute(
+                f"SELECT job_hash, signature FROM job_signatures WHERE job_hash IN ({placeholders})", flushed
+            ).fetchall()
+            with self.conn:
+                self.conn.executemany(
+                    "DELETE FROM lsh_buckets WHERE band_key = ? AND job_hash = ?",
+                    ((key, job_hash) for job_hash, blob in rows for key in self.band_keys(array('I', blob)))
+                )
+                self.conn.executemany("DELETE FROM job_signatures WHERE job_hash = ?",
+                                      ((job_hash,) for job_hash, _ in rows))
+
+    def evict_expired(self) -> int:
+        if not self.ttl_seconds:
+            return 0
+        cutoff = int(time.time() - self.ttl_seconds)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM lsh_buckets WHERE job_hash IN "
+                "(SELECT job_hash FROM job_signatures WHERE first_seen < ?)", (cutoff,)
+            )
+            cursor = self.conn.execute("DELETE FROM job_signatures WHERE first_seen < ?", (cutoff,))
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self.lock:
+            self.flush()
+            return self.conn.execute("SELECT COUNT(*) FROM job_signatures").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.conn.close()
+
+
+def open_near_duplicate_index(dedup_config: Dict, storage_config: Dict) -> Optional[NearDuplicateIndex]:
+    """Open the index described by the 'deduplication' config section, if enabled"""
+    if not dedup_config.get('enabled', True):
+        return None
+    index = NearDuplicateIndex(
+        dedup_config.get('db_file', storage_config.get('seen_jobs_db', 'seen_jobs.db')),
+        threshold=dedup_config.get('threshold', 0.8),
+        num_perm=dedup_config.get('num_perm', 128),
+        fields=dedup_config.get('fields', tuple(FIELD_WEIGHTS)),
+        ttl_days=storage_config.get('seen_jobs_ttl_days', 180)
+    )
+    evicted = index.evict_expired()
+    if evicted:
+        logging.info(f"Evicted {evicted} expired near-duplicate signatures")
+    return index
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Parse pool
+Parses search result pages in worker processes, so parsing is not limited by the GIL
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from job_parsers import DEFAULT_BACKEND, make_job, parse_job_cards, parse_page_records
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+ParseResult = Tuple[List[Dict], List[str]]
+
+
+class ParsePool:
+    """Parses pages serially or in a process pool
+
+    Workers receive raw page bytes and send back compact record tuples,
+    which are turned into job dicts here. Small jobs stay in-process: with
+    no workers, or for a page smaller than min_page_bytes, parsing happens
+    inline. Pages are parsed one at a time as they are fetched, so paging
+    can still stop early; the workers are kept busy by the searches that
+    run at the same time. The pool is started on first use and reused
+    until close().
+    """
+
+    def __init__(self, workers: int = 0, min_page_bytes: int = 0,
+                 backend: str = DEFAULT_BACKEND, start_method: str = 'spawn'):
+        self.workers = workers
+        self.min_page_bytes = min_page_bytes
+        self.backend = backend
+        self.start_method = start_method
+        self.executor = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, parsing_config: Dict, backend: str = DEFAULT_BACKEND) -> 'ParsePool':
+        """Build a pool from the 'parsing' config section; workers may be "auto" for one per core"""
+        workers = parsing_config.get('workers', 0)
+        if workers == 'auto':
+            workers = os.cpu_count() or 1
+        return cls(
+            workers=int(workers),
+            min_page_bytes=parsing_config.get('min_page_bytes', 0),
+            backend=backend,
+            start_method=parsing_config.get('start_method', 'spawn')
+        )
+
+    @property
+    def parallel(self) -> bool:
+        return self.workers > 0
+
+    def get_executor(self) -> 'ProcessPoolExecutor':
+        # Imported on first use so serial runs never load multiprocessing
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self.lock:
+            if self.executor is None:
+                # spawn avoids forking a process that already runs threads
+                context = multiprocessing.get_context(self.start_method)
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                logging.info(f"Started {self.workers} parser processes")
+            return self.executor
+
+    @staticmethod
+    def to_jobs(result: Tuple[List[tuple], List[str]], found_at: Optional[int] = None) -> ParseResult:
+        records, errors = result
+        if found_at is None:
+            found_at = int(time.time())
+        return [make_job(*record, found_at) for record in records], errors
+
+    @staticmethod
+    def parse_inline(content: bytes, backend: str, found_at: Optional[int] = None) -> ParseResult:
+        errors: List[str] = []
+        return parse_job_cards(content, backend, errors, found_at), errors
+
+    def parse(self, content: bytes, backend: Optional[str] = None,
+              found_at: Optional[int] = None) -> ParseResult:
+        """Parse one page, returning its jobs and the errors of unparseable cards
+
+        Jobs are stamped with found_at (Unix seconds), or the current time.
+        """
+        backend = backend or self.backend
+        if not self.parallel or len(content) < self.min_page_bytes:
+            return self.parse_inline(content, backend, found_at)
+        result = self.get_executor().submit(parse_page_records, content, backend).result()
+        return self.to_jobs(result, found_at)
+
+    def close(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Pipeline stages
+Worker threads connected by bounded queues, for the tracker's notify and persist stages
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+_STOP = object()
+
+
+class Stage:
+    """Worker threads handling items from a bounded queue
+
+    put() blocks while the queue is full, so a slow stage holds back the
+    stage feeding it instead of buffering without limit. `on_idle` runs
+    after an item whenever the queue has drained, which lets a stage batch
+    work such as disk writes across the items that arrived together.
+    Handler errors are logged and the item is dropped; join() waits until
+    every item put so far has been handled.
+    """
+
+    def __init__(self, name: str, handler: Callable, maxsize: int = 16, workers: int = 1,
+                 on_idle: Optional[Callable[[], None]] = None, metrics=None):
+        self.name = name
+        self.handler = handler
+        self.on_idle = on_idle
+        self.metrics = metrics
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self.threads = [
+            threading.Thread(target=self.work, name=f"{name}-{index}", daemon=True)
+            for index in range(max(1, workers))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, item):
+        """Queue an item, waiting for space if the stage is behind"""
+        try:
+            self.queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        started = time.perf_counter()
+        self.queue.put(item)
+        logging.info(f"Waited {time.perf_counter() - started:.2f}s for the {self.name} stage to catch up")
+
+    def work(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                try:
+                    self.handler(item)
+                    self.count('ok')
+                except Exception as e:
+                    logging.error(f"Error in {self.name} stage: {e}")
+                    self.count('error')
+                if self.on_idle is not None and self.queue.empty():
+                    try:
+                        self.on_idle()
+                    except Exception as e:
+                        logging.error(f"Error finishing {self.name} stage: {e}")
+            finally:
+                self.queue.task_done()
+
+    def count(self, outcome: str):
+        if self.metrics is not None:
+            self.metrics.inc('tracker_pipeline_items_total', stage=self.name, outcome=outcome)
+
+    def join(self):
+        """Wait until every queued item has been handled"""
+        self.queue.join()
+
+    def close(self):
+        """Handle the remaining items, then stop the workers"""
+        for _ in self.threads:
+            self.queue.put(_STOP)
+        for thread in self.threads:
+            thread.join()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Poll scheduler
+Decides when each search profile is polled next, based on how often it gets new jobs
+"""
+
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class ArrivalRateEstimator:
+    """Exponentially weighted estimate of new postings per hour
+
+    Each poll contributes the number of new jobs it found, divided by the
+    time since the previous poll, and is weighted by how long that interval
+    was so that older observations fade out with the given half-life. The
+    count of new jobs is used rather than the cards' posted_time values:
+    LinkedIn often gives those only as a date or "2 days ago", which cannot
+    tell apart rates of a few jobs per hour.
+    """
+
+    def __init__(self, initial_rate: float, half_life_hours: float = 6.0):
+        self.rate = initial_rate
+        self.half_life = half_life_hours
+
+    def update(self, new_jobs: int, elapsed_hours: float) -> float:
+        if elapsed_hours <= 0:
+            return self.rate
+        observed = new_jobs / elapsed_hours
+        weight = 1 - 0.5 ** (elapsed_hours / self.half_life)
+        self.rate += weight * (observed - self.rate)
+        return self.rate
+
+
+class PollScheduler:
+    """Priority queue of profiles ordered by when they are next due
+
+    With adaptive polling, a profile's interval aims for
+    target_new_jobs_per_poll new jobs per poll, bounded by the minimum and
+    maximum interval. If the intervals together would exceed
+    max_polls_per_hour, all of them are stretched to fit the budget.
+    Without it, every profile is polled every check_interval_minutes.
+    """
+
+    def __init__(self, monitoring_config: Dict, clock=time.monotonic):
+        self.clock = clock
+        self.queue: List[Tuple[float, str]] = []
+        self.estimators: Dict[str, ArrivalRateEstimator] = {}
+        self.last_polled: Dict[str, float] = {}
+        self.configure(monitoring_config)
+
+    def configure(self, monitoring_config: Dict):
+        """Apply (possibly reloaded) monitoring settings"""
+        self.interval = monitoring_config.get('check_interval_minutes', 30) * 60
+        self.adaptive = monitoring_config.get('adaptive_polling', True)
+        self.min_interval = monitoring_config.get('min_interval_minutes', 5) * 60
+        self.max_interval = monitoring_config.get('max_interval_minutes', 4 * self.interval / 60) * 60
+        self.target = monitoring_config.get('target_new_jobs_per_poll', 3)
+        self.max_polls_per_hour = monitoring_config.get('max_polls_per_hour', 60)
+        self.half_life = monitoring_config.get('rate_half_life_hours', 6)
+
+    def set_profiles(self, names: List[str]):
+        """Add new profiles as due now and forget removed ones"""
+        for name in names:
+            if name not in self.estimators:
+                # Start from the rate that makes the fixed interval hit the target
+                self.estimators[name] = ArrivalRateEstimator(self.target * 3600 / self.interval,
+                                                             self.half_life)
+                heapq.heappush(self.queue, (self.clock(), name))
+        for name in set(self.estimators) - set(names):
+            del self.estimators[name]
+            self.last_polled.pop(name, None)
+        self.queue = [(due, name) for due, name in self.queue if name in self.estimators]
+        heapq.heapify(self.queue)
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Seconds until the next profile is due, or None if there are no profiles"""
+        if not self.queue:
+            return None
+        return max(0.0, self.queue[0][0] - self.clock())
+
+    def pop_due(self) -> List[str]:
+        """Remove and return every profile that is due now"""
+        now = self.clock()
+        due = []
+        while self.queue and self.queue[0][0] <= now:
+            due.append(heapq.heappop(self.queue)[1])
+        return due
+
+    def base_interval(self, name: str) -> float:
+        if not self.adaptive:
+            return self.interval
+        rate = self.estimators[name].rate
+        if rate <= 0:
+            return self.max_interval
+        return min(self.max_interval, max(self.min_interval, self.target * 3600 / rate))
+
+    def budget_factor(self) -> float:
+        """How much every interval must be stretched to stay within max_polls_per_hour"""
+        if not self.adaptive or not self.max_polls_per_hour or not self.estimators:
+            return 1.0
+        polls_per_hour = sum(3600 / self.base_interval(name) for name in self.estimators)
+        return max(1.0, polls_per_hour / self.max_polls_per_hour)
+
+    def record_poll(self, name: str, new_jobs: int) -> float:
+        """Update a profile's rate estimate from the new jobs a poll found and queue its next one"""
+        if name not in self.estimators:
+            return 0.0
+        now = self.clock()
+        previous = self.last_polled.get(name)
+        if previous is not None:
+            self.estimators[name].update(new_jobs, (now - previous) / 3600)
+        self.last_polled[name] = now
+
+        interval = self.base_interval(name) * self.budget_factor()
+        heapq.heappush(self.queue, (now + interval, name))
+        return interval
+
+    def record_failure(self, name: str, retry_seconds: float = 60):
+        """Queue a profile whose poll failed to be retried soon"""
+        if name in self.estimators:
+            heapq.heappush(self.queue, (self.clock() + retry_seconds, name))
+
+    def rate(self, name: str) -> float:
+        """Current estimate of new jobs per hour for a profile"""
+        return self.estimators[name].rate
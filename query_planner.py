@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Query planner
+Splits multi-keyword searches into sub-queries, runs them concurrently and merges the results
+"""
+
+import heapq
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from time_normalizer import posted_window
+
+# Profile keys that do not change what a search returns
+NON_QUERY_KEYS = {'name', 'recipient_email', 'split_keywords', 'filters'}
+
+
+def query_key(criteria: Dict) -> str:
+    """Canonical form of a search, so identical sub-queries from different profiles match"""
+    return json.dumps({key: value for key, value in criteria.items() if key not in NON_QUERY_KEYS},
+                      sort_keys=True)
+
+
+def plan_queries(criteria: Dict, split: bool = False) -> List[Dict]:
+    """Return the sub-queries that together cover a search
+
+    With split, each keyword becomes its own sub-query with the rest of the
+    criteria unchanged; otherwise the search runs as a single query.
+    """
+    keywords = criteria.get('keywords') or []
+    if not split or len(keywords) < 2:
+        return [criteria]
+    unique = list(dict.fromkeys(keyword.strip() for keyword in keywords if keyword.strip()))
+    return [dict(criteria, keywords=[keyword]) for keyword in unique]
+
+
+def merge_by_posted_time(streams: Iterable[List[Dict]], now: Optional[datetime] = None) -> Iterator[Dict]:
+    """k-way merge of newest-first job lists, dropping repeated job ids
+
+    Jobs are ordered by the latest time they may have been posted; jobs
+    without a readable time sort first, as they do in is_stale.
+    """
+    now = now or datetime.now()
+
+    def newest_first(job: Dict) -> datetime:
+        window = posted_window(job.get('posted_time'), now)
+        return window[1] if window else datetime.max
+
+    seen_ids = set()
+    for job in heapq.merge(*streams, key=newest_first, reverse=True):
+        if job['id'] in seen_ids:
+            continue
+        seen_ids.add(job['id'])
+        yield job
+
+
+class QueryPlanner:
+    """Runs planned sub-queries with a per-cycle result cache
+
+    `search(criteria, last_run_time, profile_names)` fetches one sub-query's
+    jobs, newest first, for every profile in profile_names. Within a cycle
+    (see start_cycle), a sub-query that was already run, or is running, for
+    the same or an earlier last run time and for the asking profile is not
+    fetched again; its cached result is reused, so profiles sharing a
+    keyword and location cost one search between them.
+    """
+
+    def __init__(self, search: Callable[[Dict, Optional[datetime], List[str]], List[Dict]],
+                 max_workers: int = 4, split_keywords: bool = False, metrics=None):
+        self.search = search
+        self.max_workers = max(1, max_workers)
+        self.split_keywords = split_keywords
+        self.metrics = metrics
+        self.cache: Dict[str, Tuple[Optional[datetime], List[str], Future]] = {}
+        # Sub-query key -> names of the profiles of this cycle that run it
+        self.sharing: Dict[str, List[str]] = {}
+        self.lock = threading.Lock()
+
+    def start_cycle(self, profiles: Optional[List[Dict]] = None):
+        """Forget the previous cycle's results and note which profiles share each sub-query"""
+        sharing: Dict[str, List[str]] = {}
+        for profile in profiles or []:
+            for query in plan_queries(profile, profile.get('split_keywords', self.split_keywords)):
+                sharing.setdefault(query_key(query), []).append(profile.get('name', 'default'))
+        with self.lock:
+            self.cache.clear()
+            self.sharing = sharing
+
+    def covers(self, cached_since: Optional[datetime], since: Optional[datetime]) -> bool:
+        """Whether a result fetched back to cached_since also covers a search back to since"""
+        return cached_since is None or (since is not None and cached_since <= since)
+
+    def submit(self, executor: ThreadPoolExecutor, criteria: Dict,
+               last_run_time: Optional[datetime]) -> Future:
+        key = query_key(criteria)
+        name = criteria.get('name', 'default')
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None and name in cached[1] and self.covers(cached[0], last_run_time):
+                self.count('cached')
+                return cached[2]
+            names = self.sharing.get(key, [])
+            if name not in names:
+                names = [name]
+            future = executor.submit(self.search, criteria, last_run_time, names)
+            self.cache[key] = (last_run_time, names, future)
+        self.count('fetched')
+        return future
+
+    def count(self, outcome: str):
+        if self.metrics is not None:
+            self.metrics.inc('tracker_subqueries_total', outcome=outcome)
+
+    def run(self, criteria: Dict, last_run_time: Optional[datetime] = None,
+            now: Optional[datetime] = None) -> List[Dict]:
+        """Run every sub-query of a search and merge their results, newest first
+
+        If a sub-query fails, its error is raised once the others finish, as
+        merging the rest would pass a partial result off as complete.
+        """
+        split = criteria.get('split_keywords', self.split_keywords)
+        queries = plan_queries(criteria, split)
+        if len(queries) > 1:
+            logging.info(f"[{criteria.get('name', 'default')}] Split into {len(queries)} sub-queries: "
+                         f"{', '.join(query['keywords'][0] for query in queries)}")
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries))) as executor:
+            futures = [self.submit(executor, query, last_run_time) for query in queries]
+            streams = []
+            for query, future in zip(queries, futures):
+                try:
+                    streams.append(future.result())
+                except Exception as e:
+                    logging.error(f"Sub-query {query.get('keywords')} failed: {e}")
+                    raise
+        return list(merge_by_posted_time(streams, now))
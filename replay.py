@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Replay
+Backtests a configuration against saved search result snapshots instead of LinkedIn
+
+Snapshots are search result pages named after the time they were saved,
+e.g. `2024-06-01T09-30-00.html`. Further result pages of the same poll add
+their start offset: `2024-06-01T09-30-00.start25.html`. Pages directly in
+the snapshot directory are served to every profile; a subdirectory named
+after a profile holds pages served to that profile only.
+
+Every snapshot time becomes one run_once() of the profiles that have pages
+at that time, with the clock set to the snapshot time. Seen jobs and last
+run times live in a temporary directory, and notifications are written to
+a JSON lines file instead of being emailed.
+
+Usage:
+    python replay.py snapshots/ [--config config.json] [--config other.json] [--output replay.jsonl]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from email_delivery import DeliveryResult
+from linkedin_job_tracker import LinkedInJobTracker
+
+SNAPSHOT_RE = re.compile(
+    r'^(?P<time>\d{4}-?\d{2}-?\d{2}[T_ ]?\d{2}[-:]?\d{2}(?:[-:]?\d{2})?)(?:\.start(?P<start>\d+))?\.html?$'
+)
+
+
+def snapshot_time(text: str) -> datetime:
+    """Parse the time in a snapshot file name, e.g. 2024-06-01T09-30-00 or 20240601T0930"""
+    digits = re.sub(r'\D', '', text)
+    return datetime.strptime(digits.ljust(14, '0'), '%Y%m%d%H%M%S')
+
+
+class Snapshots:
+    """Saved result pages by profile (None for every profile), time and start offset"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.pages: Dict[Optional[str], Dict[datetime, Dict[int, str]]] = {}
+        for entry in sorted(os.listdir(directory)):
+            path = os.path.join(directory, entry)
+            if os.path.isdir(path):
+                for name in sorted(os.listdir(path)):
+                    self.add(entry, name, os.path.join(path, name))
+            else:
+                self.add(None, entry, path)
+
+    def add(self, profile: Optional[str], name: str, path: str):
+        match = SNAPSHOT_RE.match(name)
+        if match is None:
+            return
+        polls = self.pages.setdefault(profile, {})
+        polls.setdefault(snapshot_time(match.group('time')), {})[int(match.group('start') or 0)] = path
+
+    def times(self) -> List[datetime]:
+        return sorted({when for polls in self.pages.values() for when in polls})
+
+    def profiles_at(self, when: datetime, names: List[str]) -> List[str]:
+        """Profiles with pages saved at a given time"""
+        if when in self.pages.get(None, {}):
+            return list(names)
+        return [name for name in names if when in self.pages.get(name, {})]
+
+    def page(self, profile: str, when: datetime, start: int) -> Optional[str]:
+        for key in (profile, None):
+            pages = self.pages.get(key, {}).get(when)
+            if pages is not None:
+                return pages.get(start)
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(pages) for polls in self.pages.values() for pages in polls.values())
+
+
+class NullDelivery:
+    """Accepts every message without sending it"""
+
+    def __init__(self):
+        self.results: List[DeliveryResult] = []
+
+    def send(self, msg, recipients: List[str]) -> DeliveryResult:
+        result = DeliveryResult(msg['Subject'], recipients, 0.0)
+        self.results.append(result)
+        return result
+
+    def close(self):
+        pass
+
+    def summary(self) -> str:
+        return f"{len(self.results)} recorded"
+
+
+class ReplayTracker(LinkedInJobTracker):
+    """Tracker that reads result pages from snapshots and records notifications"""
+
+    def __init__(self, config_file: str, snapshots: Snapshots, output, label: str):
+        self.snapshots = snapshots
+        self.output = output
+        self.label = label
+        self.replay_time = snapshots.times()[0]
+        self.notifications: Dict[str, List[int]] = {}
+        super().__init__(config_file, clock=lambda: self.replay_time)
+
+    def fetch_page(self, criteria: Optional[Dict] = None, start: int = 0,
+                   profile_names: Optional[List[str]] = None) -> Optional[bytes]:
+        name = (criteria or {}).get('name', 'default')
+        path = self.snapshots.page(name, self.replay_time, start)
+        if path is None:
+            return b''
+        with open(path, 'rb') as f:
+            content = f.read()
+        self.metrics.inc('tracker_fetched_bytes_total', len(content))
+        return content
+
+    def create_delivery(self) -> NullDelivery:
+        return NullDelivery()
+
+    def send_digests(self, jobs: List[Dict], profile: Optional[Dict], delivery) -> List[Tuple]:
+        results = super().send_digests(jobs, profile, delivery)
+        name = profile['name'] if profile else 'default'
+        for digest, result in results:
+            self.output.write(json.dumps({
+                'config': self.label,
+                'time': self.replay_time.isoformat(),
+                'profile': name,
+                'subject': digest.subject,
+                'recipients': result.recipients,
+                'jobs': [dict(job) for job in digest.jobs],
+            }) + '\n')
+            counts = self.notifications.setdefault(name, [0, 0])
+            counts[0] += 1
+            counts[1] += len(digest.jobs)
+        return results
+
+
+def replay_config(config_path: str, snapshots: Snapshots, output, since: Optional[datetime] = None) -> Dict:
+    """Replay every snapshot through one configuration, returning per-profile totals"""
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+
+    # Throwaway state, and nothing that would reach the network
+    config.setdefault('storage', {}).update({'seen_jobs_db': 'seen_jobs.db', 'seen_jobs_ttl_days': None})
+    config.setdefault('deduplication', {}).pop('db_file', None)
+    config.setdefault('scraping', {})['http_cache'] = False
+    config['archive'] = {'enabled': False}
+    config['enrichment'] = {'enabled': False}
+
+    label = os.path.splitext(os.path.basename(config_path))[0]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='replay-') as workdir:
+        os.chdir(workdir)
+        try:
+            with open('config.json', 'w') as f:
+                json.dump(config, f)
+            tracker = ReplayTracker('config.json', snapshots, output, label)
+            if since is not None:
+                tracker.last_run_time = since
+                tracker.last_run_times = dict.fromkeys(tracker.last_run_times, since)
+
+            names = [profile['name'] for profile in tracker.get_profiles()]
+            polls = dict.fromkeys(names, 0)
+            for when in snapshots.times():
+                due = snapshots.profiles_at(when, names)
+                if not due:
+                    continue
+                tracker.replay_time = when
+                tracker.run_once([profile for profile in tracker.get_profiles() if profile['name'] in due])
+                for name in due:
+                    polls[name] += 1
+
+            tracker.close()
+            tracker.seen_jobs.close()
+            if tracker.near_duplicates is not None:
+                tracker.near_duplicates.close()
+        finally:
+            os.chdir(cwd)
+
+    return {
+        name: {
+            'polls': polls[name],
+            'notifications': tracker.notifications.get(name, [0, 0])[0],
+            'jobs': tracker.notifications.get(name, [0, 0])[1],
+        }
+        for name in names
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Backtest configurations against saved search result pages")
+    parser.add_argument('snapshots', help="Directory of saved search result pages")
+    parser.add_argument('--config', action='append', help="Config file to replay; repeat to compare several")
+    parser.add_argument('--output', default='replay.jsonl', help="Where to write the notifications")
+    parser.add_argument('--since', type=datetime.fromisoformat,
+                        help="Last run time before the first snapshot (default: 30 minutes before it)")
+    parser.add_argument('--verbose', action='store_true', help="Log every poll")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    snapshots = Snapshots(os.path.abspath(args.snapshots))
+    if not len(snapshots):
+        print(f"No snapshots found in {args.snapshots}")
+        return 1
+
+    configs = [os.path.abspath(path) for path in args.config or ['config.json']]
+    times = snapshots.times()
+    print(f"Replaying {len(snapshots)} pages from {len(times)} polls, {times[0]} to {times[-1]}")
+    print(f"{'config':<16} {'profile':<24} {'polls':>6} {'emails':>7} {'jobs':>6}")
+
+    started = time.perf_counter()
+    with open(os.path.abspath(args.output), 'w') as output:
+        for config_path in configs:
+            totals = replay_config(config_path, snapshots, output, args.since)
+            label = os.path.splitext(os.path.basename(config_path))[0]
+            for name, counts in totals.items():
+                print(f"{label:<16} {name:<24} {counts['polls']:>6} {counts['notifications']:>7} {counts['jobs']:>6}")
+
+    print(f"\nNotifications written to {args.output} ({time.perf_counter() - started:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Request scheduler
+Rate limits outbound requests and retries throttled or failed ones with backoff
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at a constant rate"""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until one is available; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RequestScheduler:
+    """Shared gateway for outbound HTTP requests
+
+    Every request takes a token from a global bucket and a slot from its
+    host's concurrency limit. Responses with a 429 or 5xx status, timeouts and
+    connection errors are retried with exponential backoff and full jitter,
+    honouring Retry-After. A Retry-After also pauses every other request to
+    the same host.
+    """
+
+    def __init__(self, session: requests.Session, requests_per_minute: float = 30,
+                 burst: int = 5, per_host_concurrency: int = 2, max_retries: int = 4,
+                 backoff_base_seconds: float = 2.0, backoff_max_seconds: float = 300.0):
+        self.session = session
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.per_host_concurrency = per_host_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base_seconds
+        self.backoff_max = backoff_max_seconds
+
+        self.lock = threading.Lock()
+        self.host_slots: Dict[str, threading.Semaphore] = {}
+        self.host_paused_until: Dict[str, float] = {}
+        self.stats = defaultdict(float)
+
+    @classmethod
+    def from_config(cls, session: requests.Session, rate_limit_config: Dict) -> 'RequestScheduler':
+        """Create a scheduler from the 'rate_limit' config section"""
+        return cls(session, **rate_limit_config)
+
+    def host_slot(self, host: str) -> threading.Semaphore:
+        with self.lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.Semaphore(self.per_host_concurrency)
+            return self.host_slots[host]
+
+    def wait_for_host(self, host: str):
+        """Sleep while the host is paused by an earlier Retry-After"""
+        with self.lock:
+            delay = self.host_paused_until.get(host, 0) - time.monotonic()
+        if delay > 0:
+            self.count('host_pause_seconds', delay)
+            time.sleep(delay)
+
+    def pause_host(self, host: str, seconds: float):
+        with self.lock:
+            until = time.monotonic() + seconds
+            self.host_paused_until[host] = max(self.host_paused_until.get(host, 0), until)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with full jitter, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def count(self, name: str, amount: float = 1):
+        with self.lock:
+            self.stats[name] += amount
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET a URL through the rate limiter, retrying throttled and failed attempts"""
+        return self.request('GET', url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            self.wait_for_host(host)
+            waited = self.bucket.acquire()
+            if waited:
+                self.count('rate_limited')
+                self.count('rate_limited_seconds', waited)
+
+            self.count('requests')
+            try:
+                with self.host_slot(host):
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    self.count('failed')
+                    raise
+                delay = self.backoff_delay(attempt)
+                logging.warning(f"Request to {host} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                if response.status_code == 429:
+                    self.count('throttled')
+                if attempt >= self.max_retries:
+                    self.count('failed')
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = self.backoff_delay(attempt, retry_after)
+                if retry_after is not None:
+                    self.pause_host(host, delay)
+                logging.warning(f"Got HTTP {response.status_code} from {host}, retrying in {delay:.1f}s")
+
+            self.count('retried')
+            attempt += 1
+            time.sleep(delay)
+
+    def summary(self) -> str:
+        """Describe the counters for logging"""
+        with self.lock:
+            return (f"{int(self.stats['requests'])} requests, "
+                    f"{int(self.stats['retried'])} retried, "
+                    f"{int(self.stats['throttled'])} throttled, "
+                    f"{int(self.stats['failed'])} failed, "
+                    f"{self.stats['rate_limited_seconds']:.1f}s waiting for the rate limit")
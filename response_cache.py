@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Search response cache
+Remembers validators and fingerprints of search pages to detect unchanged results
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, Iterable
+
+# Job ids and posting dates identify a result page; everything else on it
+# (tracking ids, CSRF tokens, ads) changes on every request
+CARD_MARKERS = re.compile(rb'data-entity-urn="([^"]*)"|<time[^>]*datetime="([^"]*)"')
+
+
+def page_fingerprint(content: bytes) -> str:
+    """Hash the job ids and posting dates on a page, or the whole body if it has none"""
+    digest = hashlib.sha256()
+    found = False
+    for match in CARD_MARKERS.finditer(content):
+        digest.update(match.group(0))
+        found = True
+    if not found:
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def entry_key(url: str, profiles: Iterable[str]) -> str:
+    """Cache key of a URL fetched for a set of profiles"""
+    return f"{','.join(sorted(profiles))} {url}"
+
+
+class ResponseCache:
+    """On-disk cache of search page validators keyed by URL and the profiles fetching it
+
+    Sends If-None-Match / If-Modified-Since when the server gave an ETag or
+    Last-Modified header, and otherwise compares a fingerprint of the body.
+    Profiles can fetch the same URL on different schedules, so a page only
+    counts as unchanged for the profiles that fetched it last time.
+    """
+
+    def __init__(self, path: str = 'http_cache.json'):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable HTTP cache {path}: {e}")
+
+    def conditional_headers(self, url: str, profiles: Iterable[str] = ()) -> Dict[str, str]:
+        """Return the conditional request headers for a URL fetched for the given profiles"""
+        with self.lock:
+            entry = self.entries.get(entry_key(url, profiles), {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url: str, response, profiles: Iterable[str] = ()) -> bool:
+        """Check a response against the profiles' previous fetch and remember its validators"""
+        if response.status_code == 304:
+            return True
+
+        key = entry_key(url, profiles)
+        fingerprint = page_fingerprint(response.content)
+        with self.lock:
+            previous = self.entries.get(key, {})
+            self.entries[key] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fingerprint': fingerprint
+            }
+            self.dirty = True
+        return previous.get('fingerprint') == fingerprint
+
+    def clear(self):
+        """Forget every validator, so that the next fetch of each page is parsed again"""
+        with self.lock:
+            if self.entries:
+                self.entries = {}
+                self.dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            with open(self.path, 'w') as f:
+                json.dump(self.entries, f)
+            self.dirty = False
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Results cache
+Keeps the latest jobs found for each profile in memory, for the daemon's HTTP API
+"""
+
+import bisect
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_timestamp(value: str) -> float:
+    """Parse a since value: Unix seconds or an ISO timestamp"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.strip().replace('Z', '+00:00')).timestamp()
+
+
+class ProfileResults:
+    """Jobs cached for one profile, oldest first"""
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.jobs: List[Dict] = []
+        self.ids = set()
+        self.last_poll: Optional[float] = None
+        self.polls = 0
+
+
+class ResultsCache:
+    """Latest jobs per profile, readable by time of arrival
+
+    Every job gets a `cached_at` time when it is added. Times are strictly
+    increasing, so a reader that passes the newest time it has seen as
+    `since` gets exactly the jobs added after it. Each profile keeps its
+    newest max_jobs jobs. `generation` changes whenever a profile is polled,
+    and rendered responses are memoized until it does.
+    """
+
+    def __init__(self, max_jobs: int = 500):
+        self.max_jobs = max(1, max_jobs)
+        self.profiles: Dict[str, ProfileResults] = {}
+        self.generation = 0
+        self.last_time = 0.0
+        self.rendered: Dict[str, Tuple[bytes, str]] = {}
+        self.lock = threading.Lock()
+
+    def update(self, profile: str, jobs: List[Dict], polled_at: Optional[float] = None):
+        """Record a poll of a profile and cache the jobs it found"""
+        polled_at = polled_at if polled_at is not None else time.time()
+        with self.lock:
+            results = self.profiles.setdefault(profile, ProfileResults())
+            results.last_poll = polled_at
+            results.polls += 1
+
+            added = 0
+            for job in jobs:
+                if job.get('id') in results.ids:
+                    continue
+                # Strictly increasing, even for jobs added in the same microsecond
+                self.last_time = max(polled_at, round(self.last_time + 1e-6, 6))
+                results.times.append(self.last_time)
+                results.jobs.append(dict(job, profile=profile,
+                                         cached_at=datetime.fromtimestamp(self.last_time).isoformat()))
+                results.ids.add(job.get('id'))
+                added += 1
+
+            excess = len(results.jobs) - self.max_jobs
+            if excess > 0:
+                for job in results.jobs[:excess]:
+                    results.ids.discard(job.get('id'))
+                del results.times[:excess], results.jobs[:excess]
+
+            # Poll times show up in /profiles, so any update is a new generation
+            self.generation += 1
+            self.rendered.clear()
+        return added
+
+    def jobs(self, profile: Optional[str] = None, since: Optional[float] = None,
+             limit: Optional[int] = None) -> Tuple[List[Dict], Optional[float]]:
+        """Jobs added after `since`, oldest first, and the time to pass as the next since
+
+        With a limit, the oldest `limit` jobs are returned and the next since
+        continues from the last of them.
+        """
+        with self.lock:
+            names = [profile] if profile is not None else sorted(self.profiles)
+            selected = []
+            for name in names:
+                results = self.profiles.get(name)
+                if results is None:
+                    continue
+                # Half a microsecond of slack, for since values read back from cached_at
+                start = bisect.bisect_right(results.times, since + 5e-7) if since is not None else 0
+                selected.extend(zip(results.times[start:], results.jobs[start:]))
+        selected.sort(key=lambda entry: entry[0])
+        if limit is not None:
+            selected = selected[:limit]
+        next_since = selected[-1][0] if selected else since
+        return [job for _, job in selected], next_since
+
+    def summary(self) -> Dict:
+        with self.lock:
+            return {
+                name: {
+                    'jobs': len(results.jobs),
+                    'polls': results.polls,
+                    'last_poll': datetime.fromtimestamp(results.last_poll).isoformat() if results.last_poll else None,
+                    'newest': datetime.fromtimestamp(results.times[-1]).isoformat() if results.times else None,
+                }
+                for name, results in self.profiles.items()
+            }
+
+    def render(self, key: str, build) -> Tuple[bytes, str]:
+        """JSON body and ETag for a request, rebuilt only when the generation changes"""
+        with self.lock:
+            generation = self.generation
+            cached = self.rendered.get(key)
+        if cached is not None:
+            return cached
+        body = json.dumps(build(), default=str).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        with self.lock:
+            if self.generation == generation:
+                if len(self.rendered) >= 256:
+                    self.rendered.clear()
+                self.rendered[key] = (body, etag)
+        return body, etag
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Seen jobs storage
+Keeps track of job hashes that have already been notified
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+
+class SeenJobStore:
+    """Set-like store of seen job hashes
+
+    Supports `job_hash in store` and `store.add(job_hash)` like the plain set
+    it replaces. Additions may be buffered until flush() is called.
+    """
+
+    def __contains__(self, job_hash: str) -> bool:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def add(self, job_hash: str):
+        raise NotImplementedError
+
+    def update(self, job_hashes: Iterable[str]):
+        """Add several job hashes"""
+        for job_hash in job_hashes:
+            self.add(job_hash)
+
+    def flush(self):
+        """Persist buffered additions"""
+
+    def evict_expired(self) -> int:
+        """Remove entries older than the configured TTL, returning how many"""
+        return 0
+
+    def close(self):
+        """Flush and release any resources"""
+        self.flush()
+
+
+class JsonSeenJobStore(SeenJobStore):
+    """Legacy store: the whole set lives in memory and the JSON file is rewritten on flush"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.job_hashes = set()
+        self.dirty = False
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.job_hashes = set(json.load(f))
+
+    def __contains__(self, job_hash: str) -> bool:
+        return job_hash in self.job_hashes
+
+    def __len__(self) -> int:
+        return len(self.job_hashes)
+
+    def add(self, job_hash: str):
+        if job_hash not in self.job_hashes:
+            self.job_hashes.add(job_hash)
+            self.dirty = True
+
+    def flush(self):
+        if not self.dirty:
+            return
+        with open(self.path, 'w') as f:
+            json.dump(list(self.job_hashes), f)
+        self.dirty = False
+
+
+class SqliteSeenJobStore(SeenJobStore):
+    """SQLite store with indexed lookups, batched writes and TTL eviction
+
+    Only pending additions are held in memory. Membership checks hit the
+    primary key index, and pending additions are written in one transaction
+    when the batch fills up or flush() is called.
+    """
+
+    def __init__(self, path: str, ttl_days: Optional[float] = None, batch_size: int = 500):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400 if ttl_days else None
+        self.batch_size = batch_size
+        self.pending: Dict[str, int] = {}
+        self.lock = threading.RLock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_jobs ("
+                "job_hash TEXT PRIMARY KEY, first_seen INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS seen_jobs_first_seen ON seen_jobs (first_seen)"
+            )
+
+    def __contains__(self, job_hash: str) -> bool:
+        with self.lock:
+            if job_hash in self.pending:
+                return True
+            row = self.conn.execute(
+                "SELECT 1 FROM seen_jobs WHERE job_hash = ?", (job_hash,)
+            ).fetchone()
+            return row is not None
+
+    def __len__(self) -> int:
+        with self.lock:
+            self.flush()
+            return self.conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+
+    def add(self, job_hash: str):
+        with self.lock:
+            self.pending.setdefault(job_hash, int(time.time()))
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.pending:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen_jobs (job_hash, first_seen) VALUES (?, ?)",
+                    self.pending.items()
+                )
+            self.pending.clear()
+
+    def evict_expired(self) -> int:
+        if not self.ttl_seconds:
+            return 0
+        cutoff = int(time.time() - self.ttl_seconds)
+        with self.lock, self.conn:
+            cursor = self.conn.execute("DELETE FROM seen_jobs WHERE first_seen < ?", (cutoff,))
+        return cursor.rowcount
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.conn.close()
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """Import a legacy seen_jobs.json file and rename it so it is only imported once"""
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, 'r') as f:
+            job_hashes = json.load(f)
+
+        now = int(time.time())
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_jobs (job_hash, first_seen) VALUES (?, ?)",
+                ((job_hash, now) for job_hash in job_hashes)
+            )
+        os.replace(json_path, json_path + '.migrated')
+        logging.info(f"Migrated {len(job_hashes)} seen jobs from {json_path} to {self.path}")
+        return len(job_hashes)
+
+
+def open_seen_job_store(storage_config: Dict, json_path: str = 'seen_jobs.json') -> SeenJobStore:
+    """Open the seen jobs store described by the 'storage' config section"""
+    backend = storage_config.get('seen_jobs_backend', 'sqlite')
+    if backend == 'json':
+        return JsonSeenJobStore(json_path)
+    if backend != 'sqlite':
+        raise ValueError(f"Unknown seen jobs backend: {backend}")
+
+    store = SqliteSeenJobStore(
+        storage_config.get('seen_jobs_db', 'seen_jobs.db'),
+        ttl_days=storage_config.get('seen_jobs_ttl_days', 180),
+        batch_size=storage_config.get('batch_size', 500)
+    )
+    store.migrate_from_json(json_path)
+    evicted = store.evict_expired()
+    if evicted:
+        logging.info(f"Evicted {evicted} expired seen jobs")
+    return store
@@ -6,8 +6,33 @@ Verifies that the tracker can connect to LinkedIn and send emails
 
 import json
 import os
+import tempfile
+from contextlib import contextmanager
 from linkedin_job_tracker import LinkedInJobTracker
 
+@contextmanager
+def temp_tracker():
+    """A tracker built from config.json that keeps its state files in a temporary directory"""
+    with open('config.json', 'r') as f:
+        config = json.load(f)
+    with tempfile.TemporaryDirectory() as tmp:
+        config.setdefault('storage', {})['seen_jobs_db'] = os.path.join(tmp, 'seen_jobs.db')
+        config.setdefault('archive', {})['db_file'] = os.path.join(tmp, 'job_archive.db')
+        config.setdefault('scraping', {})['http_cache_file'] = os.path.join(tmp, 'http_cache.json')
+        path = os.path.join(tmp, 'config.json')
+        with open(path, 'w') as f:
+            json.dump(config, f)
+        tracker = LinkedInJobTracker(path)
+        try:
+            yield tracker
+        finally:
+            tracker.close()
+            tracker.seen_jobs.close()
+            if tracker.near_duplicates is not None:
+                tracker.near_duplicates.close()
+            if tracker.archive is not None:
+                tracker.archive.close()
+
 def test_config():
     """Test if configuration file exists and is valid"""
     print("🔧 Testing configuration...")
@@ -50,8 +75,8 @@ def test_linkedin_connection():
     print("\n🔍 Testing LinkedIn connection...")
     
     try:
-        tracker = LinkedInJobTracker()
-        jobs = tracker.scrape_linkedin_jobs()
+        with temp_tracker() as tracker:
+            jobs = tracker.scrape_linkedin_jobs()
         
         if jobs:
             print(f"✅ Successfully found {len(jobs)} jobs")
@@ -74,8 +99,8 @@ def test_email_config():
     print("\n📧 Testing email configuration...")
     
     try:
-        tracker = LinkedInJobTracker()
-        email_config = tracker.config['email']
+        with temp_tracker() as tracker:
+            email_config = tracker.config['email']
         
         print(f"SMTP Server: {email_config['smtp_server']}")
         print(f"SMTP Port: {email_config['smtp_port']}")
@@ -103,8 +128,8 @@ def test_search_url():
     print("\n🔗 Testing search URL generation...")
     
     try:
-        tracker = LinkedInJobTracker()
-        url = tracker.build_search_url()
+        with temp_tracker() as tracker:
+            url = tracker.build_search_url()
         print(f"Generated URL: {url}")
         print("✅ Search URL generated successfully")
         return True
@@ -113,6 +138,1309 @@ def test_search_url():
         print(f"❌ Error generating search URL: {e}")
         return False
 
+def test_parser_backends():
+    """Test that every parser backend extracts the same jobs offline"""
+    print("\n🧩 Testing job card parser backends...")
+    
+    try:
+        from job_parsers import PARSERS
+        
+        page = os.path.join('benchmarks', 'pages', 'search_ireland_android_cloud.html')
+        with open(page, 'rb') as f:
+            content = f.read()
+        
+        def comparable(jobs):
+            return [{k: v for k, v in job.items() if k != 'found_at'} for job in jobs]
+        
+        expected = comparable(PARSERS['soup'](content))
+        for backend, parse in PARSERS.items():
+            if comparable(parse(content)) != expected:
+                print(f"❌ Backend '{backend}' does not match the original parser")
+                return False
+        
+        print(f"✅ All {len(PARSERS)} backends extracted the same {len(expected)} jobs")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing parser backends: {e}")
+        return False
+
+def test_job_records():
+    """Test that compact job records read like job dicts"""
+    print("\n📇 Testing job records...")
+    
+    try:
+        import pickle
+        from job_records import JobRecord
+        
+        fields = ('1', 'Android Engineer', 'Acme', 'Dublin, Ireland', '2024-01-15', 'https://example.com/1')
+        first = JobRecord(*fields, found_at=1705320000)
+        second = JobRecord('2', 'Cloud Engineer', ''.join(['Ac', 'me']), ''.join(['Dublin', ', Ireland']),
+                           '2024-01-15', 'https://example.com/2', found_at=1705320000)
+        as_dict = first.to_dict()
+        
+        if as_dict != dict(zip(('id', 'title', 'company', 'location', 'posted_time', 'url'), fields),
+                           found_at=as_dict['found_at']) or first != as_dict:
+            print(f"❌ Unexpected job dict: {as_dict}")
+            return False
+        if first.company is not second.company or first.location is not second.location:
+            print("❌ Company and location strings were not shared")
+            return False
+        if pickle.loads(pickle.dumps(first)) != first or JobRecord.from_dict(as_dict).found_at != first.found_at:
+            print("❌ Job record did not round-trip")
+            return False
+        
+        print("✅ Job records match job dicts and share repeated strings")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing job records: {e}")
+        return False
+
+def test_parse_pool():
+    """Test that worker processes return the same jobs as inline parsing"""
+    print("\n🏭 Testing parse pool...")
+    
+    try:
+        from parse_pool import ParsePool
+        
+        page = os.path.join('benchmarks', 'pages', 'search_ireland_android_cloud.html')
+        with open(page, 'rb') as f:
+            content = f.read()
+        
+        def comparable(results):
+            return [[{k: v for k, v in job.items() if k != 'found_at'} for job in jobs] for jobs, _ in results]
+        
+        expected = comparable([ParsePool().parse(content)] * 3)
+        pool = ParsePool(workers=2)
+        try:
+            results = comparable([pool.parse(content) for _ in range(3)])
+        finally:
+            pool.close()
+        
+        if results != expected:
+            print("❌ Worker processes returned different jobs")
+            return False
+        
+        print(f"✅ 2 workers parsed {len(results)} pages like inline parsing")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing parse pool: {e}")
+        return False
+
+def test_request_scheduler():
+    """Test Retry-After handling, backoff counters and giving up after max_retries"""
+    print("\n⏱️  Testing request scheduler...")
+    
+    try:
+        import time
+        import requests
+        from request_scheduler import RequestScheduler
+        
+        class FakeSession:
+            """Plays back (status, headers) responses or raises exceptions, in order"""
+            def __init__(self, *outcomes):
+                self.outcomes = list(outcomes)
+            
+            def request(self, method, url, **kwargs):
+                outcome = self.outcomes.pop(0)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                response = requests.Response()
+                response.status_code, headers = outcome
+                response.headers.update(headers)
+                return response
+        
+        def scheduler(*outcomes):
+            return RequestScheduler(FakeSession(*outcomes), requests_per_minute=6000, burst=10,
+                                    max_retries=2, backoff_base_seconds=0.01)
+        
+        # 429 with Retry-After waits that long, then succeeds
+        throttled = scheduler((429, {'Retry-After': '0.3'}), (200, {}))
+        started = time.perf_counter()
+        response = throttled.get('https://www.linkedin.com/jobs/search/')
+        waited = time.perf_counter() - started
+        stats = {name: throttled.stats[name] for name in ('requests', 'retried', 'throttled', 'failed')}
+        if response.status_code != 200 or not 0.3 <= waited < 1.0 or \
+                stats != {'requests': 2, 'retried': 1, 'throttled': 1, 'failed': 0}:
+            print(f"❌ Retry-After not honoured: HTTP {response.status_code} after {waited:.2f}s, {stats}")
+            return False
+        
+        # 503s are retried with backoff, then the last response is returned
+        unavailable = scheduler((503, {}), (503, {}), (503, {}))
+        response = unavailable.get('https://www.linkedin.com/jobs/search/')
+        if response.status_code != 503 or unavailable.stats['requests'] != 3 or \
+                unavailable.stats['retried'] != 2 or unavailable.stats['failed'] != 1:
+            print(f"❌ Unexpected 503 handling: {unavailable.summary()}")
+            return False
+        
+        # Timeouts are retried max_retries times, then raised
+        timing_out = scheduler(*[requests.Timeout("read timed out")] * 3)
+        try:
+            timing_out.get('https://www.linkedin.com/jobs/search/')
+            print("❌ Timeout was not raised after max_retries")
+            return False
+        except requests.Timeout:
+            pass
+        if timing_out.stats['requests'] != 3 or timing_out.stats['failed'] != 1:
+            print(f"❌ Unexpected timeout handling: {timing_out.summary()}")
+            return False
+        
+        print(f"✅ Waited {waited:.2f}s for Retry-After, gave up after {int(timing_out.stats['retried'])} retries")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing request scheduler: {e}")
+        return False
+
+def test_poll_scheduler():
+    """Test adaptive poll intervals, their bounds and the polling budget"""
+    print("\n🗓️  Testing poll scheduler...")
+    
+    try:
+        from poll_scheduler import PollScheduler
+        
+        now = [0.0]
+        scheduler = PollScheduler({"check_interval_minutes": 30, "min_interval_minutes": 5,
+                                   "max_interval_minutes": 120, "target_new_jobs_per_poll": 3,
+                                   "max_polls_per_hour": 60}, clock=lambda: now[0])
+        scheduler.set_profiles(['busy', 'quiet'])
+        if sorted(scheduler.pop_due()) != ['busy', 'quiet']:
+            print("❌ New profiles should be due straight away")
+            return False
+        first = [scheduler.record_poll(name, 0) for name in ('busy', 'quiet')]
+        
+        # A flood of new jobs hits the minimum interval, an empty poll lengthens the interval
+        now[0] += 3600
+        due = sorted(scheduler.pop_due())
+        busy = scheduler.record_poll('busy', 600)
+        quiet = scheduler.record_poll('quiet', 0)
+        if due != ['busy', 'quiet'] or first != [1800, 1800] or busy != 300 or not 1800 < quiet < 7200:
+            print(f"❌ Expected intervals 1800s, then 300s (busy) and 1800-7200s (quiet), "
+                  f"got {first}, {busy}, {quiet}")
+            return False
+        
+        # Two quiet days reach the maximum interval
+        now[0] += 48 * 3600
+        scheduler.pop_due()
+        busy = scheduler.record_poll('busy', 48 * 600)
+        quiet = scheduler.record_poll('quiet', 0)
+        if busy != 300 or quiet != 7200:
+            print(f"❌ Expected intervals 300s (busy) and 7200s (quiet), got {busy}, {quiet}")
+            return False
+        
+        # 12 + 0.5 polls an hour against a budget of 10 stretches every interval by 1.25
+        scheduler.configure({"check_interval_minutes": 30, "min_interval_minutes": 5,
+                             "max_interval_minutes": 120, "target_new_jobs_per_poll": 3,
+                             "max_polls_per_hour": 10})
+        now[0] += 300
+        due = scheduler.pop_due()
+        stretched = scheduler.record_poll('busy', 50)
+        if due != ['busy'] or stretched != 375 or scheduler.seconds_until_due() != 375:
+            print(f"❌ Expected the budget to stretch busy polls from 300s to 375s, got {due}, {stretched}s")
+            return False
+        
+        print(f"✅ Intervals kept within 300-7200s, budget stretched busy polls to {stretched:.0f}s")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing poll scheduler: {e}")
+        return False
+
+def test_query_planner():
+    """Test that split keyword searches are merged newest first without duplicates"""
+    print("\n🔀 Testing query planner...")
+    
+    try:
+        from query_planner import QueryPlanner
+        
+        def search(criteria, last_run_time, profile_names):
+            keyword = criteria['keywords'][0]
+            return [{'id': f"{keyword}-{day}" if day % 2 else f"both-{day}", 'posted_time': f"2024-01-{day:02d}"}
+                    for day in (20, 15, 11, 10)]
+        
+        planner = QueryPlanner(search, split_keywords=True)
+        jobs = planner.run({'keywords': ['android', 'cloud'], 'location': 'Ireland'})
+        ids = [job['id'] for job in jobs]
+        
+        if len(ids) != len(set(ids)) or len(ids) != 6:
+            print(f"❌ Expected 6 unique jobs, got {ids}")
+            return False
+        if [job['posted_time'] for job in jobs] != sorted((job['posted_time'] for job in jobs), reverse=True):
+            print("❌ Merged jobs are not newest first")
+            return False
+        
+        # Profiles that only differ in who is notified share one search, run for both of them
+        searched = []
+        planner = QueryPlanner(lambda criteria, last_run_time, profile_names: searched.append(profile_names) or [])
+        profiles = [{'name': name, 'keywords': ['android'], 'location': 'Ireland', 'recipient_email': recipient}
+                    for name, recipient in (('me', 'me@example.com'), ('team', 'team@example.com'))]
+        planner.start_cycle(profiles)
+        for profile in profiles:
+            planner.run(profile)
+        if searched != [['me', 'team']]:
+            print(f"❌ Expected one shared search for both recipients, got {searched}")
+            return False
+        
+        print(f"✅ Merged 2 sub-queries into {len(ids)} unique jobs, shared one search between recipients")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing query planner: {e}")
+        return False
+
+def test_paging():
+    """Test that paging stops at the first already-seen or stale job"""
+    print("\n📄 Testing result paging...")
+    
+    cwd = os.getcwd()
+    try:
+        from datetime import datetime
+        from urllib.parse import parse_qs, urlparse
+        import requests
+        from benchmarks.fixtures import make_search_page
+        
+        # One card an hour from noon on the 15th: cards 61 onwards were posted on the 12th
+        newest = datetime(2024, 1, 15, 12, 0)
+        
+        class SearchSession:
+            """Serves generated result pages and records the offsets asked for"""
+            def __init__(self):
+                self.starts = []
+            
+            def request(self, method, url, **kwargs):
+                start = int(parse_qs(urlparse(url).query).get('start', ['0'])[0])
+                self.starts.append(start)
+                response = requests.Response()
+                response.status_code = 200
+                response._content = make_search_page(25, start, newest=newest, minutes_between_posts=60).encode()
+                return response
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            with open('config.json', 'w') as f:
+                json.dump({
+                    "search_criteria": {"keywords": ["android"], "location": "Ireland"},
+                    "email": {"sender_email": "tracker@localhost", "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+                    "scraping": {"http_cache": False, "max_pages": 10, "page_size": 25},
+                    "archive": {"enabled": False}
+                }, f)
+            tracker = LinkedInJobTracker('config.json')
+            criteria = tracker.config['search_criteria']
+            
+            # Stale: the first card posted before the last run ends paging
+            session = tracker.scheduler.session = SearchSession()
+            stale_jobs = list(tracker.iter_jobs(criteria, datetime(2024, 1, 13)))
+            stale_starts = session.starts
+            
+            # Seen: the first card already notified ends paging, whatever its age
+            seen = tracker.parse_job_cards(make_search_page(25, 25, newest=newest, minutes_between_posts=60).encode())[5]
+            tracker.seen_jobs.add(tracker.seen_key(seen, 'default'))
+            session = tracker.scheduler.session = SearchSession()
+            seen_jobs = list(tracker.iter_jobs(criteria, None))
+            seen_starts = session.starts
+            tracker.close()
+            tracker.seen_jobs.close()
+        
+        if stale_starts != [0, 25, 50] or len(stale_jobs) != 61:
+            print(f"❌ Expected 61 jobs from offsets [0, 25, 50] before the stale card, "
+                  f"got {len(stale_jobs)} from {stale_starts}")
+            return False
+        if seen_starts != [0, 25] or len(seen_jobs) != 30 or seen_jobs[-1]['id'] == seen['id']:
+            print(f"❌ Expected 30 jobs from offsets [0, 25] before the seen card, "
+                  f"got {len(seen_jobs)} from {seen_starts}")
+            return False
+        
+        print("✅ Paging stopped at the first stale card (offset 50) and the first seen card (offset 25)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing result paging: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_multi_profile_paging():
+    """Test that paging only stops at jobs the polling profile has seen"""
+    print("\n📑 Testing paging with several profiles...")
+    
+    cwd = os.getcwd()
+    try:
+        from datetime import datetime
+        from urllib.parse import parse_qs, urlparse
+        import requests
+        from benchmarks.fixtures import make_search_page
+        from replay import NullDelivery
+        
+        class ThreeCardSession:
+            """Serves cards posted at 11:50, 11:30 and 11:10 on the first page and nothing after"""
+            def request(self, method, url, **kwargs):
+                start = int(parse_qs(urlparse(url).query).get('start', ['0'])[0])
+                response = requests.Response()
+                response.status_code = 200
+                response._content = make_search_page(0 if start else 3, newest=datetime(2024, 1, 15, 11, 50),
+                                                     minutes_between_posts=20).encode()
+                return response
+        
+        class QuietTracker(LinkedInJobTracker):
+            def create_delivery(self):
+                return NullDelivery()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            with open('config.json', 'w') as f:
+                json.dump({
+                    "profiles": [
+                        {"name": "android", "keywords": ["android"]},
+                        {"name": "cloud", "keywords": ["cloud"]},
+                        {"name": "cloud-team", "keywords": ["cloud"], "recipient_email": "cloud@localhost"}
+                    ],
+                    "email": {"sender_email": "tracker@localhost", "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+                    "scraping": {"http_cache": False},
+                    "archive": {"enabled": False}
+                }, f)
+            tracker = QuietTracker('config.json')
+            tracker.scheduler.session = ThreeCardSession()
+            android, cloud, cloud_team = tracker.get_profiles()
+            last_run = datetime(2024, 1, 15, 11, 0)
+            
+            # The android and cloud profiles already notified the middle card;
+            # cloud-team shares cloud's search but has not seen anything yet
+            cards = tracker.parse_job_cards(make_search_page(3, newest=datetime(2024, 1, 15, 11, 50),
+                                                             minutes_between_posts=20).encode())
+            ids = [card['id'] for card in cards]
+            tracker.seen_jobs.update([tracker.seen_key(cards[1], 'android'), tracker.seen_key(cards[1], 'cloud')])
+            android_jobs = [job['id'] for job in tracker.iter_jobs(android, last_run)]
+            tracker.last_run_times.update({'cloud': last_run, 'cloud-team': last_run})
+            shared = tracker.run_once([cloud, cloud_team])
+            shared_jobs = {name: [job['id'] for job in jobs] for name, jobs in shared.items()}
+            tracker.close()
+            tracker.seen_jobs.close()
+            tracker.near_duplicates.close()
+        
+        if android_jobs != ids[:1]:
+            print(f"❌ Expected the android profile to stop at its seen card, got {android_jobs}")
+            return False
+        if shared_jobs != {'cloud': [ids[0], ids[2]], 'cloud-team': ids}:
+            print(f"❌ Expected the shared search to page past the card only cloud has seen, got {shared_jobs}")
+            return False
+        
+        print("✅ Paging only stopped at a card every profile of the search had seen")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing paging with several profiles: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_job_filters():
+    """Test that compiled filter rules drop jobs and count them per rule"""
+    print("\n🚫 Testing filter rules...")
+    
+    try:
+        from job_filters import JobFilter
+        
+        job_filter = JobFilter([
+            {"name": "agencies", "field": "company", "exclude": ["Hays"]},
+            {"name": "recruiters", "field": "company", "exclude_patterns": ["recruit"]},
+            {"name": "engineering", "field": "title", "require_patterns": ["engineer", "developer"]},
+            {"field": "location", "exclude": ["Cork, Ireland"]}
+        ])
+        jobs = [
+            {'title': 'Android Engineer', 'company': 'Acme', 'location': 'Dublin, Ireland'},
+            {'title': 'Android Engineer', 'company': 'HAYS', 'location': 'Dublin, Ireland'},
+            {'title': 'Cloud Developer', 'company': 'Tech Recruitment Ltd', 'location': 'Dublin, Ireland'},
+            {'title': 'Product Manager', 'company': 'Acme', 'location': 'Dublin, Ireland'},
+            {'title': 'Cloud Developer', 'company': 'Acme', 'location': 'cork, ireland'},
+        ]
+        kept, dropped = job_filter.apply(jobs)
+        
+        expected = {'agencies': 1, 'recruiters': 1, 'engineering': 1, 'exclude location #4': 1}
+        if kept != jobs[:1] or dict(dropped) != expected:
+            print(f"❌ Expected 1 job kept and drops {expected}, got {len(kept)} and {dict(dropped)}")
+            return False
+        
+        try:
+            JobFilter([{"field": "title", "exclude_patterns": ["(unclosed"]}])
+            print("❌ Invalid pattern was accepted")
+            return False
+        except ValueError:
+            pass
+        
+        for values in (3, ["Hays", ["Randstad"]], {"company": "Hays"}):
+            try:
+                JobFilter([{"name": "agencies", "field": "company", "exclude": values}])
+                print(f"❌ Rule value {values!r} was accepted")
+                return False
+            except ValueError as e:
+                if "'agencies'" not in str(e):
+                    print(f"❌ Error for rule value {values!r} does not name the rule: {e}")
+                    return False
+        
+        print(f"✅ Kept {len(kept)} of {len(jobs)} jobs, drops counted per rule")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing filter rules: {e}")
+        return False
+
+def test_metrics_labels():
+    """Test that label values from config are escaped in the Prometheus text"""
+    print("\n📈 Testing metrics labels...")
+    
+    try:
+        from metrics import MetricsRegistry
+        
+        metrics = MetricsRegistry()
+        metrics.inc('tracker_filtered_jobs_total', 3, profile='default', rule='exclude title "senior" #1')
+        metrics.inc('tracker_filtered_jobs_total', 1, profile='default', rule='C:\\jobs\nnext line')
+        lines = metrics.to_prometheus().splitlines()
+        
+        expected = [
+            'tracker_filtered_jobs_total{profile="default",rule="C:\\\\jobs\\nnext line"} 1',
+            'tracker_filtered_jobs_total{profile="default",rule="exclude title \\"senior\\" #1"} 3',
+        ]
+        for line in expected:
+            if line not in lines:
+                print(f"❌ Missing escaped series: {line}")
+                return False
+        
+        print("✅ Quotes, backslashes and newlines in label values are escaped")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing metrics labels: {e}")
+        return False
+
+def test_seen_jobs_store():
+    """Test the seen jobs store in a temporary database"""
+    print("\n🗄️  Testing seen jobs store...")
+    
+    try:
+        import tempfile
+        from seen_jobs_store import SqliteSeenJobStore
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_file = os.path.join(tmp, 'seen_jobs.json')
+            with open(legacy_file, 'w') as f:
+                json.dump(['legacy-hash'], f)
+            
+            store = SqliteSeenJobStore(os.path.join(tmp, 'seen_jobs.db'), ttl_days=30, batch_size=2)
+            store.migrate_from_json(legacy_file)
+            store.add('new-hash')
+            
+            if 'legacy-hash' not in store or 'new-hash' not in store or 'other' in store:
+                print("❌ Seen jobs store returned wrong membership results")
+                return False
+            store.close()
+        
+        print("✅ Seen jobs store works")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing seen jobs store: {e}")
+        return False
+
+def test_delivery_pipeline():
+    """Test that jobs are only marked seen once their notification is delivered"""
+    print("\n📬 Testing delivery pipeline...")
+    
+    cwd = os.getcwd()
+    try:
+        import socket
+        import tempfile
+        from datetime import datetime
+        from linkedin_job_tracker import LinkedInJobTracker
+        
+        # A port nothing listens on, so every delivery fails
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        dead_port = probe.getsockname()[1]
+        probe.close()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            with open('config.json', 'w') as f:
+                json.dump({
+                    "search_criteria": {"keywords": ["android"], "location": "Ireland"},
+                    "email": {"smtp_server": "127.0.0.1", "smtp_port": dead_port, "use_tls": False,
+                              "sender_email": "tracker@localhost", "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+                    "scraping": {"http_cache": False},
+                    "archive": {"enabled": False}
+                }, f)
+            tracker = LinkedInJobTracker('config.json')
+            profile = tracker.get_profiles()[0]
+            jobs = [
+                {'id': '1', 'title': 'Android Engineer', 'company': 'Acme', 'location': 'Dublin',
+                 'posted_time': '', 'url': 'https://example.com/1', 'found_at': datetime.now().isoformat()},
+                {'id': '2', 'title': 'Cloud Architect', 'company': 'Initech', 'location': 'Cork',
+                 'posted_time': '', 'url': 'https://example.com/2', 'found_at': datetime.now().isoformat()},
+            ]
+            
+            new_jobs = tracker.filter_new_jobs(jobs, mark_seen=False)
+            tracker.notify_stage.put((profile, new_jobs, datetime.now()))
+            tracker.wait_for_delivery()
+            undelivered = len(tracker.seen_jobs), len(tracker.in_flight)
+            retried = tracker.filter_new_jobs(jobs, mark_seen=False)
+            tracker.commit_delivery((profile['name'], retried, [], datetime.now()))
+            tracker.save_state()
+            delivered = len(tracker.seen_jobs)
+            tracker.close()
+        
+        if undelivered != (0, 0) or len(retried) != 2 or delivered != 2:
+            print(f"❌ Unexpected seen jobs: {undelivered} after failure, {delivered} after delivery")
+            return False
+        
+        print("✅ Undelivered jobs were retried and delivered jobs marked seen")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing delivery pipeline: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_failed_profile():
+    """Test that one profile failing does not hold back the other profiles' notifications"""
+    print("\n🧯 Testing a failing profile...")
+    
+    cwd = os.getcwd()
+    try:
+        from datetime import datetime
+        from replay import NullDelivery
+        
+        def job(job_id, title, company):
+            return {'id': job_id, 'title': title, 'company': company, 'location': 'Dublin',
+                    'posted_time': '', 'url': f"https://example.com/{job_id}", 'found_at': datetime.now().isoformat()}
+        
+        class BrokenEnricher:
+            """Fails while enriching the broken profile's jobs, after they were held in flight"""
+            def enrich(self, jobs):
+                if any(job['company'] == 'Broken Co' for job in jobs):
+                    raise RuntimeError("details page timed out")
+                return jobs
+        
+        class TwoProfileTracker(LinkedInJobTracker):
+            def scrape_linkedin_jobs(self, criteria=None, last_run_time=None):
+                if criteria['name'] == 'broken':
+                    return [job('b1', 'Data Engineer', 'Broken Co'), job('b2', 'QA Lead', 'Broken Co')]
+                return [job('h1', 'Android Engineer', 'Acme'), job('h2', 'Cloud Architect', 'Initech')]
+            
+            def create_delivery(self):
+                return NullDelivery()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            with open('config.json', 'w') as f:
+                json.dump({
+                    "profiles": [{"name": "healthy", "keywords": ["android"]}, {"name": "broken", "keywords": ["data"]}],
+                    "email": {"sender_email": "tracker@localhost", "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+                    "scraping": {"http_cache": False},
+                    "archive": {"enabled": False}
+                }, f)
+            tracker = TwoProfileTracker('config.json')
+            tracker.enricher = BrokenEnricher()
+            results = tracker.run_once()
+            delivered = len(tracker.seen_jobs)
+            stuck = len(tracker.in_flight) + len(tracker.held_reposts)
+            tracker.close()
+        
+        if list(results) != ['healthy'] or delivered != 2 or stuck:
+            print(f"❌ Expected only the healthy profile's 2 jobs delivered and nothing in flight, "
+                  f"got {list(results)}, {delivered} seen, {stuck} in flight")
+            return False
+        
+        print("✅ Healthy profile delivered; the failed profile's jobs were released for the next poll")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing a failing profile: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_profile_last_run_times():
+    """Test that a profile's last run time only moves with its own polls"""
+    print("\n⏲️  Testing per-profile last run times...")
+    
+    cwd = os.getcwd()
+    try:
+        from datetime import datetime
+        
+        def write_config(names):
+            with open('config.json', 'w') as f:
+                json.dump({
+                    "profiles": [{"name": name, "keywords": [name]} for name in names],
+                    "email": {"sender_email": "tracker@localhost", "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+                    "archive": {"enabled": False}
+                }, f)
+        
+        def clock():
+            return datetime(2024, 1, 15, 12, 0)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            write_config(['a', 'b'])
+            tracker = LinkedInJobTracker('config.json', clock=clock)
+            # Only profile a is polled; b's first poll failed
+            tracker.save_last_run_time(['a'], datetime(2024, 1, 15, 12, 0))
+            times = {'b': tracker.get_last_run_time('b')}
+            
+            # Profile c is added by a config reload
+            write_config(['a', 'b', 'c'])
+            mtime = os.path.getmtime('config.json') + 10
+            os.utime('config.json', (mtime, mtime))
+            tracker.reload_config_if_changed()
+            times['c'] = tracker.get_last_run_time('c')
+            tracker.close()
+            tracker.seen_jobs.close()
+            tracker.near_duplicates.close()
+            
+            restarted = LinkedInJobTracker('config.json', clock=clock)
+            times['b after restart'] = restarted.get_last_run_time('b')
+            restarted.close()
+            restarted.seen_jobs.close()
+            restarted.near_duplicates.close()
+        
+        initial = datetime(2024, 1, 15, 11, 30)
+        if any(value != initial for value in times.values()):
+            print(f"❌ Expected profiles b and c to keep the initial last run time {initial}, got {times}")
+            return False
+        
+        print("✅ Profiles not polled kept the initial last run time, across a reload and a restart")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing per-profile last run times: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_shared_search_recipients():
+    """Test that profiles sharing a search each notify its jobs to their own recipients"""
+    print("\n👥 Testing profiles with different recipients...")
+    
+    cwd = os.getcwd()
+    try:
+        from datetime import datetime
+        from replay import NullDelivery
+        
+        searches = []
+        
+        class SharedSearchTracker(LinkedInJobTracker):
+            def search_subquery(self, criteria, last_run_time=None, profile_names=None):
+                searches.append(profile_names)
+                return [{'id': job_id, 'title': title, 'company': 'Acme', 'location': 'Dublin', 'posted_time': '',
+                         'url': f"https://example.com/{job_id}", 'found_at': datetime.now().isoformat()}
+                        for job_id, title in (('1', 'Android Engineer'), ('2', 'Android Developer'))]
+            
+            def create_delivery(self):
+                return NullDelivery()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            with open('config.json', 'w') as f:
+                json.dump({
+                    "profiles": [
+                        {"name": "me", "keywords": ["android"], "recipient_email": "me@localhost"},
+                        {"name": "team", "keywords": ["android"], "recipient_email": "team@localhost"}
+                    ],
+                    "email": {"sender_email": "tracker@localhost", "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+                    "scraping": {"http_cache": False},
+                    "archive": {"enabled": False}
+                }, f)
+            tracker = SharedSearchTracker('config.json')
+            first = {name: sorted(job['id'] for job in jobs) for name, jobs in tracker.run_once().items()}
+            second = {name: len(jobs) for name, jobs in tracker.run_once().items()}
+            tracker.close()
+            tracker.seen_jobs.close()
+            tracker.near_duplicates.close()
+        
+        if first != {'me': ['1', '2'], 'team': ['1', '2']} or searches != [['me', 'team']] * 2:
+            print(f"❌ Expected both profiles to get jobs 1 and 2 from one search per run, "
+                  f"got {first} from {len(searches)} searches")
+            return False
+        if second != {'me': 0, 'team': 0}:
+            print(f"❌ Expected nothing new on the second run, got {second}")
+            return False
+        
+        print("✅ Both recipients were sent the shared search's jobs once")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing profiles with different recipients: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_fetch_failure():
+    """Test that a search whose requests keep failing keeps the profile's last run time"""
+    print("\n📵 Testing failed searches...")
+    
+    cwd = os.getcwd()
+    try:
+        from datetime import datetime
+        import requests
+        from benchmarks.fixtures import make_search_page
+        from replay import NullDelivery
+        
+        class FlakySession:
+            """Answers 503 while `down`, otherwise one page of three cards"""
+            down = True
+            
+            def request(self, method, url, **kwargs):
+                response = requests.Response()
+                response.status_code = 503 if self.down else 200
+                empty = self.down or 'start=' in url
+                response._content = make_search_page(0 if empty else 3, newest=datetime(2024, 1, 15, 11, 30),
+                                                     minutes_between_posts=20).encode()
+                return response
+        
+        class QuietTracker(LinkedInJobTracker):
+            def create_delivery(self):
+                return NullDelivery()
+        
+        now = [datetime(2024, 1, 15, 11, 30)]
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            with open('config.json', 'w') as f:
+                json.dump({
+                    "search_criteria": {"keywords": ["android"], "location": "Ireland"},
+                    "email": {"sender_email": "tracker@localhost", "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+                    "scraping": {"http_cache": False},
+                    "rate_limit": {"max_retries": 0, "requests_per_minute": 6000, "burst": 10},
+                    "archive": {"enabled": False}
+                }, f)
+            tracker = QuietTracker('config.json', clock=lambda: now[0])
+            session = tracker.scheduler.session = FlakySession()
+            tracker.last_run_times['default'] = datetime(2024, 1, 15, 11, 0)
+            
+            failed = tracker.run_once()
+            kept_last_run = tracker.get_last_run_time('default')
+            session.down = False
+            now[0] = datetime(2024, 1, 15, 12, 0)
+            recovered = tracker.run_once()
+            tracker.close()
+            tracker.seen_jobs.close()
+            tracker.near_duplicates.close()
+        
+        if failed or kept_last_run != datetime(2024, 1, 15, 11, 0):
+            print(f"❌ Expected the failed search to be left out and keep its last run time, "
+                  f"got {failed} and {kept_last_run}")
+            return False
+        if len(recovered.get('default', [])) != 3:
+            print(f"❌ Expected the next poll to find the 3 missed jobs, got {recovered}")
+            return False
+        
+        print("✅ Failed search kept its last run time; the next poll found the missed jobs")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing failed searches: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_response_cache_profiles():
+    """Test that an unchanged first page only skips profiles that fetched it before"""
+    print("\n🗄️  Testing the response cache with several profiles...")
+    
+    cwd = os.getcwd()
+    try:
+        from datetime import datetime
+        import requests
+        from benchmarks.fixtures import make_search_page
+        from job_parsers import parse_job_cards
+        from replay import NullDelivery
+        
+        page = make_search_page(3, newest=datetime(2024, 1, 15, 11, 50), minutes_between_posts=20).encode()
+        cards = parse_job_cards(page)
+        
+        class SamePageSession:
+            def __init__(self):
+                self.fetches = 0
+            
+            def request(self, method, url, **kwargs):
+                self.fetches += 1
+                response = requests.Response()
+                response.status_code = 200
+                response._content = make_search_page(0).encode() if 'start=' in url else page
+                return response
+        
+        class QuietTracker(LinkedInJobTracker):
+            def create_delivery(self):
+                return NullDelivery()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            with open('config.json', 'w') as f:
+                json.dump({
+                    "profiles": [
+                        {"name": "a", "keywords": ["android"],
+                         "filters": [{"field": "company", "exclude": [cards[0]['company']]}]},
+                        {"name": "b", "keywords": ["android"]}
+                    ],
+                    "email": {"sender_email": "tracker@localhost", "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 10},
+                    "scraping": {"http_cache": True},
+                    "archive": {"enabled": False}
+                }, f)
+            tracker = QuietTracker('config.json', clock=lambda: datetime(2024, 1, 15, 12, 0))
+            session = tracker.scheduler.session = SamePageSession()
+            a, b = tracker.get_profiles()
+            first_a = tracker.run_once([a])['a']
+            first_b = tracker.run_once([b])['b']
+            again_b = tracker.run_once([b])['b']
+            tracker.close()
+            tracker.seen_jobs.close()
+            tracker.near_duplicates.close()
+        
+        if cards[0]['id'] in [job['id'] for job in first_a]:
+            print("❌ Profile a's filter did not apply")
+            return False
+        if sorted(job['id'] for job in first_b) != sorted(card['id'] for card in cards) or again_b:
+            print(f"❌ Expected profile b to get all 3 jobs once, got {len(first_b)} and then {len(again_b)}")
+            return False
+        
+        print(f"✅ Profile b parsed the page profile a had cached, then skipped it unchanged "
+              f"({session.fetches} fetches)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing the response cache with several profiles: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_near_duplicates():
+    """Test that reposts under a new ID are caught and different roles are not"""
+    print("\n👯 Testing near-duplicate detection...")
+    
+    try:
+        import tempfile
+        from near_duplicates import NearDuplicateIndex
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            index = NearDuplicateIndex(os.path.join(tmp, 'seen_jobs.db'), threshold=0.8)
+            job = {'id': '1', 'title': 'Senior Android Engineer', 'company': 'Acme',
+                   'location': 'Dublin, County Dublin, Ireland'}
+            index.check_and_add('a', job)
+            index.flush()
+            
+            repost = index.check_and_add('b', dict(job, id='2'))
+            other_city = index.check_and_add('c', dict(job, id='3', location='Cork, County Cork, Ireland'))
+            other_role = index.check_and_add('d', dict(job, id='4', title='Android Developer'))
+            index.close()
+        
+        if repost is None or other_city is None:
+            print("❌ Reposts of the same job were not detected")
+            return False
+        if other_role is not None:
+            print("❌ A different role was flagged as a duplicate")
+            return False
+        
+        print(f"✅ Reposts detected ({other_city[1]:.0%} similar across cities)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing near-duplicate detection: {e}")
+        return False
+
+def test_job_archive():
+    """Test that archived jobs are found by full-text search"""
+    print("\n🗄️  Testing job archive search...")
+    
+    try:
+        import tempfile
+        from job_archive import JobArchive
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = JobArchive(os.path.join(tmp, 'job_archive.db'))
+            archive.add([
+                {'id': '1', 'title': 'Android Engineer', 'company': 'Acme', 'location': 'Dublin, Ireland'},
+                {'id': '2', 'title': 'Cloud Architect', 'company': 'Globex', 'location': 'Dublin, Ireland'},
+                {'id': '3', 'title': 'Senior Android Developer', 'company': 'Initech', 'location': 'Cork, Ireland'},
+            ], profile='default')
+            archive.flush()
+            archive.add([{'id': '1', 'title': 'Android Engineer', 'company': 'Acme',
+                          'location': 'Dublin, Ireland'}])
+            
+            android = archive.search('android')
+            in_dublin = archive.search('android', location='dublin')
+            archive.close()
+        
+        if sorted(job['id'] for job in android) != ['1', '3']:
+            print(f"❌ Expected jobs 1 and 3, got {[job['id'] for job in android]}")
+            return False
+        if [job['id'] for job in in_dublin] != ['1'] or in_dublin[0]['times_seen'] != 2:
+            print("❌ Location filter or re-sighting count is wrong")
+            return False
+        
+        print(f"✅ Found {len(android)} archived Android jobs")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing job archive: {e}")
+        return False
+
+def test_job_history():
+    """Test that the columnar history round-trips and feeds the weekly report"""
+    print("\n📈 Testing job history export...")
+    
+    try:
+        import io
+        import tempfile
+        from contextlib import redirect_stderr, redirect_stdout
+        from job_analytics import count_by, main, postings_per_week
+        from job_history import ColumnarWriter, iter_row_groups
+        
+        jobs = [{
+            'id': str(i), 'title': 'Android Engineer', 'company': ['Acme', 'Globex'][i % 2],
+            'location': 'Dublin', 'posted_time': '2024-01-15', 'found_at': f"2024-01-{15 + i % 7:02d}T12:00:00"
+        } for i in range(100)]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'job_history.jcol')
+            with ColumnarWriter(path, row_group_size=30) as writer:
+                writer.write(jobs)
+            companies = [value for group in iter_row_groups(path, ['company'])
+                         for value in group['company'].decode()]
+            totals = count_by(path, 'company')
+            weekly = postings_per_week(path, 'company')
+            report = io.StringIO()
+            with redirect_stdout(report), redirect_stderr(io.StringIO()):
+                main(['companies', path, '--since', '2024-01-20'])
+        
+        if companies != [job['company'] for job in jobs]:
+            print("❌ Company column did not round-trip")
+            return False
+        if totals != {'Acme': 50, 'Globex': 50} or sum(weekly.values()) != 100:
+            print(f"❌ Unexpected aggregates: {dict(totals)}")
+            return False
+        if sorted(line.split() for line in report.getvalue().splitlines()) != [['14', 'Acme'], ['14', 'Globex']]:
+            print(f"❌ Unexpected report for --since 2024-01-20: {report.getvalue()!r}")
+            return False
+        
+        print(f"✅ {len(jobs)} jobs exported in 4 row groups across {len(weekly)} company-weeks")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing job history: {e}")
+        return False
+
+def test_replay():
+    """Test that replaying snapshots only notifies each job once"""
+    print("\n⏪ Testing snapshot replay...")
+    
+    try:
+        import io
+        import shutil
+        import tempfile
+        from datetime import datetime
+        from replay import Snapshots, replay_config
+        
+        page = os.path.join('benchmarks', 'pages', 'search_ireland_android_cloud.html')
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshots_dir = os.path.join(tmp, 'snapshots')
+            os.makedirs(snapshots_dir)
+            for name in ('2030-01-01T09-00-00.html', '2030-01-01T15-00-00.html'):
+                shutil.copy(page, os.path.join(snapshots_dir, name))
+            config_file = os.path.join(tmp, 'config.json')
+            with open(config_file, 'w') as f:
+                json.dump({
+                    "search_criteria": {"keywords": ["android"], "location": "Ireland"},
+                    "email": {"smtp_server": "127.0.0.1", "smtp_port": 25, "sender_email": "tracker@localhost",
+                              "recipient_email": "team@localhost"},
+                    "monitoring": {"check_interval_minutes": 30, "max_jobs_per_notification": 100}
+                }, f)
+            
+            output = io.StringIO()
+            totals = replay_config(config_file, Snapshots(snapshots_dir), output, since=datetime(2000, 1, 1))
+        
+        notifications = [json.loads(line) for line in output.getvalue().splitlines()]
+        if totals['default']['polls'] != 2 or len(notifications) != 1 or not notifications[0]['jobs']:
+            print(f"❌ Unexpected replay results: {totals}")
+            return False
+        if notifications[0]['time'] != '2030-01-01T09:00:00':
+            print(f"❌ Notification recorded at {notifications[0]['time']}")
+            return False
+        found_at = {job['found_at'] for job in notifications[0]['jobs']}
+        if found_at != {'2030-01-01T09:00:00'}:
+            print(f"❌ Jobs found at {sorted(found_at)} instead of the snapshot time")
+            return False
+        
+        print(f"✅ Replayed 2 polls: {len(notifications[0]['jobs'])} jobs notified once")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing replay: {e}")
+        return False
+
+def test_results_api():
+    """Test that the daemon API serves job deltas with ETags"""
+    print("\n🌐 Testing results API...")
+    
+    try:
+        import urllib.error
+        import urllib.request
+        from api_server import ApiServer
+        from results_cache import ResultsCache
+        
+        cache = ResultsCache()
+        server = ApiServer(cache, port=0).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        
+        def get(path, etag=None):
+            request = urllib.request.Request(base + path, headers={'If-None-Match': etag} if etag else {})
+            try:
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    return response.status, json.loads(response.read()), response.headers['ETag']
+            except urllib.error.HTTPError as e:
+                return e.code, None, e.headers['ETag']
+        
+        try:
+            cache.update('Android', [{'id': '1', 'title': 'Android Developer'}])
+            _, first, etag = get('/jobs?profile=Android')
+            cache.update('Android', [{'id': '1'}, {'id': '2', 'title': 'Android Engineer'}])
+            _, delta, _ = get(f"/jobs?profile=Android&since={first['next_since']}")
+            status, _, _ = get(f"/jobs?profile=Android&since={first['next_since']}", etag=etag)
+            _, same, same_etag = get(f"/jobs?profile=Android&since={first['next_since']}")
+            not_modified, _, _ = get(f"/jobs?profile=Android&since={first['next_since']}", etag=same_etag)
+        finally:
+            server.stop()
+        
+        if [job['id'] for job in first['jobs']] != ['1'] or [job['id'] for job in delta['jobs']] != ['2']:
+            print(f"❌ Unexpected jobs: {first['jobs']} then {delta['jobs']}")
+            return False
+        if status != 200 or not_modified != 304 or same != delta:
+            print(f"❌ Unexpected ETag handling: {status}, {not_modified}")
+            return False
+        
+        print("✅ API served only new jobs and answered 304 for unchanged results")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing results API: {e}")
+        return False
+
+def test_smtp_delivery():
+    """Test digests sent to a local SMTP sink over one connection, reconnects and refused recipients"""
+    print("\n📮 Testing SMTP delivery...")
+    
+    try:
+        from datetime import datetime
+        from benchmarks.smtp_sink import SMTPSink
+        from email.mime.text import MIMEText
+        from email_delivery import SMTPDelivery
+        
+        def message(subject):
+            msg = MIMEText("New jobs")
+            msg['Subject'] = subject
+            msg['From'] = 'tracker@localhost'
+            return msg
+        
+        jobs = [
+            {'id': str(i), 'title': f"Android Engineer {i}", 'company': 'Acme', 'location': 'Dublin',
+             'posted_time': '', 'url': f"https://example.com/{i}", 'found_at': datetime.now().isoformat()}
+            for i in range(5)
+        ]
+        with SMTPSink() as sink, temp_tracker() as tracker:
+            tracker.config['email'] = {'smtp_server': '127.0.0.1', 'smtp_port': sink.port, 'use_tls': False,
+                                       'sender_email': 'tracker@localhost', 'recipient_email': 'team@localhost'}
+            tracker.config['monitoring']['max_jobs_per_notification'] = 2
+            
+            # Three digests of at most 2 jobs share one connection
+            with SMTPDelivery(tracker.config['email']) as delivery:
+                results = tracker.send_email_notification(jobs, None, delivery)
+            if len(results) != 3 or not all(result.ok for _, result in results) or \
+                    (sink.connections, sink.messages) != (1, 3):
+                print(f"❌ Expected 3 digests over 1 connection, got {sink.messages} over {sink.connections}")
+                return False
+            
+            # A server hanging up between messages costs one reconnect, not a lost message
+            sink.drop_after = 1
+            with SMTPDelivery(tracker.config['email']) as delivery:
+                resent = [delivery.send(message(f"Retry {i}"), ['team@localhost']) for i in range(2)]
+            if not all(result.ok for result in resent) or (sink.connections, sink.messages) != (3, 5):
+                print(f"❌ Reconnect failed: {[result.error for result in resent]}, "
+                      f"{sink.messages} messages over {sink.connections} connections")
+                return False
+            
+            # Refused recipients come back on the result; all refused means undelivered
+            sink.drop_after = None
+            sink.refuse = {'nobody@localhost'}
+            with SMTPDelivery(tracker.config['email']) as delivery:
+                partly = delivery.send(message("Partly"), ['team@localhost', 'nobody@localhost'])
+                refused = delivery.send(message("Refused"), ['nobody@localhost'])
+                summary = delivery.summary()
+            if list(partly.refused) != ['nobody@localhost'] or not partly.accepted or partly.ok:
+                print(f"❌ Partly refused message reported as {partly.refused}, accepted={partly.accepted}")
+                return False
+            if refused.accepted or refused.error is None or not summary.startswith('0 sent, 2 failed'):
+                print(f"❌ Fully refused message reported as accepted ({summary})")
+                return False
+        
+        print("✅ Digests shared a connection, a dropped connection was reopened and refusals reported")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing SMTP delivery: {e}")
+        return False
+
+def test_digest_renderer():
+    """Test that digests are escaped and split by max_jobs_per_notification"""
+    print("\n📨 Testing email digest rendering...")
+    
+    try:
+        from digest_renderer import iter_digests
+        
+        jobs = [{
+            'title': '<script>alert(1)</script>',
+            'company': 'Acme & Co',
+            'location': 'Dublin',
+            'posted_time': '2024-01-15',
+            'url': 'https://www.linkedin.com/jobs/view/1?a=1&b=2'
+        }] * 25
+        digests = list(iter_digests(jobs, max_jobs=10))
+        
+        if [len(digest.jobs) for digest in digests] != [10, 10, 5]:
+            print("❌ Digests were not split into emails of at most 10 jobs")
+            return False
+        if '<script>' in digests[0].html or 'Acme & Co' not in digests[0].text:
+            print("❌ Digest bodies were not escaped correctly")
+            return False
+        
+        print(f"✅ Rendered {len(jobs)} jobs into {len(digests)} digests")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error rendering digests: {e}")
+        return False
+
+def test_posted_times():
+    """Test that ISO, date-only and relative posted times are understood"""
+    print("\n🕒 Testing posted time parsing...")
+    
+    try:
+        from datetime import datetime
+        from time_normalizer import posted_window
+        
+        now = datetime(2024, 1, 15, 12, 0)
+        expected = {
+            '2024-01-15': datetime(2024, 1, 15, 23, 59, 59, 999999),
+            '2024-01-15T10:00:00': datetime(2024, 1, 15, 10, 0),
+            '5 minutes ago': datetime(2024, 1, 15, 11, 55),
+            '2 days ago': datetime(2024, 1, 13, 12, 0),
+        }
+        for value, latest in expected.items():
+            window = posted_window(value, now)
+            if window is None or window[1] != latest:
+                print(f"❌ {value!r} parsed as {window}")
+                return False
+        if posted_window('N/A', now) is not None:
+            print("❌ 'N/A' should not parse")
+            return False
+        
+        print(f"✅ Parsed {len(expected)} posted time formats")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error parsing posted times: {e}")
+        return False
+
+def test_logging():
+    """Test the background log writer's JSON lines, sampling and compressed rotation"""
+    print("\n📝 Testing log writer...")
+    
+    try:
+        import gzip
+        import logging
+        import tempfile
+        import tracker_logging
+        from tracker_logging import start_logging, stop_logging
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tracker.log')
+            logger = logging.getLogger('test_tracker.logging')
+            logger.propagate = False
+            listener = start_logging({'file': path, 'format': 'json', 'max_bytes': 2000, 'backup_count': 2,
+                                      'sample_burst': 5, 'console': False}, logger)
+            for index in range(100):
+                logger.error(f"Error parsing job card {index}")
+            for index in range(20):
+                logger.info(f"Status line {index}")
+            stop_logging(listener)
+            
+            lines = []
+            for name in sorted(os.listdir(tmp)):
+                if name.endswith('.gz'):
+                    with gzip.open(os.path.join(tmp, name), 'rt') as f:
+                        lines.extend(f.read().splitlines())
+            with open(path) as f:
+                lines.extend(f.read().splitlines())
+            records = [json.loads(line) for line in lines]
+            
+            errors = [record for record in records if record['level'] == 'ERROR']
+            if len(errors) != 5 or len(records) != 25:
+                print(f"❌ Expected 5 sampled errors and 20 status lines, got {len(errors)} and {len(records) - len(errors)}")
+                return False
+            if not any(name.endswith('.gz') for name in os.listdir(tmp)):
+                print("❌ Log file was not rotated and compressed")
+                return False
+            
+            # Stopping one listener must leave the other's exit hook registered
+            first = start_logging({'file': os.path.join(tmp, 'first.log'), 'console': False},
+                                  logging.getLogger('test_tracker.first'))
+            second = start_logging({'file': os.path.join(tmp, 'second.log'), 'console': False},
+                                   logging.getLogger('test_tracker.second'))
+            stop_logging(first)
+            remaining = [hook.args[0] for hook in tracker_logging._exit_hooks.values()]
+            stop_logging(second)
+            if first in remaining or second not in remaining or tracker_logging._exit_hooks:
+                print("❌ Stopping one listener did not leave exactly the other's exit hook registered")
+                return False
+        
+        print(f"✅ Wrote {len(records)} JSON lines, sampled errors and rotated to .gz")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing log writer: {e}")
+        return False
+
+def test_lazy_imports():
+    """Test that importing the tracker does not load the parser, SMTP or MIME modules"""
+    print("\n⏱️  Testing startup imports...")
+    
+    try:
+        import subprocess
+        import sys
+        
+        code = ("import sys, linkedin_job_tracker; "
+                "print(' '.join(m for m in ('bs4', 'lxml', 'smtplib', 'email.mime', 'http.server') "
+                "if m in sys.modules))")
+        loaded = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.split()
+        
+        if loaded:
+            print(f"❌ Loaded at import time: {', '.join(loaded)}")
+            return False
+        
+        print("✅ Parser, SMTP and MIME modules load on demand")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error checking startup imports: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🧪 LinkedIn Job Tracker Test Suite")
@@ -121,6 +1449,33 @@ def main():
     tests = [
         test_config,
         test_search_url,
+        test_parser_backends,
+        test_job_records,
+        test_parse_pool,
+        test_request_scheduler,
+        test_poll_scheduler,
+        test_query_planner,
+        test_paging,
+        test_multi_profile_paging,
+        test_job_filters,
+        test_metrics_labels,
+        test_seen_jobs_store,
+        test_delivery_pipeline,
+        test_failed_profile,
+        test_profile_last_run_times,
+        test_shared_search_recipients,
+        test_fetch_failure,
+        test_response_cache_profiles,
+        test_near_duplicates,
+        test_job_archive,
+        test_job_history,
+        test_replay,
+        test_results_api,
+        test_smtp_delivery,
+        test_digest_renderer,
+        test_posted_times,
+        test_logging,
+        test_lazy_imports,
         test_linkedin_connection,
         test_email_config
     ]
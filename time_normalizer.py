@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Time normalizer
+Turns the posted times found on job cards into windows of local time
+"""
+
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# (earliest, latest) local time at which a job may have been posted
+Window = Tuple[datetime, datetime]
+
+UNIT_SECONDS = {
+    'second': 1, 'sec': 1, 's': 1,
+    'minute': 60, 'min': 60, 'm': 60,
+    'hour': 3600, 'hr': 3600, 'h': 3600,
+    'day': 86400, 'd': 86400,
+    'week': 7 * 86400, 'wk': 7 * 86400, 'w': 7 * 86400,
+    'month': 30 * 86400, 'mo': 30 * 86400,
+    'year': 365 * 86400, 'yr': 365 * 86400, 'y': 365 * 86400,
+}
+
+RELATIVE_RE = re.compile(
+    r'(?:^|\b)(\d+|an?|one)\+?\s*(' + '|'.join(sorted(UNIT_SECONDS, key=len, reverse=True)) +
+    r')s?\.?\s+ago\b'
+)
+
+JUST_NOW = {'just now', 'now', 'moments ago', 'a moment ago', 'few seconds ago', 'a few seconds ago'}
+
+
+@lru_cache(maxsize=4096)
+def parse_posted_time(value: Optional[str]):
+    """Parse a posted time, independently of the current time
+
+    Returns ('absolute', earliest, latest) for ISO timestamps and dates, in
+    naive local time, ('relative', min_age, max_age) for phrases such as
+    "5 minutes ago" and ('day', days_back) for "today" and "yesterday".
+    Returns None if the value cannot be understood.
+    Results are cached, since the same strings repeat across cards and runs.
+    """
+    if not value:
+        return None
+    text = value.strip()
+
+    absolute = _parse_absolute(text)
+    if absolute is not None:
+        return absolute
+
+    text = text.lower()
+    if text in JUST_NOW:
+        return ('relative', timedelta(0), timedelta(minutes=1))
+    if text == 'today':
+        return ('day', 0)
+    if text == 'yesterday':
+        return ('day', 1)
+
+    match = RELATIVE_RE.search(text)
+    if match is None:
+        return None
+    count, unit = match.groups()
+    count = int(count) if count.isdigit() else 1
+    seconds = UNIT_SECONDS[unit]
+    # "2 hours ago" means at least two and less than three hours ago
+    return ('relative', timedelta(seconds=count * seconds), timedelta(seconds=(count + 1) * seconds))
+
+
+def _parse_absolute(text: str):
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+    if len(text) == 10:
+        # Date-only values cover the whole day
+        return ('absolute', parsed, parsed + timedelta(days=1) - timedelta(microseconds=1))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return ('absolute', parsed, parsed)
+
+
+def posted_window(value: Optional[str], now: Optional[datetime] = None) -> Optional[Window]:
+    """Return the (earliest, latest) local time a job may have been posted"""
+    parsed = parse_posted_time(value)
+    if parsed is None:
+        return None
+    now = now or datetime.now()
+    if parsed[0] == 'absolute':
+        return parsed[1], parsed[2]
+    if parsed[0] == 'day':
+        start = datetime.combine(now.date(), datetime.min.time()) - timedelta(days=parsed[1])
+        return start, min(now, start + timedelta(days=1) - timedelta(microseconds=1))
+    return now - parsed[2], now - parsed[1]
+
+
+def posted_windows(values: Iterable[Optional[str]], now: Optional[datetime] = None) -> List[Optional[Window]]:
+    """posted_window for a whole page of cards, converting each distinct string once"""
+    now = now or datetime.now()
+    windows = {}
+    result = []
+    for value in values:
+        if value not in windows:
+            windows[value] = posted_window(value, now)
+        result.append(windows[value])
+    return result
+
+
+def posted_after(window: Optional[Window], since: Optional[datetime]) -> bool:
+    """Whether a job may have been posted after `since`
+
+    Unknown times count as recent so that jobs are never lost; the seen jobs
+    store keeps them from being notified twice.
+    """
+    return window is None or since is None or window[1] > since
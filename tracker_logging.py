@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tracker logging
+Background log writer with rotation, gzip compression, JSON lines and sampling of repeated errors
+"""
+
+import atexit
+import functools
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Listener -> its atexit callback, so stopping one listener leaves the others registered
+_exit_hooks: Dict[logging.handlers.QueueListener, Callable[[], None]] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers and jq"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'logger': record.name,
+            'thread': record.threadName,
+            'source': f"{record.module}:{record.lineno}",
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Let through a burst of records per call site and interval, drop the rest
+
+    Only records at `level` or above are sampled, so a changed page layout
+    that breaks every job card cannot fill the disk with the same error.
+    The first record let through in a later interval says how many were
+    dropped.
+    """
+
+    def __init__(self, burst: int = 10, interval_seconds: float = 60, level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.interval_seconds = interval_seconds
+        self.level = level
+        self.lock = threading.Lock()
+        # Call site -> [interval start, records this interval, records dropped]
+        self.sites: Dict[Tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level or self.burst <= 0:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            site = self.sites.setdefault((record.pathname, record.lineno), [now, 0, 0])
+            if now - site[0] >= self.interval_seconds:
+                site[0], site[1] = now, 0
+            site[1] += 1
+            if site[1] > self.burst:
+                site[2] += 1
+                return False
+            dropped, site[2] = site[2], 0
+        if dropped:
+            record.msg = f"{record.getMessage()} ({dropped} similar messages dropped)"
+            record.args = None
+        return True
+
+
+def gzip_rotator(source: str, dest: str):
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def create_file_handler(settings: Dict) -> logging.Handler:
+    """The log file handler, rotated by size or time unless rotate is "none" """
+    filename = settings.get('file', 'job_tracker.log')
+    rotate = settings.get('rotate', 'size')
+    if rotate == 'time':
+        handler = logging.handlers.TimedRotatingFileHandler(
+            filename, when=settings.get('when', 'midnight'), backupCount=settings.get('backup_count', 7),
+            delay=True
+        )
+    elif rotate == 'size':
+        handler = logging.handlers.RotatingFileHandler(
+            filename, maxBytes=settings.get('max_bytes', 10 * 1024 * 1024),
+            backupCount=settings.get('backup_count', 5), delay=True
+        )
+    else:
+        return logging.FileHandler(filename, delay=True)
+    if settings.get('compress', True):
+        handler.rotator = gzip_rotator
+        handler.namer = lambda name: name + '.gz'
+    return handler
+
+
+def start_logging(settings: Optional[Dict] = None,
+                  logger: Optional[logging.Logger] = None) -> logging.handlers.QueueListener:
+    """Route a logger (the root logger by default) through a queue to a background writer thread
+
+    Callers only format the message and put it on the queue; writing,
+    rotating and compressing the log file happens on the listener's thread.
+    Stop the returned listener to flush the queue (it is also stopped at
+    exit).
+    """
+    settings = settings or {}
+    file_handler = create_file_handler(settings)
+    if settings.get('format', 'text') == 'json':
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handlers = [file_handler]
+    if settings.get('console', True):
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console)
+
+    log_queue: queue.Queue = queue.Queue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings.get('sample_burst', 10),
+                                           settings.get('sample_interval_seconds', 60)))
+
+    if logger is None:
+        logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+    logger.addHandler(queue_handler)
+    logger.setLevel(settings.get('level', 'INFO'))
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    _exit_hooks[listener] = functools.partial(stop_logging, listener)
+    atexit.register(_exit_hooks[listener])
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener):
+    """Write out queued records and close the log file"""
+    hook = _exit_hooks.pop(listener, None)
+    if hook is not None:
+        atexit.unregister(hook)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()